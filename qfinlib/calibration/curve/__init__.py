@@ -1,5 +1,14 @@
 """Curve calibration."""
 
-from qfinlib.calibration.curve.builder import CurveBuilder
+from qfinlib.calibration.curve.builder import CurveBuilder, CurveSpec
+from qfinlib.calibration.curve.engine import CalibrationReport, CurveCalibrationEngine
+from qfinlib.calibration.curve.solver import CalibrationBlock, solve_curves
 
-__all__ = ["CurveBuilder"]
+__all__ = [
+    "CurveBuilder",
+    "CurveSpec",
+    "CurveCalibrationEngine",
+    "CalibrationReport",
+    "CalibrationBlock",
+    "solve_curves",
+]
@@ -1,29 +1,105 @@
 """Unified curve builder interface."""
 
-from typing import Optional, List, Any, Mapping, Tuple
+import dataclasses
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Optional, List, Any, Dict, Mapping, Sequence, Tuple, Union
 from datetime import date
 
-from qfinlib.market.curve import DiscountCurve, ForwardCurve
+from qfinlib.calibration.curve.engine import CurveCalibrationEngine
+from qfinlib.calibration.curve.instrument import (
+    BasisSwapInstrument,
+    BondInstrument,
+    CalibrationInstrument,
+    DepositInstrument,
+    FRAInstrument,
+    FutureInstrument,
+    SwapInstrument,
+)
+from qfinlib.calibration.curve.solver import CalibrationBlock
+from qfinlib.market.curve import Curve, DiscountCurve, ForwardCurve, FrozenCurve
 from qfinlib.market.container import MarketContainer
 
-# Try to import engine, but make it optional
-try:
-    from qfinlib.calibration.curve.engine import CurveCalibrationEngine
-except ImportError:
+_INSTRUMENT_TYPES = {
+    "deposit": DepositInstrument,
+    "fra": FRAInstrument,
+    "future": FutureInstrument,
+    "swap": SwapInstrument,
+    "bond": BondInstrument,
+    "basis": BasisSwapInstrument,
+}
+# Optional instrument fields accepted from mapping inputs.
+_INSTRUMENT_FIELDS = (
+    "start",
+    "frequency",
+    "float_frequency",
+    "coupon",
+    "convexity",
+    "other",
+    "other_frequency",
+)
 
-    class CurveCalibrationEngine:
-        """Placeholder calibration engine."""
 
-        pass
+@dataclasses.dataclass
+class CurveSpec:
+    """Description of one curve for :meth:`CurveBuilder.build_curves`.
+
+    Parameters
+    ----------
+    name:
+        Curve name; other specs and basis instruments refer to it by this.
+    instruments:
+        Calibration inputs, in any form :class:`CurveBuilder` accepts.
+    kind:
+        ``"discount"`` for a self-discounting curve or ``"forward"`` for a
+        projection curve.
+    currency, index:
+        Stored in the curve metadata.
+    discount_curve:
+        Name of the curve discounting a forward curve's instruments, built
+        alongside or taken from the market (``"discount_curve"`` by default).
+    interpolation:
+        Node interpolation; log-linear for discount and linear for forward
+        curves by default.
+    extrapolation:
+        Extrapolation beyond the nodes.
+    """
+
+    name: str
+    instruments: List[Any]
+    kind: str = "discount"
+    currency: str = ""
+    index: Optional[str] = None
+    discount_curve: Optional[str] = None
+    interpolation: Optional[str] = None
+    extrapolation: str = "flat"
+
+    def __post_init__(self) -> None:
+        if self.kind not in ("discount", "forward"):
+            raise ValueError(f"Unsupported curve kind: {self.kind}")
+
+    @property
+    def discount_name(self) -> Optional[str]:
+        """Name of the discounting curve, ``None`` when self-discounting."""
+
+        if self.kind == "discount":
+            return None
+        return self.discount_curve or "discount_curve"
 
 
 class CurveBuilder:
     """Unified interface for building curves."""
 
-    def __init__(self, market: MarketContainer):
+    def __init__(self, market: MarketContainer, engine: Optional[CurveCalibrationEngine] = None):
         """Initialize with market data."""
         self.market = market
-        self.engine = CurveCalibrationEngine()
+        self.engine = engine or CurveCalibrationEngine()
 
     def _nodes_from_instruments(
         self, instruments: Optional[List[Any]], fallback_rate: float, prefix: str
@@ -34,25 +110,68 @@ class CurveBuilder:
         pillars: List[float] = []
         quotes: List[float] = []
         names: List[str] = []
+        for idx, instrument in enumerate(instruments):
+            pillar, quote, name = self._parse_instrument(instrument, f"{prefix}_{idx}")
+            pillars.append(pillar)
+            quotes.append(quote)
+            names.append(name)
+        return pillars, quotes, names
+
+    @staticmethod
+    def _parse_instrument(instrument: Any, name: str) -> Tuple[float, float, str]:
+        pillar: Optional[float] = None
+        quote: Optional[float] = None
+        if isinstance(instrument, Mapping):
+            pillar = instrument.get("pillar") or instrument.get("tenor") or instrument.get("time")
+            quote = instrument.get("quote")
+            name = instrument.get("name") or instrument.get("instrument") or name
+        elif isinstance(instrument, tuple) or isinstance(instrument, list):
+            if len(instrument) >= 2:
+                pillar, quote = instrument[0], instrument[1]
+            if len(instrument) >= 3:
+                name = instrument[2]
+        if pillar is None or quote is None:
+            raise ValueError("Each instrument must provide a pillar/time and a quote")
+        return float(pillar), float(quote), str(name)
+
+    def _calibration_instruments(
+        self, instruments: List[Any], prefix: str
+    ) -> List[CalibrationInstrument]:
+        """Normalise instrument inputs to :class:`CalibrationInstrument` objects.
+
+        Mappings may name their ``type`` (deposit, fra, future, swap, bond;
+        swap by default) and the optional fields of that instrument. Plain
+        ``(pillar, quote[, name])`` tuples are read as par swap quotes.
+        """
+
+        converted: List[CalibrationInstrument] = []
         for idx, instrument in enumerate(instruments):
             name = f"{prefix}_{idx}"
-            pillar: Optional[float] = None
-            quote: Optional[float] = None
+            if isinstance(instrument, CalibrationInstrument):
+                if instrument.name is None:
+                    instrument = dataclasses.replace(instrument, name=name)
+                converted.append(instrument)
+                continue
+            kind = "swap"
+            extra = {}
             if isinstance(instrument, Mapping):
-                pillar = instrument.get("pillar") or instrument.get("tenor") or instrument.get("time")
-                quote = instrument.get("quote")
-                name = instrument.get("name") or instrument.get("instrument") or name
-            elif isinstance(instrument, tuple) or isinstance(instrument, list):
-                if len(instrument) >= 2:
-                    pillar, quote = instrument[0], instrument[1]
-                if len(instrument) >= 3:
-                    name = instrument[2]
-            if pillar is None or quote is None:
-                raise ValueError("Each instrument must provide a pillar/time and a quote")
-            pillars.append(float(pillar))
-            quotes.append(float(quote))
-            names.append(str(name))
-        return pillars, quotes, names
+                kind = str(instrument.get("type") or instrument.get("instrument_type") or kind)
+                extra = {key: instrument[key] for key in _INSTRUMENT_FIELDS if key in instrument}
+            cls = _INSTRUMENT_TYPES.get(kind.lower())
+            if cls is None:
+                raise ValueError(f"Unsupported calibration instrument type: {kind}")
+            pillar, quote, name = self._parse_instrument(instrument, name)
+            converted.append(cls(maturity=pillar, quote=quote, name=name, **extra))
+        return converted
+
+    def _discount_curve_for(self, discount_curve: Union[str, Curve, None]) -> Curve:
+        if isinstance(discount_curve, Curve):
+            return discount_curve
+        curve = self.market.get_curve(discount_curve or "discount_curve")
+        if curve is not None and hasattr(curve, "discount_factor"):
+            return curve
+        rate = float(self.market.data.get("discount_rate", 0.0))
+        return DiscountCurve(pillars=[0.0, 30.0], zero_rates=[rate, rate])
 
     def build_discount_curve(
         self,
@@ -62,20 +181,42 @@ class CurveBuilder:
         interpolation: str = "log_linear",
         extrapolation: str = "flat",
     ) -> DiscountCurve:
-        """Build a discount curve for a currency."""
+        """Build a discount curve for a currency.
+
+        The zero-rate nodes sit at each instrument's maturity and are
+        bootstrapped by :attr:`engine`; the calibration report is stored as
+        ``metadata["calibration"]``.
+        """
 
         rate_guess = float(self.market.data.get("discount_rate", 0.0))
-        pillars, quotes, names = self._nodes_from_instruments(instruments, rate_guess, "discount")
         metadata = {"currency": currency, "as_of": as_of or self.market.as_of}
-        return DiscountCurve(
+        if not instruments:
+            pillars, quotes, names = self._nodes_from_instruments(
+                instruments, rate_guess, "discount"
+            )
+            return DiscountCurve(
+                pillars=pillars,
+                zero_rates=quotes,
+                instruments=names,
+                interpolation=interpolation,
+                extrapolation=extrapolation,
+                market_data=dict(zip(names, quotes)),
+                metadata=metadata,
+            )
+
+        calibration = self._calibration_instruments(instruments, "discount")
+        pillars, guesses, names = self.engine.node_layout(calibration)
+        curve = DiscountCurve(
             pillars=pillars,
-            zero_rates=quotes,
+            zero_rates=guesses,
             instruments=names,
             interpolation=interpolation,
             extrapolation=extrapolation,
-            market_data=self.market.data,
+            market_data={ins.name: ins.quote for ins in calibration},
             metadata=metadata,
         )
+        self.engine.bootstrap(curve, calibration)
+        return curve
 
     def build_forward_curve(
         self,
@@ -85,19 +226,332 @@ class CurveBuilder:
         as_of: Optional[date] = None,
         interpolation: str = "linear",
         extrapolation: str = "flat",
+        discount_curve: Union[str, Curve, None] = None,
     ) -> ForwardCurve:
-        """Build a forward curve for a currency and index."""
+        """Build a forward curve for a currency and index.
+
+        The forward nodes sit at each instrument's last fixing time and are
+        bootstrapped with discounting on ``discount_curve`` (a curve or the
+        name of one in the market; ``"discount_curve"`` by default, or a flat
+        curve at the market ``discount_rate`` when none is available).
+        """
 
         rate_guess = float(self.market.data.get("forward_rate", 0.0))
-        pillars, quotes, names = self._nodes_from_instruments(instruments, rate_guess, index)
         metadata = {"currency": currency, "index": index, "as_of": as_of or self.market.as_of}
-        return ForwardCurve(
+        if not instruments:
+            pillars, quotes, names = self._nodes_from_instruments(instruments, rate_guess, index)
+            return ForwardCurve(
+                pillars=pillars,
+                forward_rates=quotes,
+                instruments=names,
+                interpolation=interpolation,
+                extrapolation=extrapolation,
+                index=index,
+                market_data=dict(zip(names, quotes)),
+                metadata=metadata,
+            )
+
+        calibration = self._calibration_instruments(instruments, index)
+        pillars, guesses, names = self.engine.node_layout(calibration, projection=True)
+        curve = ForwardCurve(
             pillars=pillars,
-            forward_rates=quotes,
+            forward_rates=guesses,
             instruments=names,
             interpolation=interpolation,
             extrapolation=extrapolation,
             index=index,
-            market_data=self.market.data,
+            market_data={ins.name: ins.quote for ins in calibration},
             metadata=metadata,
         )
+        self.engine.bootstrap(curve, calibration, self._discount_curve_for(discount_curve))
+        return curve
+
+    def recalibrate(self, curve: Curve, quotes: Mapping[str, float]) -> Curve:
+        """Move quotes of a curve built here and recalibrate it in place.
+
+        The previous calibration is the starting point: small moves are
+        absorbed by corrections with its stored Jacobian, and a full solve
+        only runs when those do not reach the tolerance. Curves calibrated
+        jointly with ``curve`` by :meth:`build_curves` are updated with it.
+        """
+
+        self.engine.recalibrate(curve, quotes)
+        return curve
+
+    def build_curves(
+        self,
+        specs: Sequence[CurveSpec],
+        as_of: Optional[date] = None,
+        method: str = "newton",
+        curves: Optional[Mapping[str, Curve]] = None,
+    ) -> Dict[str, Curve]:
+        """Calibrate a set of interdependent curves.
+
+        With ``method="newton"`` every node of every curve is solved in one
+        Newton system (see :meth:`CurveCalibrationEngine.calibrate`), which
+        handles instruments coupling curves in both directions. With
+        ``method="bootstrap"`` the curves are bootstrapped one at a time in
+        dependency order, which requires the dependencies to be acyclic.
+        Curves referenced but not specified are looked up in ``curves``, then
+        in the market.
+        """
+
+        if method not in ("newton", "bootstrap"):
+            raise ValueError(f"Unsupported calibration method: {method}")
+        as_of = as_of or self.market.as_of
+        built: Dict[str, Curve] = {}
+        inputs: Dict[str, List[CalibrationInstrument]] = {}
+        dependencies: Dict[str, List[str]] = {}
+        for spec in specs:
+            if spec.name in built:
+                raise ValueError(f"Curve '{spec.name}' is specified twice")
+            calibration = self._calibration_instruments(spec.instruments, spec.name)
+            built[spec.name] = self._initial_curve(spec, calibration, as_of)
+            inputs[spec.name] = calibration
+            dependencies[spec.name] = self._dependencies(spec, calibration)
+
+        external: Dict[str, Curve] = {}
+        for spec in specs:
+            for name in dependencies[spec.name]:
+                if name not in built and name not in external:
+                    external[name] = self._external_curve(name, spec, curves)
+
+        if method == "newton":
+            blocks = [
+                CalibrationBlock(spec.name, built[spec.name], inputs[spec.name], spec.discount_name)
+                for spec in specs
+            ]
+            self.engine.calibrate(blocks, external)
+            return built
+
+        available: Dict[str, Curve] = {**external, **built}
+        specs_by_name = {spec.name: spec for spec in specs}
+        for group in _dependency_groups(dependencies):
+            if len(group) > 1:
+                raise ValueError(
+                    "Curve dependencies are cyclic; calibrate them with method='newton'"
+                )
+            name = group[0]
+            discount = specs_by_name[name].discount_name
+            discount_curve = available[discount] if discount else None
+            self.engine.bootstrap(built[name], inputs[name], discount_curve, available)
+        return built
+
+    def build_many(
+        self,
+        specs: Sequence[CurveSpec],
+        as_of: Optional[date] = None,
+        executor: Union[str, Executor, None] = "thread",
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, FrozenCurve]:
+        """Build many curves concurrently, in dependency order.
+
+        The specs are split into groups that must be calibrated together
+        (curves whose instruments reference each other, solved jointly by
+        Newton) and single curves (bootstrapped). A group is submitted as soon
+        as every curve it depends on is built, so independent currencies run
+        in parallel.
+
+        Parameters
+        ----------
+        specs:
+            Curves to build.
+        as_of:
+            Valuation date stored in the curve metadata.
+        executor:
+            ``"thread"`` or ``"process"`` for a pool of that kind created for
+            the call, ``"serial"`` or ``None`` to build in this thread, or an
+            existing :class:`concurrent.futures.Executor`, which is left open.
+        max_workers:
+            Pool size for the pools created here.
+
+        Curves are returned as :class:`~qfinlib.market.curve.FrozenCurve`
+        snapshots keyed by name: cheap to ship between processes and safe to
+        share. Their calibration reports do not carry solver state.
+        """
+
+        as_of = as_of or self.market.as_of
+        by_name: Dict[str, CurveSpec] = {}
+        for spec in specs:
+            if spec.name in by_name:
+                raise ValueError(f"Curve '{spec.name}' is specified twice")
+            by_name[spec.name] = spec
+        dependencies = {
+            name: self._dependencies(spec, self._calibration_instruments(spec.instruments, name))
+            for name, spec in by_name.items()
+        }
+        external: Dict[str, Union[FrozenCurve, Curve]] = {}
+        for spec in specs:
+            for name in dependencies[spec.name]:
+                if name not in by_name and name not in external:
+                    curve = self._external_curve(name, spec)
+                    # Spread curves cannot be frozen without their base chain.
+                    frozen = not hasattr(curve, "base_curve")
+                    external[name] = FrozenCurve.from_curve(curve) if frozen else curve
+
+        groups = _dependency_groups(dependencies)
+        group_of = {name: k for k, group in enumerate(groups) for name in group}
+        waiting = {
+            k: {group_of[d] for n in group for d in dependencies[n] if d in by_name} - {k}
+            for k, group in enumerate(groups)
+        }
+        results: Dict[str, FrozenCurve] = {}
+
+        def arguments(
+            k: int,
+        ) -> Tuple[List[CurveSpec], Dict[str, Any], Optional[date], CurveCalibrationEngine]:
+            group = groups[k]
+            needed = {d for n in group for d in dependencies[n] if d not in group}
+            known = {d: external[d] if d in external else results[d] for d in needed}
+            return [by_name[n] for n in group], known, as_of, self.engine
+
+        if executor is None or executor == "serial":
+            for k in range(len(groups)):
+                results.update(_build_group(*arguments(k)))
+            return {spec.name: results[spec.name] for spec in specs}
+
+        if isinstance(executor, str):
+            pools = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+            if executor not in pools:
+                raise ValueError(f"Unsupported executor: {executor}")
+            pool = pools[executor](max_workers=max_workers)
+        else:
+            pool = executor
+        try:
+            running: Dict[Future, int] = {}
+            submitted: set = set()
+
+            def submit_ready() -> None:
+                for k, pending in waiting.items():
+                    if not pending and k not in submitted:
+                        submitted.add(k)
+                        running[pool.submit(_build_group, *arguments(k))] = k
+
+            submit_ready()
+            while running:
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    k = running.pop(future)
+                    results.update(future.result())
+                    for pending in waiting.values():
+                        pending.discard(k)
+                submit_ready()
+        finally:
+            if pool is not executor:
+                pool.shutdown()
+        return {spec.name: results[spec.name] for spec in specs}
+
+    @staticmethod
+    def _dependencies(spec: CurveSpec, calibration: List[CalibrationInstrument]) -> List[str]:
+        """Names of the curves ``spec`` needs besides itself."""
+
+        needed = [spec.discount_name] if spec.discount_name else []
+        needed += [ins.other for ins in calibration if isinstance(ins, BasisSwapInstrument)]
+        return list(dict.fromkeys(name for name in needed if name != spec.name))
+
+    def _external_curve(
+        self, name: str, spec: CurveSpec, curves: Optional[Mapping[str, Curve]] = None
+    ) -> Curve:
+        if curves is not None and name in curves:
+            return curves[name]
+        if name == spec.discount_name:
+            return self._discount_curve_for(name)
+        curve = self.market.get_curve(name)
+        if curve is None:
+            raise KeyError(f"Curve '{name}' is neither specified nor in the market")
+        return curve
+
+    def _initial_curve(
+        self, spec: CurveSpec, calibration: List[CalibrationInstrument], as_of: Optional[date]
+    ) -> Curve:
+        forward = spec.kind == "forward"
+        pillars, guesses, names = self.engine.node_layout(calibration, projection=forward)
+        common = dict(
+            pillars=pillars,
+            instruments=names,
+            extrapolation=spec.extrapolation,
+            market_data={ins.name: ins.quote for ins in calibration},
+            metadata={"currency": spec.currency, "as_of": as_of, "name": spec.name},
+        )
+        if forward:
+            common["metadata"]["index"] = spec.index or spec.name
+            return ForwardCurve(
+                forward_rates=guesses,
+                interpolation=spec.interpolation or "linear",
+                index=spec.index or spec.name,
+                **common,
+            )
+        return DiscountCurve(
+            zero_rates=guesses, interpolation=spec.interpolation or "log_linear", **common
+        )
+
+
+def _dependency_groups(dependencies: Mapping[str, Sequence[str]]) -> List[List[str]]:
+    """Strongly connected components of the dependency graph, dependencies first.
+
+    Names absent from ``dependencies`` are treated as already available.
+    """
+
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack: set = set()
+    groups: List[List[str]] = []
+
+    def visit(name: str) -> None:
+        # Tarjan's algorithm; curve graphs are shallow enough for recursion.
+        index[name] = low[name] = len(index)
+        stack.append(name)
+        on_stack.add(name)
+        for dep in dependencies[name]:
+            if dep not in dependencies:
+                continue
+            if dep not in index:
+                visit(dep)
+                low[name] = min(low[name], low[dep])
+            elif dep in on_stack:
+                low[name] = min(low[name], index[dep])
+        if low[name] == index[name]:
+            group = []
+            while True:
+                member = stack.pop()
+                on_stack.discard(member)
+                group.append(member)
+                if member == name:
+                    break
+            groups.append(group[::-1])
+
+    for name in dependencies:
+        if name not in index:
+            visit(name)
+    return groups
+
+
+def _build_group(
+    specs: List[CurveSpec],
+    curves: Mapping[str, Union[FrozenCurve, Curve]],
+    as_of: Optional[date],
+    engine: CurveCalibrationEngine,
+) -> Dict[str, FrozenCurve]:
+    """Worker for :meth:`CurveBuilder.build_many`; runs in pool threads or processes.
+
+    ``curves`` are frozen snapshots, or spread curves passed as they are.
+    """
+
+    builder = CurveBuilder(MarketContainer(as_of), engine)
+    thawed = {
+        name: curve.to_curve() if isinstance(curve, FrozenCurve) else curve
+        for name, curve in curves.items()
+    }
+    method = "newton" if len(specs) > 1 else "bootstrap"
+    built = builder.build_curves(specs, as_of, method=method, curves=thawed)
+    frozen: Dict[str, FrozenCurve] = {}
+    for name, curve in built.items():
+        report = curve.metadata.get("calibration")
+        if report is not None:
+            jacobian = report.jacobian.detached() if report.jacobian is not None else None
+            curve.metadata["calibration"] = dataclasses.replace(
+                report, state=None, jacobian=jacobian
+            )
+        frozen[name] = FrozenCurve.from_curve(curve)
+    return frozen
@@ -1 +1,19 @@
 """Calibration instrument module."""
+
+from .base import CalibrationInstrument, regular_schedule
+from .bond import BondInstrument
+from .deposit import DepositInstrument
+from .fra import FRAInstrument
+from .future import FutureInstrument
+from .swap import BasisSwapInstrument, SwapInstrument
+
+__all__ = [
+    "CalibrationInstrument",
+    "regular_schedule",
+    "DepositInstrument",
+    "FRAInstrument",
+    "FutureInstrument",
+    "SwapInstrument",
+    "BasisSwapInstrument",
+    "BondInstrument",
+]
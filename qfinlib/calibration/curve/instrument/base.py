@@ -1 +1,81 @@
 """Base calibration instrument."""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from qfinlib.calibration.curve.engine import CalibrationContext
+
+
+def regular_schedule(start: float, maturity: float, frequency: int) -> List[float]:
+    """Payment times ``start + k / frequency`` up to ``maturity``.
+
+    The final period ends exactly at ``maturity`` and absorbs any stub, so
+    instruments sharing ``start`` and ``frequency`` share every payment time
+    but their last.
+    """
+
+    frequency = max(1, int(frequency))
+    periods = max(1, int(round((maturity - start) * frequency)))
+    times = [start + k / frequency for k in range(1, periods)]
+    times.append(float(maturity))
+    return times
+
+
+@dataclass
+class CalibrationInstrument(ABC):
+    """Market instrument whose quote pins one node of the curve being built.
+
+    Parameters
+    ----------
+    maturity:
+        Final payment time in year fractions.
+    quote:
+        Market quote, in the instrument's own convention (a rate for
+        deposits, FRAs and swaps, a price for futures and bonds).
+    name:
+        Instrument label; becomes the node's instrument name on the curve.
+    """
+
+    maturity: float
+    quote: float
+    name: Optional[str] = None
+
+    @property
+    def pillar(self) -> float:
+        """Node time on a discount curve: the last time the instrument discounts at."""
+
+        return float(self.maturity)
+
+    @property
+    def fixing(self) -> float:
+        """Node time on a projection curve: the last time the instrument fixes at."""
+
+        return float(self.maturity)
+
+    def rate_guess(self) -> float:
+        """Starting value for the node, expressed as a rate."""
+
+        return float(self.quote)
+
+    @abstractmethod
+    def implied_quote(self, context: "CalibrationContext") -> float:
+        """Quote implied by the curves of ``context``, in the convention of :attr:`quote`."""
+
+    def residual(self, context: "CalibrationContext") -> float:
+        """Implied minus market quote; zero once the instrument is repriced."""
+
+        return self.implied_quote(context) - self.quote
+
+    @staticmethod
+    def _key(kind: str, start: float, frequency: int) -> Tuple[str, float, int]:
+        # Rounded so that schedules computed from slightly different
+        # maturities still share their cached partial sums.
+        return (kind, round(start, 10), int(frequency))
+
+    def quote_scale(self) -> float:
+        """Magnitude used to make solver tolerances relative to the quote."""
+
+        return max(1.0, abs(self.quote))
@@ -1 +1,40 @@
 """Bond calibration instrument."""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import List
+
+from .base import CalibrationInstrument
+
+
+@dataclass
+class BondInstrument(CalibrationInstrument):
+    """Fixed-coupon bullet bond quoted by its dirty price per 100 face.
+
+    Coupons fall every ``1 / frequency`` years counting back from
+    ``maturity``; only those after time zero are priced.
+    """
+
+    coupon: float = 0.0
+    frequency: int = 2
+
+    def _first_period_start(self) -> float:
+        frequency = max(1, int(self.frequency))
+        periods = max(1, math.ceil(self.maturity * frequency - 1e-9))
+        return self.maturity - periods / frequency
+
+    def coupon_times(self) -> List[float]:
+        start = self._first_period_start()
+        frequency = max(1, int(self.frequency))
+        periods = max(1, int(round((self.maturity - start) * frequency)))
+        return [start + k / frequency for k in range(1, periods)] + [float(self.maturity)]
+
+    def rate_guess(self) -> float:
+        return float(self.coupon)
+
+    def implied_quote(self, context) -> float:
+        start = self._first_period_start()
+        key = self._key("annuity", start, self.frequency)
+        annuity = context.annuity(key, start, self.coupon_times())
+        return 100.0 * (self.coupon * annuity + context.discount_factor(self.maturity))
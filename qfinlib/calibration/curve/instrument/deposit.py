@@ -1 +1,24 @@
 """Deposit calibration instrument."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .base import CalibrationInstrument
+
+
+@dataclass
+class DepositInstrument(CalibrationInstrument):
+    """Simply compounded cash deposit from ``start`` to ``maturity``.
+
+    On a discount curve the quote is ``(P(start) / P(maturity) - 1) / tau``;
+    against a projection curve it is the index fixing at ``start``.
+    """
+
+    start: float = 0.0
+
+    @property
+    def fixing(self) -> float:
+        return float(self.start)
+
+    def implied_quote(self, context) -> float:
+        return context.forward_rate(self.start, self.maturity)
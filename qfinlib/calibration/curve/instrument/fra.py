@@ -1 +1,24 @@
 """FRA calibration instrument."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .base import CalibrationInstrument
+
+
+@dataclass
+class FRAInstrument(CalibrationInstrument):
+    """Forward rate agreement on the period ``[start, maturity]``."""
+
+    start: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.maturity <= self.start:
+            raise ValueError("FRA maturity must be after its start")
+
+    @property
+    def fixing(self) -> float:
+        return float(self.start)
+
+    def implied_quote(self, context) -> float:
+        return context.forward_rate(self.start, self.maturity)
@@ -1 +1,32 @@
 """Future calibration instrument."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .base import CalibrationInstrument
+
+
+@dataclass
+class FutureInstrument(CalibrationInstrument):
+    """Short-rate future on ``[start, maturity]`` quoted as ``100 * (1 - rate)``.
+
+    ``convexity`` is the futures-minus-forward rate adjustment.
+    """
+
+    start: float = 0.0
+    convexity: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.maturity <= self.start:
+            raise ValueError("Future maturity must be after its start")
+
+    @property
+    def fixing(self) -> float:
+        return float(self.start)
+
+    def rate_guess(self) -> float:
+        return (100.0 - self.quote) / 100.0 - self.convexity
+
+    def implied_quote(self, context) -> float:
+        rate = context.forward_rate(self.start, self.maturity) + self.convexity
+        return 100.0 * (1.0 - rate)
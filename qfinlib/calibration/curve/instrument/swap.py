@@ -1 +1,115 @@
 """Swap calibration instrument."""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .base import CalibrationInstrument, regular_schedule
+
+
+@dataclass
+class SwapInstrument(CalibrationInstrument):
+    """Par fixed-for-floating swap quoted by its fixed rate.
+
+    Parameters
+    ----------
+    start:
+        Effective time of the swap.
+    frequency:
+        Fixed-leg payments per year.
+    float_frequency:
+        Floating-leg payments per year; defaults to ``frequency``. Only used
+        when the floating leg is projected off a separate curve.
+    """
+
+    start: float = 0.0
+    frequency: int = 1
+    float_frequency: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.maturity <= self.start:
+            raise ValueError("Swap maturity must be after its start")
+
+    def fixed_times(self) -> List[float]:
+        return regular_schedule(self.start, self.maturity, self.frequency)
+
+    def float_times(self) -> List[float]:
+        return regular_schedule(self.start, self.maturity, self.float_frequency or self.frequency)
+
+    @property
+    def fixing(self) -> float:
+        times = self.float_times()
+        return times[-2] if len(times) > 1 else float(self.start)
+
+    def implied_quote(self, context) -> float:
+        times = self.fixed_times()
+        key = self._key("annuity", self.start, self.frequency)
+        annuity = context.annuity(key, self.start, times)
+        if context.projection is None:
+            float_pv = context.discount_factor(self.start) - context.discount_factor(self.maturity)
+        else:
+            frequency = self.float_frequency or self.frequency
+            key = self._key("float", self.start, frequency)
+            float_pv = context.float_leg(key, self.start, self.float_times())
+        if annuity == 0:
+            return math.nan
+        return float_pv / annuity
+
+
+@dataclass
+class BasisSwapInstrument(CalibrationInstrument):
+    """Float-for-float basis swap quoted by the spread on its own leg.
+
+    The own leg is projected off the curve being calibrated and pays the
+    quoted spread on top; the other leg is projected off the curve named
+    ``other``. Both legs are discounted on the context's discount curve.
+
+    Parameters
+    ----------
+    start:
+        Effective time of the swap.
+    frequency:
+        Payments per year of the own (spread) leg.
+    other:
+        Name of the curve projecting the other leg.
+    other_frequency:
+        Payments per year of the other leg.
+    """
+
+    start: float = 0.0
+    frequency: int = 4
+    other: str = ""
+    other_frequency: int = 4
+
+    def __post_init__(self) -> None:
+        if self.maturity <= self.start:
+            raise ValueError("Swap maturity must be after its start")
+        if not self.other:
+            raise ValueError("Basis swaps need the name of the other leg's curve")
+
+    def float_times(self) -> List[float]:
+        return regular_schedule(self.start, self.maturity, self.frequency)
+
+    def other_times(self) -> List[float]:
+        return regular_schedule(self.start, self.maturity, self.other_frequency)
+
+    @property
+    def fixing(self) -> float:
+        times = self.float_times()
+        return times[-2] if len(times) > 1 else float(self.start)
+
+    def implied_quote(self, context) -> float:
+        times = self.float_times()
+        key = self._key("annuity", self.start, self.frequency)
+        annuity = context.annuity(key, self.start, times)
+        own = context.float_leg(self._key("float", self.start, self.frequency), self.start, times)
+        other = context.float_leg(
+            self._key("float", self.start, self.other_frequency),
+            self.start,
+            self.other_times(),
+            projection=context.curve(self.other),
+        )
+        if annuity == 0:
+            return math.nan
+        return (other - own) / annuity
@@ -1 +1,387 @@
-"""Curve calibration solver."""
+"""Curve calibration solver.
+
+Bootstrapping one curve after another converges poorly once instruments
+couple curves, for instance basis swaps between two projection curves or a
+discount curve whose instruments reference a projection curve. The solver
+here stacks the nodes of every curve into one unknown vector and the
+residuals of every instrument into one system, and solves it with
+:func:`~qfinlib.math.solver.newton_system`.
+
+Jacobian rows come from evaluating the instruments on
+:class:`~qfinlib.math.ad.Dual` node values through
+:meth:`~qfinlib.market.curve.Curve.with_values`, so they are exact and
+sparse: an instrument only carries derivatives for the nodes its cashflows
+touch, which the sparse LU factorisation exploits.
+
+The stacked system and its factorised Jacobian are kept with the calibrated
+curves as a :class:`CalibrationState`. :func:`recalibrate` uses it to absorb
+small quote moves with a few Jacobian corrections and only falls back to a
+full Newton solve when those stop reducing the residuals.
+"""
+from __future__ import annotations
+
+import dataclasses
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from qfinlib.calibration.curve.engine import (
+    CalibrationContext,
+    CalibrationJacobian,
+    CalibrationReport,
+    node_order,
+)
+from qfinlib.calibration.curve.instrument import CalibrationInstrument
+from qfinlib.market.curve import Curve
+from qfinlib.math.ad import Dual, tangent_of
+from qfinlib.math.linalg import SingularMatrixError, SparseLU
+from qfinlib.math.solver import NewtonResult, newton_system
+
+
+@dataclass
+class CalibrationBlock:
+    """One curve and the instruments pinning its nodes.
+
+    Parameters
+    ----------
+    name:
+        Name other blocks and instruments use to reference the curve.
+    curve:
+        Curve whose node values are solved in place; each instrument is
+        matched to the node carrying its name.
+    instruments:
+        Calibration instruments, one per node.
+    discount:
+        Curve discounting the instruments, or its name. ``None`` calibrates
+        the curve as its own discount curve; otherwise it is treated as a
+        projection curve.
+    """
+
+    name: str
+    curve: Curve
+    instruments: Sequence[CalibrationInstrument]
+    discount: Union[str, Curve, None] = None
+
+
+class CurveSystem:
+    """Node values and instrument residuals of several curves as one system.
+
+    Parameters
+    ----------
+    blocks:
+        Curves to solve.
+    curves:
+        Further curves, held fixed, that blocks reference by name.
+
+    Unknowns and residuals are laid out block by block in node order, so
+    residual ``i`` belongs to the instrument pinning unknown ``i``.
+    """
+
+    def __init__(
+        self, blocks: Sequence[CalibrationBlock], curves: Optional[Mapping[str, Curve]] = None
+    ):
+        self.blocks = list(blocks)
+        self.fixed: Dict[str, Curve] = dict(curves or {})
+        self.offsets: List[int] = []
+        self.orders: List[List[Tuple[int, CalibrationInstrument]]] = []
+        offset = 0
+        for block in self.blocks:
+            order = node_order(block.curve, block.instruments)
+            if len(order) != len(block.curve.pillars):
+                raise ValueError(f"Curve '{block.name}' needs exactly one instrument per node")
+            self.offsets.append(offset)
+            self.orders.append(order)
+            offset += len(order)
+        self.size = offset
+        self.scales = self._scales()
+
+    def _scales(self) -> List[float]:
+        scales = [1.0] * self.size
+        for start, order in zip(self.offsets, self.orders):
+            for position, instrument in order:
+                scales[start + position] = instrument.quote_scale()
+        return scales
+
+    def values(self) -> List[float]:
+        """Current node values of every block."""
+
+        out: List[float] = []
+        for block in self.blocks:
+            out.extend(float(v) for v in block.curve.values)
+        return out
+
+    def residuals(self, x: Sequence[Any]) -> List[Any]:
+        """Instrument residuals with the nodes set to ``x`` (floats or duals)."""
+
+        views = dict(self.fixed)
+        for block, start, order in zip(self.blocks, self.offsets, self.orders):
+            views[block.name] = block.curve.with_values(x[start : start + len(order)])
+        out: List[Any] = [0.0] * self.size
+        for block, start, order in zip(self.blocks, self.offsets, self.orders):
+            discount = block.discount
+            if discount is None:
+                context = CalibrationContext(views[block.name], curves=views)
+            else:
+                if isinstance(discount, str):
+                    discount = views[discount]
+                context = CalibrationContext(discount, projection=views[block.name], curves=views)
+            context.freeze()
+            for position, instrument in order:
+                out[start + position] = instrument.residual(context)
+        return out
+
+    def jacobian(self, x: Sequence[float]) -> List[Dict[int, float]]:
+        """Sparse rows of the residual Jacobian at ``x``."""
+
+        outputs = self.residuals([Dual.variable(value, i) for i, value in enumerate(x)])
+        return [tangent_of(f) for f in outputs]
+
+    def norm(self, residuals: Sequence[float]) -> float:
+        """Largest residual relative to its quote scale."""
+
+        return max((abs(r) / s for r, s in zip(residuals, self.scales)), default=0.0)
+
+    def set_quotes(self, quotes: Mapping[str, float]) -> Dict[int, float]:
+        """Move the market quotes of the instruments named in ``quotes``.
+
+        Returns the quote changes keyed by residual index.
+        """
+
+        changes: Dict[int, float] = {}
+        for block, start, order in zip(self.blocks, self.offsets, self.orders):
+            moved = {}
+            for k, (position, instrument) in enumerate(order):
+                if instrument.name in quotes:
+                    quote = float(quotes[instrument.name])
+                    order[k] = (position, dataclasses.replace(instrument, quote=quote))
+                    moved[instrument.name] = quote
+                    changes[start + position] = quote - instrument.quote
+            if moved:
+                block.instruments = [instrument for _, instrument in order]
+                block.curve.market_data.update(moved)
+        self.scales = self._scales()
+        return changes
+
+    def versions(self) -> Tuple[int, ...]:
+        """Versions of every curve the residuals depend on."""
+
+        curves = [block.curve for block in self.blocks] + list(self.fixed.values())
+        curves += [b.discount for b in self.blocks if isinstance(b.discount, Curve)]
+        return tuple(curve.version for curve in curves)
+
+    def write(self, x: Sequence[float]) -> None:
+        """Store ``x`` as the node values of the block curves."""
+
+        for block, start, order in zip(self.blocks, self.offsets, self.orders):
+            for position in range(len(order)):
+                block.curve.set_node_value(position, float(x[start + position]))
+
+    def report(
+        self,
+        residuals: Sequence[float],
+        iterations: int,
+        converged: bool,
+        build_time: float,
+        method: str,
+        state: Optional["CalibrationState"] = None,
+        jacobian: Optional[List[Dict[int, float]]] = None,
+    ) -> None:
+        """Store a :class:`CalibrationReport` in every block curve's metadata.
+
+        ``jacobian`` gives the residual Jacobian at the current nodes when
+        known; otherwise it is computed if first requested.
+        """
+
+        layout = [(block.name, list(block.curve.instruments)) for block in self.blocks]
+        if jacobian is None:
+            solved = self.values()
+            shared = CalibrationJacobian(layout, compute=lambda: self.jacobian(solved))
+        else:
+            shared = CalibrationJacobian(layout, jacobian)
+        for k, (block, start, order) in enumerate(zip(self.blocks, self.offsets, self.orders)):
+            curve = block.curve
+            curve.metadata["calibration"] = CalibrationReport(
+                pillars=list(curve.pillars),
+                instruments=list(curve.instruments),
+                iterations=[iterations] * len(order),
+                residuals=[float(r) for r in residuals[start : start + len(order)]],
+                passes=iterations,
+                converged=converged,
+                build_time=build_time,
+                method=method,
+                state=state,
+                jacobian=shared,
+                block=k,
+            )
+
+
+@dataclass
+class CalibrationState:
+    """Solver state kept with calibrated curves for warm restarts.
+
+    Parameters
+    ----------
+    system:
+        The calibrated curves and their instruments.
+    jacobian:
+        Sparse residual Jacobian at (or near) the calibrated nodes, computed
+        on first use when not known.
+    factorization:
+        :class:`~qfinlib.math.linalg.SparseLU` of :attr:`jacobian`.
+    residuals:
+        Residuals at the calibrated nodes, valid while :attr:`versions`
+        matches the curves.
+    versions:
+        Curve versions :attr:`residuals` were recorded at.
+    """
+
+    system: CurveSystem
+    jacobian: Optional[List[Dict[int, float]]] = None
+    factorization: Optional[SparseLU] = None
+    residuals: Optional[List[float]] = None
+    versions: Tuple[int, ...] = ()
+
+    def record(self, residuals: Sequence[float]) -> None:
+        """Remember the residuals of the curves as they are now."""
+
+        self.residuals = [float(r) for r in residuals]
+        self.versions = self.system.versions()
+
+    def factorize(self) -> SparseLU:
+        if self.factorization is None:
+            if self.jacobian is None:
+                self.jacobian = self.system.jacobian(self.system.values())
+            self.factorization = SparseLU(self.jacobian, self.system.size)
+        return self.factorization
+
+    def reset(self, jacobian: Optional[List[Dict[int, float]]] = None) -> None:
+        """Replace the stored Jacobian, dropping its factorisation."""
+
+        self.jacobian = jacobian
+        self.factorization = None
+
+
+def solve_curves(
+    blocks: Sequence[CalibrationBlock],
+    curves: Optional[Mapping[str, Curve]] = None,
+    tolerance: float = 1e-12,
+    max_iterations: int = 30,
+) -> NewtonResult:
+    """Solve the nodes of every block's curve simultaneously.
+
+    Parameters
+    ----------
+    blocks:
+        Curves to calibrate.
+    curves:
+        Further curves, held fixed, that blocks reference by name.
+    tolerance:
+        Residual tolerance relative to ``max(1, |quote|)``.
+    max_iterations:
+        Maximum Newton iterations.
+
+    The calibrated values are written back to each curve, and a
+    :class:`~qfinlib.calibration.curve.engine.CalibrationReport` carrying
+    the shared :class:`CalibrationState` is stored as
+    ``curve.metadata["calibration"]``. The returned Jacobian has one row per
+    instrument and one column per node, laid out as in :class:`CurveSystem`.
+    """
+
+    started = time.perf_counter()
+    system = CurveSystem(blocks, curves)
+    result = newton_system(
+        system.residuals, system.values(), tolerance, max_iterations, scale=system.scales
+    )
+    system.write(result.x)
+    state = CalibrationState(system, result.jacobian)
+    state.record(result.residuals)
+    system.report(
+        result.residuals,
+        result.iterations,
+        result.converged,
+        time.perf_counter() - started,
+        "newton",
+        state,
+        result.jacobian,
+    )
+    return result
+
+
+def recalibrate(
+    state: CalibrationState,
+    quotes: Mapping[str, float],
+    tolerance: float = 1e-12,
+    max_iterations: int = 30,
+    max_corrections: int = 4,
+) -> bool:
+    """Move the quotes of a calibrated curve set and re-solve from its state.
+
+    Parameters
+    ----------
+    state:
+        State of the previous calibration.
+    quotes:
+        New quotes keyed by instrument name; instruments not named keep
+        their quote.
+    tolerance:
+        Residual tolerance relative to ``max(1, |quote|)``.
+    max_iterations:
+        Newton iterations allowed in a fallback full solve.
+    max_corrections:
+        Corrections with the stored Jacobian tried before falling back.
+
+    The current nodes are corrected with the stored factorisation (a chord
+    Newton iteration, cheap because nothing is differentiated or refactorised).
+    Small moves converge in one or two corrections. When a correction fails
+    to reduce the residuals, or the budget runs out, a full Newton solve starts
+    from the corrected nodes and its fresh Jacobian replaces the stored one.
+    Reports are updated as for a calibration, with method ``"warm_start"``
+    or ``"newton"``; the return value tells whether it converged.
+    """
+
+    started = time.perf_counter()
+    system = state.system
+    changes = system.set_quotes(quotes)
+    x = system.values()
+    if state.residuals is not None and state.versions == system.versions():
+        # Nothing moved but the quotes, so the residuals shift by the quote
+        # changes and need no evaluation.
+        residuals = list(state.residuals)
+        for index, change in changes.items():
+            residuals[index] -= change
+    else:
+        residuals = system.residuals(x)
+    current = system.norm(residuals)
+    corrections = 0
+    if current > tolerance and max_corrections > 0:
+        try:
+            lu = state.factorize()
+        except SingularMatrixError:
+            lu = None
+        while lu is not None and current > tolerance and corrections < max_corrections:
+            step = lu.solve([-r for r in residuals])
+            trial = [xi + di for xi, di in zip(x, step)]
+            trial_residuals = system.residuals(trial)
+            corrections += 1
+            trial_norm = system.norm(trial_residuals)
+            if trial_norm >= current:
+                break
+            x, residuals, current = trial, trial_residuals, trial_norm
+
+    if current <= tolerance:
+        system.write(x)
+        state.record(residuals)
+        elapsed = time.perf_counter() - started
+        system.report(residuals, corrections, True, elapsed, "warm_start", state)
+        return True
+
+    result = newton_system(system.residuals, x, tolerance, max_iterations, scale=system.scales)
+    system.write(result.x)
+    state.reset(result.jacobian)
+    state.record(result.residuals)
+    elapsed = time.perf_counter() - started
+    iterations = corrections + result.iterations
+    system.report(
+        result.residuals, iterations, result.converged, elapsed, "newton", state, result.jacobian
+    )
+    return result.converged
@@ -1,3 +1,5 @@
 """Volatility calibration."""
 
-__all__ = []
+from qfinlib.calibration.vol.sabr import SABRCalibrator, SABRQuote
+
+__all__ = ["SABRCalibrator", "SABRQuote"]
@@ -1 +1,206 @@
-"""SABR volatility calibration."""
+"""SABR volatility calibration.
+
+:class:`SABRCalibrator` fits ``alpha``, ``rho`` and ``nu`` (``beta`` fixed)
+to the quoted smile of every expiry x tenor slice of a swaption cube. Each
+fit is a Levenberg-Marquardt least-squares problem on a smile evaluated in
+one vectorised call. The parameters are mapped to unconstrained
+coordinates (``log alpha``, ``atanh rho``, ``log nu``), so every iterate is
+admissible.
+
+Slices sharing a tenor form a chain along the expiry axis. Each slice
+starts from the previous day's fit when one is supplied, and otherwise from
+its shorter-expiry neighbour. Chains are independent of each other and can
+run on an executor.
+"""
+from __future__ import annotations
+
+import math
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from qfinlib.market.irvol.sabr import SABRSmile
+from qfinlib.math.solver import levenberg_marquardt
+from qfinlib.pricing.models.vol.sabr import sabr_vols
+
+SliceKey = Tuple[float, float]
+
+# Correlations are kept strictly inside (-1, 1).
+_RHO_LIMIT = 0.9999
+
+
+@dataclass
+class SABRQuote:
+    """Market smile of one swaption expiry and tenor.
+
+    Parameters
+    ----------
+    expiry, tenor:
+        Option expiry and underlying swap tenor, in years.
+    forward:
+        Forward swap rate.
+    strikes, vols:
+        Quoted strikes and their Black volatilities.
+    weights:
+        Optional weight per quote in the least-squares fit.
+    """
+
+    expiry: float
+    tenor: float
+    forward: float
+    strikes: Sequence[float]
+    vols: Sequence[float]
+    weights: Optional[Sequence[float]] = None
+
+    def __post_init__(self) -> None:
+        if len(self.strikes) != len(self.vols):
+            raise ValueError("strikes and vols must have the same length")
+        if self.weights is not None and len(self.weights) != len(self.vols):
+            raise ValueError("weights must align with vols")
+
+    @property
+    def key(self) -> SliceKey:
+        return (self.expiry, self.tenor)
+
+    def atm_vol(self) -> float:
+        """Quoted volatility of the strike nearest the forward."""
+
+        nearest = min(range(len(self.strikes)), key=lambda i: abs(self.strikes[i] - self.forward))
+        return float(self.vols[nearest])
+
+
+class SABRCalibrator:
+    """Fit SABR smiles to swaption volatility quotes.
+
+    Parameters
+    ----------
+    beta:
+        Fixed CEV exponent.
+    tolerance:
+        Convergence tolerance of the least-squares fit.
+    max_iterations:
+        Levenberg-Marquardt iterations allowed per slice.
+    """
+
+    def __init__(self, beta: float = 0.5, tolerance: float = 1e-10, max_iterations: int = 100):
+        self.beta = beta
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+
+    def initial_guess(self, quote: SABRQuote) -> Tuple[float, float, float]:
+        """``(alpha, rho, nu)`` matching the ATM vol with a flat, moderately convex smile."""
+
+        alpha = quote.atm_vol() * quote.forward ** (1.0 - self.beta)
+        return alpha, 0.0, 0.3
+
+    def calibrate_slice(
+        self, quote: SABRQuote, guess: Optional[Tuple[float, float, float]] = None
+    ) -> SABRSmile:
+        """Fit one smile, starting from ``guess`` (``(alpha, rho, nu)``) if given.
+
+        The returned smile records the fit's ``error`` and whether it
+        ``converged``.
+        """
+
+        alpha, rho, nu = guess if guess is not None else self.initial_guess(quote)
+        rho = max(-_RHO_LIMIT, min(_RHO_LIMIT, rho))
+        x0 = [math.log(alpha), math.atanh(rho), math.log(max(nu, 1e-8))]
+        market = list(quote.vols)
+        weights = list(quote.weights) if quote.weights is not None else [1.0] * len(market)
+        beta, forward, expiry, strikes = self.beta, quote.forward, quote.expiry, quote.strikes
+
+        def residuals(x: List[float]) -> List[float]:
+            model = sabr_vols(
+                forward, strikes, expiry, math.exp(x[0]), beta, math.tanh(x[1]), math.exp(x[2])
+            )
+            return [w * (m - v) for w, m, v in zip(weights, model, market)]
+
+        fit = levenberg_marquardt(
+            residuals, x0, tolerance=self.tolerance, max_iterations=self.max_iterations
+        )
+        error = math.sqrt(2.0 * fit.cost / len(market)) if market else 0.0
+        return SABRSmile(
+            expiry=quote.expiry,
+            tenor=quote.tenor,
+            forward=forward,
+            alpha=math.exp(fit.x[0]),
+            beta=beta,
+            rho=math.tanh(fit.x[1]),
+            nu=math.exp(fit.x[2]),
+            error=error,
+            converged=fit.converged,
+        )
+
+    def calibrate_chain(
+        self, quotes: Sequence[SABRQuote], previous: Optional[Mapping[SliceKey, SABRSmile]] = None
+    ) -> List[SABRSmile]:
+        """Fit slices in order, each warm-started from ``previous`` or the last fit."""
+
+        smiles: List[SABRSmile] = []
+        for quote in quotes:
+            guess: Optional[Tuple[float, float, float]] = None
+            prior = previous.get(quote.key) if previous else None
+            if prior is None and smiles:
+                prior = smiles[-1]
+            if prior is not None:
+                guess = (prior.alpha, prior.rho, prior.nu)
+            smiles.append(self.calibrate_slice(quote, guess))
+        return smiles
+
+    def calibrate_cube(
+        self,
+        quotes: Sequence[SABRQuote],
+        previous: Optional[Mapping[SliceKey, SABRSmile]] = None,
+        executor: Union[str, Executor, None] = "serial",
+        max_workers: Optional[int] = None,
+    ) -> Dict[SliceKey, SABRSmile]:
+        """Fit every slice of a cube.
+
+        Parameters
+        ----------
+        quotes:
+            One :class:`SABRQuote` per expiry and tenor.
+        previous:
+            Earlier fits keyed by ``(expiry, tenor)``, e.g. the previous
+            day's cube, used as starting points.
+        executor:
+            ``"serial"`` (the default) or ``None`` to fit in this thread,
+            ``"thread"`` or ``"process"`` for a pool of that kind created for
+            the call, or an existing :class:`concurrent.futures.Executor`,
+            which is left open. Smile fits hold the GIL, so threads do not
+            speed them up; processes scale with cores once the cube is large
+            enough to repay starting them.
+        max_workers:
+            Pool size for the pools created here.
+
+        Returns the smiles keyed by ``(expiry, tenor)``.
+        """
+
+        chains: Dict[float, List[SABRQuote]] = {}
+        for quote in quotes:
+            chains.setdefault(quote.tenor, []).append(quote)
+        ordered = [sorted(chain, key=lambda q: q.expiry) for _, chain in sorted(chains.items())]
+        jobs = []
+        for chain in ordered:
+            prior = None
+            if previous:
+                prior = {q.key: previous[q.key] for q in chain if q.key in previous}
+            jobs.append((chain, prior))
+
+        if executor is None or executor == "serial":
+            fitted = [self.calibrate_chain(chain, prior) for chain, prior in jobs]
+        else:
+            if isinstance(executor, str):
+                pools = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+                if executor not in pools:
+                    raise ValueError(f"Unsupported executor: {executor}")
+                pool = pools[executor](max_workers=max_workers)
+            else:
+                pool = executor
+            try:
+                futures = [pool.submit(self.calibrate_chain, chain, prior) for chain, prior in jobs]
+                fitted = [future.result() for future in futures]
+            finally:
+                if pool is not executor:
+                    pool.shutdown()
+        return {(smile.expiry, smile.tenor): smile for chain in fitted for smile in chain}
@@ -1 +1,32 @@
-"""Dual numbers for forward-mode AD."""
+"""Dual numbers for forward-mode AD.
+
+Compatibility alias of :mod:`qfinlib.math.ad.dual`.
+"""
+
+from qfinlib.math.ad.dual import (
+    ADScalar,
+    Dual,
+    Tangent,
+    as_number,
+    erf,
+    exp,
+    is_dual,
+    log,
+    sqrt,
+    tangent_of,
+    value_of,
+)
+
+__all__ = [
+    "ADScalar",
+    "Dual",
+    "Tangent",
+    "exp",
+    "log",
+    "sqrt",
+    "erf",
+    "as_number",
+    "value_of",
+    "tangent_of",
+    "is_dual",
+]
@@ -1 +1,8 @@
-"""Reverse-mode AD tape."""
+"""Reverse-mode AD tape.
+
+Compatibility alias of :mod:`qfinlib.math.ad.tape`.
+"""
+
+from qfinlib.math.ad.tape import Adjoint, Tape
+
+__all__ = ["Tape", "Adjoint"]
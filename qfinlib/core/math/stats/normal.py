@@ -1 +1,22 @@
-"""Normal distribution utilities."""
+"""Normal distribution utilities.
+
+Compatibility alias of :mod:`qfinlib.math.stats.normal`.
+"""
+
+from qfinlib.math.stats.normal import (
+    norm_cdf,
+    norm_cdf_many,
+    norm_pdf,
+    norm_pdf_many,
+    norm_ppf,
+    norm_ppf_many,
+)
+
+__all__ = [
+    "norm_cdf",
+    "norm_pdf",
+    "norm_ppf",
+    "norm_cdf_many",
+    "norm_pdf_many",
+    "norm_ppf_many",
+]
@@ -1,6 +1,7 @@
 """MarketContainer."""
 
-from typing import Dict, Any, Optional
+import copy
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
 from datetime import date
 
 
@@ -13,15 +14,143 @@ class MarketContainer:
         self.curves: Dict[str, Any] = {}
         self.surfaces: Dict[str, Any] = {}
         self.data: Dict[str, Any] = {}
+        self._discount_tables: Dict[str, Any] = {}
+        #: ``True`` for copies made by :meth:`differentiable`, whose inputs are AD values.
+        self.seeded = False
 
     def add_curve(self, name: str, curve: Any):
         """Add a curve to the container."""
         self.curves[name] = curve
+        self._discount_tables.pop(name, None)
 
     def get_curve(self, name: str) -> Optional[Any]:
         """Get a curve by name."""
         return self.curves.get(name)
 
+    def discount_table(self, name: str) -> Optional[Any]:
+        """Get the shared discount-factor table for a curve.
+
+        The table is created lazily on first use and shared by every pricer
+        working against this container, so payment times common to many
+        trades are discounted once. It is repriced when the curve is replaced
+        or reports a new version. Returns ``None`` when the curve is missing
+        or cannot produce discount factors.
+        """
+        curve = self.curves.get(name)
+        if curve is None or getattr(curve, "discount_factors", None) is None:
+            return None
+        table = self._discount_tables.get(name)
+        if table is None or table.curve is not curve:
+            from qfinlib.market.curve.grid import DiscountTable
+
+            table = DiscountTable(curve)
+            self._discount_tables[name] = table
+        elif table.stale:
+            table.refresh()
+        return table
+
+    def fork(self) -> "MarketContainer":
+        """Shallow copy sharing curves, surfaces and data, with its own discount tables.
+
+        Discount tables fill lazily, so workers pricing concurrently each
+        read from their own fork.
+        """
+        forked = copy.copy(self)
+        forked.curves = dict(self.curves)
+        forked.surfaces = dict(self.surfaces)
+        forked.data = dict(self.data)
+        forked._discount_tables = {}
+        return forked
+
+    def reset_discount_tables(self) -> None:
+        """Drop the shared discount tables; they are rebuilt on next use."""
+        self._discount_tables = {}
+
+    def differentiable(
+        self,
+        curves: Optional[Iterable[str]] = None,
+        data: Iterable[str] = (),
+        surfaces: Iterable[str] = (),
+        variable: Optional[Callable[[float, Hashable], Any]] = None,
+    ) -> "MarketContainer":
+        """Copy of the market whose inputs are :class:`~qfinlib.math.ad.Dual` variables.
+
+        Pricing against the copy returns Dual results whose tangents are the
+        derivatives with respect to every seeded input, from one pass.
+
+        Parameters
+        ----------
+        curves:
+            Curves whose nodes are seeded, under ``(curve name, node name)``
+            keys; every curve supporting :meth:`~qfinlib.market.curve.Curve.with_values`
+            by default. Spread curves are rebuilt over their seeded base
+            curves, so they also carry derivatives with respect to the base
+            nodes. A base curve held in the market is keyed by its own name;
+            one that is not is seeded with its spread curve, under
+            ``"<spread curve name>.base"``.
+        data:
+            Numeric entries of :attr:`data` to seed under their own key.
+        surfaces:
+            Callable vol surfaces whose output is shifted by a Dual zero
+            keyed by the surface name, giving parallel vega.
+        variable:
+            Factory ``variable(value, key)`` of the seeded inputs;
+            :meth:`Dual.variable <qfinlib.math.ad.Dual.variable>` by default,
+            or :meth:`Tape.variable <qfinlib.math.ad.Tape.variable>` to record
+            a reverse-mode pass.
+        """
+        if variable is None:
+            from qfinlib.math.ad import Dual
+
+            variable = Dual.variable
+        seeded = copy.copy(self)
+        seeded.curves = dict(self.curves)
+        seeded.surfaces = dict(self.surfaces)
+        seeded.data = dict(self.data)
+        seeded._discount_tables = {}
+        seeded.seeded = True
+        selected = set(self.curves) if curves is None else set(curves)
+        names = {id(curve): name for name, curve in self.curves.items()}
+        rebuilt: Dict[int, Any] = {}
+
+        def seed(curve: Any, name: str, nodes: bool) -> Any:
+            if id(curve) in rebuilt:
+                return rebuilt[id(curve)]
+            base = getattr(curve, "base_curve", None)
+            seeded_base = base
+            if base is not None:
+                base_name = names.get(id(base))
+                if base_name is None:
+                    seeded_base = seed(base, f"{name}.base", nodes)
+                else:
+                    seeded_base = seed(base, base_name, base_name in selected)
+            result = curve
+            if getattr(curve, "with_values", None) is not None and curve.pillars:
+                if nodes:
+                    values = [
+                        variable(value, (name, node))
+                        for value, node in zip(curve.values, curve.instruments)
+                    ]
+                    result = curve.with_values(values)
+                if seeded_base is not base:
+                    if result is curve:
+                        result = curve.with_values(curve.values)
+                    result.base_curve = seeded_base
+            rebuilt[id(curve)] = result
+            return result
+
+        for name, curve in self.curves.items():
+            seeded.curves[name] = seed(curve, name, name in selected)
+        for key in data:
+            value = self.data.get(key)
+            if isinstance(value, (int, float)):
+                seeded.data[key] = variable(value, key)
+        for name in surfaces:
+            surface = self.surfaces.get(name)
+            if callable(surface):
+                seeded.surfaces[name] = _SeededSurface(surface, variable(0.0, name))
+        return seeded
+
     def add_surface(self, name: str, surface: Any):
         """Add a volatility surface to the container."""
         self.surfaces[name] = surface
@@ -32,3 +161,22 @@ class MarketContainer:
 
     def __repr__(self) -> str:
         return f"MarketContainer(as_of={self.as_of}, {len(self.curves)} curves, {len(self.surfaces)} surfaces)"
+
+
+class _SeededSurface:
+    """Vol surface whose lookups are shifted by the differentiable zero ``shift``."""
+
+    _LOOKUPS = ("vol", "swaption_vol")
+
+    def __init__(self, surface: Any, shift: Any):
+        self.surface = surface
+        self.shift = shift
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.surface(*args, **kwargs) + self.shift
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.surface, name)
+        if name in self._LOOKUPS and callable(attr):
+            return lambda *args, **kwargs: attr(*args, **kwargs) + self.shift
+        return attr
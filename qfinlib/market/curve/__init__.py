@@ -4,6 +4,9 @@ from .discount import DiscountCurve
 from .forward import ForwardCurve
 from .zero import ZeroCurve
 from .spread import SpreadCurve
+from .frozen import FrozenCurve
+from .composite import CompositeCurve
+from .grid import DiscountTable
 
 __all__ = [
     "Curve",
@@ -12,4 +15,7 @@ __all__ = [
     "ForwardCurve",
     "ZeroCurve",
     "SpreadCurve",
+    "FrozenCurve",
+    "CompositeCurve",
+    "DiscountTable",
 ]
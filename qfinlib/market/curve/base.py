@@ -7,19 +7,36 @@ multiple interpolation and extrapolation conventions.
 """
 from __future__ import annotations
 
+import copy
+import math
+from bisect import bisect_left, bisect_right
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
 
+from qfinlib.math import backend
+from qfinlib.math.ad import ADScalar, is_dual
 from qfinlib.math.interpolation import (
     CubicInterpolator,
+    FittedInterpolator,
     Interpolator,
     LinearInterpolator,
     LogLinearInterpolator,
     MonotoneInterpolator,
 )
 
+from .bumped import ShiftedValues
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from .frozen import FrozenCurve
+
 InterpolatorLike = Union[str, Interpolator]
 
+# Attributes whose reassignment invalidates the fitted interpolator.
+_NODE_FIELDS = frozenset({"pillars", "values"})
+# Number of node changes remembered for :meth:`Curve.changed_range`.
+_CHANGE_LOG_SIZE = 256
+
 
 def _make_interpolator(kind: InterpolatorLike, extrapolation: str) -> Interpolator:
     if isinstance(kind, Interpolator):
@@ -81,7 +98,95 @@ class Curve:
         self.pillars = [float(p) for p, _, _ in combined]
         self.values = [float(v) for _, v, _ in combined]
         self.instruments = [ins for _, _, ins in combined]
+        self.market_data = dict(self.market_data)
         self._interpolator: Interpolator = _make_interpolator(self.interpolation, self.extrapolation)
+        self._view_base: Optional[Curve] = None
+        self._changes: deque = deque(maxlen=_CHANGE_LOG_SIZE)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name in _NODE_FIELDS:
+            self.__dict__["_fitted"] = None
+            self.__dict__["_index"] = None
+            self._nodes_changed()
+        elif name == "instruments":
+            self.__dict__["_index"] = None
+
+    @property
+    def version(self) -> int:
+        """Counter incremented on every node change.
+
+        Downstream caches record the version they were built at and use
+        :meth:`changed_range` to refresh only what a change affected. Bumped
+        views report the version of their base curve.
+        """
+
+        base = self.__dict__.get("_view_base")
+        if base is not None:
+            return base.version
+        return self.__dict__.get("_version", 0)
+
+    def changed_range(self, since: int) -> Optional[Tuple[float, float]]:
+        """Return the time interval whose values may differ from version ``since``.
+
+        ``None`` means nothing changed; ``(-inf, inf)`` is returned when the
+        change history no longer reaches back to ``since``.
+        """
+
+        base = self.__dict__.get("_view_base")
+        if base is not None:
+            return base.changed_range(since)
+        current = self.version
+        if since >= current:
+            return None
+        log = self._changes
+        if not log or log[0][0] > since + 1:
+            return (-math.inf, math.inf)
+        lo, hi = math.inf, -math.inf
+        for version, start, end in log:
+            if version > since:
+                lo, hi = min(lo, start), max(hi, end)
+        return (lo, hi)
+
+    def _nodes_changed(self, lo: float = -math.inf, hi: float = math.inf) -> None:
+        state = self.__dict__
+        state["_version"] = state.get("_version", 0) + 1
+        log = state.get("_changes")
+        if log is not None:
+            log.append((state["_version"], lo, hi))
+
+    def _affected_range(self, index: int) -> Tuple[float, float]:
+        """Time interval influenced by the node at ``index`` under the current interpolation."""
+
+        if not self._interpolator.local:
+            return (-math.inf, math.inf)
+        pillars = self.pillars
+        # The two outermost nodes also drive linear extrapolation.
+        lo = -math.inf if index <= 1 else pillars[index - 1]
+        hi = math.inf if index >= len(pillars) - 2 else pillars[index + 1]
+        return (lo, hi)
+
+    def _fitted_interpolator(self) -> FittedInterpolator:
+        """Return the interpolator bound to the current nodes, fitting it on first use."""
+
+        state = self.__dict__
+        fitted = state.get("_fitted")
+        if fitted is None or (
+            state.get("_view_base") is not None and state["_fitted_version"] != self.version
+        ):
+            fitted = self._interpolator.fit(self.pillars, self.values)
+            state["_fitted"] = fitted
+            state["_fitted_version"] = self.version
+        return fitted
+
+    def _instrument_index(self) -> Dict[str, List[int]]:
+        index = self.__dict__.get("_index")
+        if index is None:
+            index = {}
+            for position, instrument in enumerate(self.instruments):
+                index.setdefault(instrument, []).append(position)
+            self.__dict__["_index"] = index
+        return index
 
     def _build_instruments(self) -> List[str]:
         if self.instruments is None:
@@ -111,30 +216,173 @@ class Curve:
             raise ValueError("Curve has no pillars defined")
         if len(self.pillars) == 1:
             return self.values[0]
-        return float(self._interpolator(self.pillars, self.values, float(t)))
+        value = self._fitted_interpolator()(float(t))
+        return value if isinstance(value, ADScalar) else float(value)
+
+    def values_at(self, ts: Sequence[float]) -> Any:
+        """Return the curve values at each time in ``ts``.
+
+        The result is a NumPy array when NumPy is installed and a list
+        otherwise; entries equal those returned by :meth:`value`.
+        """
+
+        if not self.pillars:
+            raise ValueError("Curve has no pillars defined")
+        if len(self.pillars) == 1:
+            return backend.to_output([self.values[0] for _ in ts])
+        if self._has_duals():
+            # Dual nodes cannot enter float arrays; evaluate point by point.
+            return [self.value(t) for t in ts]
+        return self._fitted_interpolator().evaluate_many(ts)
+
+    def fit(self) -> "Curve":
+        """Fit the interpolator to the current nodes now instead of on first use.
+
+        Curves with :class:`~qfinlib.math.ad.Adjoint` nodes are fitted
+        before a tape checkpoint, so the fit outlives per-trade rewinds.
+        """
+
+        if len(self.pillars) > 1:
+            self._fitted_interpolator()
+        return self
+
+    def _has_duals(self) -> bool:
+        """``True`` for :meth:`with_values` views carrying AD node values."""
+
+        return self.__dict__.get("_duals", False)
+
+    def _ensure_mutable(self) -> None:
+        if self._view_base is not None:
+            raise TypeError("Bumped curve views are read-only; update the base curve instead")
 
     def update_market_quotes(self, quotes: Mapping[str, float]) -> None:
-        """Update node values using a mapping keyed by instrument names."""
-
-        updated = False
-        values = list(self.values)
-        for idx, instrument in enumerate(self.instruments):
-            if instrument in quotes:
-                values[idx] = float(quotes[instrument])
-                updated = True
-        if updated:
-            self.values = values
-        self.market_data = {**dict(self.market_data), **dict(quotes)}
+        """Update node values using a mapping keyed by instrument names.
+
+        Each quote is applied in place in ``O(1)`` through an instrument
+        index. A fitted local interpolator is patched on the two adjacent
+        segments only; other interpolators are refitted on next use.
+        """
+
+        self._ensure_mutable()
+        index = self._instrument_index()
+        for instrument, quote in quotes.items():
+            positions = index.get(instrument)
+            if positions is None:
+                continue
+            quote = float(quote)
+            for position in positions:
+                self.set_node_value(position, quote)
+        self.market_data.update(quotes)
+
+    def set_node_value(self, index: int, value: float) -> None:
+        """Overwrite the value of the node at position ``index`` in place.
+
+        Unlike :meth:`update_market_quotes` the market data mapping is left
+        untouched, which suits solvers that move node values while the
+        quotes stay fixed.
+        """
+
+        self._ensure_mutable()
+        self.values[index] = value
+        state = self.__dict__
+        fitted = state.get("_fitted")
+        if fitted is not None and not fitted.update(index, value):
+            state["_fitted"] = None
+        self._nodes_changed(*self._affected_range(index))
+
+    @property
+    def local_interpolation(self) -> bool:
+        """``True`` when each node only influences its two adjacent segments."""
+
+        return self._interpolator.local
 
     def add_node(self, pillar: float, value: float, instrument: Optional[str] = None) -> None:
-        """Insert a new curve node and keep internal ordering consistent."""
+        """Insert a new curve node and keep internal ordering consistent.
+
+        The insertion point is located by bisection and the node lists are
+        updated in place.
+        """
 
+        self._ensure_mutable()
+        pillar, value = float(pillar), float(value)
         instrument = instrument or f"node_{len(self.pillars)}"
-        self.pillars = list(self.pillars) + [float(pillar)]
-        self.values = list(self.values) + [float(value)]
-        self.instruments = list(self.instruments) + [instrument]
-        combined = sorted(zip(self.pillars, self.values, self.instruments))
-        self.pillars, self.values, self.instruments = map(list, zip(*combined))
+        pillars = self.pillars
+        lo, hi = bisect_left(pillars, pillar), bisect_right(pillars, pillar)
+        if lo != hi:
+            # Equal pillars are ordered by value then instrument, as on construction.
+            ties = list(zip(self.values[lo:hi], self.instruments[lo:hi]))
+            lo += bisect_right(ties, (value, instrument))
+        pillars.insert(lo, pillar)
+        self.values.insert(lo, value)
+        self.instruments.insert(lo, instrument)
+        state = self.__dict__
+        state["_fitted"] = None
+        state["_index"] = None
+        self._nodes_changed(*self._affected_range(lo))
+
+    def bumped(
+        self,
+        shift: float = 0.0,
+        pillar: Optional[Union[int, str]] = None,
+        shifts: Optional[Sequence[float]] = None,
+    ) -> "Curve":
+        """Return a read-only view of the curve with shifted node values.
+
+        Unlike :meth:`bump`, the view shares the pillars, instruments,
+        interpolator and metadata of this curve and applies the shift lazily
+        through :class:`~qfinlib.market.curve.bumped.ShiftedValues`. The view
+        is an instance of the same class, so ``value``, ``discount_factor``
+        and the batch methods behave exactly as on a bumped copy. Views
+        follow later quote updates of the base curve. A ``pillar`` bump
+        stays on the same instrument when nodes are added to the base curve;
+        ``shifts`` refer to node positions, so reading a bucketed view after
+        the base gained or lost nodes raises :class:`ValueError`.
+
+        Parameters
+        ----------
+        shift:
+            Parallel shift, or the shift of the single node selected by
+            ``pillar``.
+        pillar:
+            Optional node to shift, given as a position or instrument name.
+        shifts:
+            Optional per-node shift vector (bucketed shift). Overrides
+            ``shift`` and ``pillar``.
+        """
+
+        index: Optional[int] = None
+        if shifts is None and pillar is not None:
+            index = self.instruments.index(pillar) if isinstance(pillar, str) else int(pillar)
+        view = copy.copy(self)
+        view.__dict__.update(_view_base=self, _changes=deque(maxlen=_CHANGE_LOG_SIZE))
+        view.values = ShiftedValues(self.values, shift, index, shifts, self.instruments)
+        return view
+
+    def with_values(self, values: Sequence[Any]) -> "Curve":
+        """Return a read-only view of the curve with node values replaced by ``values``.
+
+        Like :meth:`bumped`, the view shares everything but the node values
+        with this curve. The values are taken as given, so they may be
+        :class:`~qfinlib.math.ad.Dual` numbers to differentiate any curve
+        evaluation with respect to the nodes. The view does not follow later
+        updates of this curve.
+        """
+
+        if len(values) != len(self.pillars):
+            raise ValueError("values must align with the curve pillars")
+        view = copy.copy(self)
+        view.__dict__.update(
+            _view_base=self, _changes=deque(maxlen=_CHANGE_LOG_SIZE), _duals=is_dual(values)
+        )
+        view.values = list(values)
+        return view
+
+    def freeze(self) -> "FrozenCurve":
+        """Return a compact immutable snapshot of the curve."""
+
+        from .frozen import FrozenCurve
+
+        return FrozenCurve.from_curve(self)
 
     def bump(self, spread: float) -> "Curve":
         """Return a bumped copy of the curve."""
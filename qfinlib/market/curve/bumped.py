@@ -0,0 +1,95 @@
+"""Lazy shifted node values backing bumped curve views.
+
+:meth:`qfinlib.market.curve.Curve.bumped` returns a shallow view of a curve
+that shares the base curve's pillars, instruments and metadata and replaces
+its values with a :class:`ShiftedValues` overlay. Shifts are applied when a
+node is read, so creating a view neither copies nor re-sorts anything.
+"""
+from __future__ import annotations
+
+from typing import Iterator, Optional, Sequence, Union
+
+
+class ShiftedValues(Sequence):
+    """Read-only sequence presenting ``base[i]`` plus a shift.
+
+    Parameters
+    ----------
+    base:
+        Node values of the underlying curve. The sequence is referenced, not
+        copied.
+    shift:
+        Amount added to every node (parallel shift) or, when ``index`` is
+        given, to that node only.
+    index:
+        Optional position of the single node to shift.
+    shifts:
+        Optional per-node shift vector aligned with ``base``. Takes
+        precedence over ``shift``/``index``.
+    instruments:
+        Instrument names of the base nodes, referenced like ``base``. When
+        given, the node selected by ``index`` is tracked by name, so nodes
+        inserted into or removed from the base curve do not move the shift.
+
+    Per-node ``shifts`` are positional: reading the values after the base
+    curve gained or lost nodes raises :class:`ValueError`.
+    """
+
+    __slots__ = ("base", "shift", "index", "shifts", "instruments", "name", "size")
+
+    def __init__(
+        self,
+        base: Sequence[float],
+        shift: float = 0.0,
+        index: Optional[int] = None,
+        shifts: Optional[Sequence[float]] = None,
+        instruments: Optional[Sequence[str]] = None,
+    ):
+        if shifts is not None and len(shifts) != len(base):
+            raise ValueError("shifts must have the same length as the curve values")
+        if index is not None:
+            if not -len(base) <= index < len(base):
+                raise IndexError("pillar index out of range")
+            index %= len(base)
+        self.base = base
+        self.shift = float(shift)
+        self.index = index
+        self.shifts = shifts
+        self.instruments = instruments
+        self.name = instruments[index] if instruments is not None and index is not None else None
+        self.size = len(base)
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def _realign(self) -> None:
+        """Follow a change in the number of base nodes."""
+
+        if self.shifts is not None:
+            raise ValueError("bucketed shifts no longer align with the curve nodes")
+        if self.index is not None:
+            if self.name is None:
+                raise ValueError("the shifted node moved; bump it by instrument name")
+            self.index = self.instruments.index(self.name)
+        self.size = len(self.base)
+
+    def __getitem__(self, item: Union[int, slice]):
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(len(self)))]
+        if len(self.base) != self.size:
+            self._realign()
+        value = self.base[item]
+        if self.shifts is not None:
+            return value + self.shifts[item]
+        if self.index is None:
+            return value + self.shift
+        if item % len(self.base) == self.index:
+            return value + self.shift
+        return value
+
+    def __iter__(self) -> Iterator[float]:
+        for i in range(len(self.base)):
+            yield self[i]
+
+    def __repr__(self) -> str:  # pragma: no cover - representation aid
+        return f"ShiftedValues({len(self)} nodes)"
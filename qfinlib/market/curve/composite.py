@@ -0,0 +1,159 @@
+"""Compiled evaluation of spread curve chains.
+
+An issuer spread over a government spread over an OIS curve is represented
+as nested :class:`~qfinlib.market.curve.SpreadCurve` objects, and every
+nested lookup re-enters each layer's ``value`` method and probes the base
+curve's attributes. :class:`CompositeCurve` walks the chain once, binds the
+root curve's evaluation methods and each layer's fitted interpolator, and
+then adds the layers up in a flat loop (or one vectorised pass per layer
+for batch calls). Each layer is still evaluated on its own nodes, in the
+same order as the nested evaluation, so results are identical.
+"""
+from __future__ import annotations
+
+import math
+from typing import Any, Callable, List, Sequence, Tuple
+
+from qfinlib.math import backend
+
+from .base import Curve
+from .spread import SpreadCurve
+
+
+class _Constant:
+    """Evaluator for single-node layers, mirroring :meth:`Curve.value`."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: float):
+        self.value = value
+
+    def __call__(self, t: float) -> float:
+        return self.value
+
+    def evaluate_many(self, ts: Sequence[float]) -> Any:
+        return backend.to_output([self.value for _ in ts])
+
+
+class CompositeCurve:
+    """Compiled evaluator for a chain of spread curves.
+
+    Parameters
+    ----------
+    curve:
+        Outermost :class:`SpreadCurve` of the chain. The chain is followed
+        through ``base_curve`` until a non-spread curve (the root) is found.
+
+    The evaluator recompiles itself automatically when any curve in the chain
+    reports a new :attr:`~qfinlib.market.curve.Curve.version`.
+    """
+
+    def __init__(self, curve: SpreadCurve):
+        layers: List[SpreadCurve] = []
+        node: Curve = curve
+        while isinstance(node, SpreadCurve):
+            layers.append(node)
+            node = node.base_curve
+        # Spreads are accumulated from the innermost layer outwards.
+        self.layers: Tuple[SpreadCurve, ...] = tuple(reversed(layers))
+        self.root: Curve = node
+        self._chain: Tuple[Curve, ...] = (node,) + self.layers
+        self._compile()
+
+    def _versions(self) -> Tuple[int, ...]:
+        return tuple(curve.version for curve in self._chain)
+
+    def _compile(self) -> None:
+        root = self.root
+        self._root_value: Callable[[float], float] = root.value
+        self._root_values = root.values_at
+        self._root_rate = getattr(root, "zero_rate", None)
+        self._root_rates = getattr(root, "zero_rates", None)
+        self._root_df = getattr(root, "discount_factor", None)
+        self._root_dfs = getattr(root, "discount_factors", None)
+        self._spreads = [self._layer_evaluator(layer) for layer in self.layers]
+        self._compiled_versions = self._versions()
+
+    @staticmethod
+    def _layer_evaluator(layer: SpreadCurve):
+        if not layer.pillars:
+            raise ValueError("Curve has no pillars defined")
+        if len(layer.pillars) == 1:
+            return _Constant(layer.values[0])
+        return layer._fitted_interpolator()
+
+    def _refresh(self) -> None:
+        for curve, version in zip(self._chain, self._compiled_versions):
+            if curve.version != version:
+                self._compile()
+                return
+
+    def _accumulate(self, base: float, t: float) -> float:
+        for spread in self._spreads:
+            base = base + float(spread(t))
+        return base
+
+    def _accumulate_many(self, base: Any, times: Any) -> Any:
+        if backend.np is not None:
+            for spread in self._spreads:
+                base = base + spread.evaluate_many(times)
+            return base
+        for spread in self._spreads:
+            base = [b + s for b, s in zip(base, spread.evaluate_many(times))]
+        return base
+
+    def value(self, t: float) -> float:
+        """Root value plus all spreads at ``t``; equals the outer curve's ``value``."""
+
+        self._refresh()
+        t = float(t)
+        return self._accumulate(self._root_value(t), t)
+
+    def values_at(self, ts: Sequence[float]) -> Any:
+        self._refresh()
+        times = backend.as_floats(ts)
+        return self._accumulate_many(self._root_values(times), times)
+
+    def zero_rate(self, t: float) -> float:
+        self._refresh()
+        if self._root_rate is None:
+            raise AttributeError("Root curve does not provide zero rates")
+        t = float(t)
+        return self._accumulate(self._root_rate(t), t)
+
+    def zero_rates(self, ts: Sequence[float]) -> Any:
+        self._refresh()
+        if self._root_rates is None:
+            raise AttributeError("Root curve does not provide zero rates")
+        times = backend.as_floats(ts)
+        return self._accumulate_many(self._root_rates(times), times)
+
+    def discount_factor(self, t: float) -> float:
+        self._refresh()
+        t = float(t)
+        if self._root_rate is None:
+            return self._root_only_df(t)
+        return math.exp(-self._accumulate(self._root_rate(t), t) * t)
+
+    def discount_factors(self, ts: Sequence[float]) -> Any:
+        """Vectorised discount factors for the whole chain."""
+
+        self._refresh()
+        times = backend.as_floats(ts)
+        if self._root_rates is None:
+            return self._root_only_df(times, batch=True)
+        rates = self._accumulate_many(self._root_rates(times), times)
+        if backend.np is not None:
+            return backend.exp(-rates * times)
+        return [math.exp(-rate * t) for rate, t in zip(rates, times)]
+
+    def _root_only_df(self, t: Any, batch: bool = False) -> Any:
+        # A single spread over a root without zero rates discounts on the root,
+        # exactly as SpreadCurve.discount_factor does.
+        getter = self._root_dfs if batch else self._root_df
+        if getter is None or len(self.layers) != 1:
+            raise AttributeError("Base curve does not support discount factors")
+        return getter(t)
+
+    def __repr__(self) -> str:  # pragma: no cover - representation aid
+        return f"CompositeCurve({len(self.layers)} spread layers over {type(self.root).__name__})"
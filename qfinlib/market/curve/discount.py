@@ -2,10 +2,15 @@
 from __future__ import annotations
 
 import math
-from typing import Mapping, Optional, Sequence
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, Optional, Sequence
+
+from qfinlib.math import ad, backend
 
 from .base import Curve, InterpolatorLike
 
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from .grid import DiscountTable
+
 
 class DiscountCurve(Curve):
     """Curve representing discount factors or zero rates.
@@ -53,4 +58,27 @@ class DiscountCurve(Curve):
 
     def discount_factor(self, t: float) -> float:
         rate = self.zero_rate(t)
-        return math.exp(-rate * float(t))
+        return ad.exp(-rate * float(t))
+
+    def zero_rates(self, ts: Sequence[float]) -> Any:
+        """Vectorised :meth:`zero_rate` over the times ``ts``."""
+
+        return self.values_at(ts)
+
+    def discount_factors(self, ts: Sequence[float]) -> Any:
+        """Vectorised :meth:`discount_factor` over the times ``ts``."""
+
+        if self._has_duals():
+            return [self.discount_factor(t) for t in ts]
+        times = backend.as_floats(ts)
+        rates = self.zero_rates(times)
+        if backend.np is not None:
+            return backend.exp(-rates * times)
+        return [math.exp(-rate * t) for rate, t in zip(rates, times)]
+
+    def on_grid(self, times: Iterable[float] = ()) -> "DiscountTable":
+        """Return a lazily priced :class:`DiscountTable` over ``times``."""
+
+        from .grid import DiscountTable
+
+        return DiscountTable(self, times)
@@ -1,7 +1,7 @@
 """Forward curve."""
 from __future__ import annotations
 
-from typing import Mapping, Optional, Sequence
+from typing import Any, Mapping, Optional, Sequence
 
 from .base import Curve, InterpolatorLike
 
@@ -45,5 +45,10 @@ class ForwardCurve(Curve):
             return float(self.values[0]) if self.values else 0.0
         return self.value(t)
 
+    def forward_rates(self, ts: Sequence[float]) -> Any:
+        """Vectorised :meth:`forward_rate` over the times ``ts``."""
+
+        return self.values_at(ts)
+
     # Some consumers call ``rate`` instead of ``forward_rate``.
     rate = forward_rate
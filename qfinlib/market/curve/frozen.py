@@ -0,0 +1,231 @@
+"""Compact immutable curve representation.
+
+:class:`FrozenCurve` stores curve nodes in ``array('d')`` buffers with
+interned instrument labels and no reference to the market data dictionary
+used to build it. Instances are hashable by content, which makes them safe
+cache keys, and cheap to pickle across process boundaries.
+"""
+from __future__ import annotations
+
+import hashlib
+import struct
+import sys
+from array import array
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Type
+
+from qfinlib.math import backend
+from qfinlib.math.interpolation import FittedInterpolator
+
+from .base import Curve, InterpolatorLike, _make_interpolator
+
+
+def _curve_class(name: str) -> Type[Curve]:
+    pending = [Curve]
+    while pending:
+        cls = pending.pop()
+        if cls.__name__ == name:
+            return cls
+        pending.extend(cls.__subclasses__())
+    raise ValueError(f"Unknown curve class: {name}")
+
+
+class FrozenCurve:
+    """Immutable, ``__slots__``-based snapshot of a :class:`Curve`.
+
+    Parameters
+    ----------
+    pillars, values:
+        Node times and values; stored as ``array('d')`` in pillar order.
+    instruments:
+        Optional node labels; interned so identical labels across thousands
+        of curves share storage.
+    interpolation, extrapolation, curve_type:
+        Same meaning as on :class:`Curve`.
+    kind:
+        Name of the :class:`Curve` subclass restored by :meth:`to_curve`.
+    metadata:
+        Descriptive metadata, exposed read-only. It is not part of the
+        content hash.
+    """
+
+    __slots__ = (
+        "kind",
+        "curve_type",
+        "pillars",
+        "values",
+        "instruments",
+        "interpolation",
+        "extrapolation",
+        "metadata",
+        "_hash",
+        "_fitted",
+    )
+
+    def __init__(
+        self,
+        pillars: Iterable[float],
+        values: Iterable[float],
+        instruments: Optional[Sequence[str]] = None,
+        interpolation: InterpolatorLike = "linear",
+        extrapolation: str = "flat",
+        curve_type: str = "generic",
+        kind: str = "Curve",
+        metadata: Optional[Mapping[str, Any]] = None,
+    ):
+        pillar_array = array("d", pillars)
+        value_array = array("d", values)
+        if len(pillar_array) != len(value_array):
+            raise ValueError("pillars and values must have the same length")
+        if any(b < a for a, b in zip(pillar_array, pillar_array[1:])):
+            raise ValueError("FrozenCurve pillars must be sorted")
+        if instruments is None:
+            labels = tuple(sys.intern(f"node_{i}") for i in range(len(pillar_array)))
+        else:
+            if len(instruments) != len(pillar_array):
+                raise ValueError("instruments must be None or have the same length as pillars")
+            labels = tuple(sys.intern(str(label)) for label in instruments)
+        _set = object.__setattr__
+        _set(self, "kind", sys.intern(kind))
+        _set(self, "curve_type", sys.intern(curve_type))
+        _set(self, "pillars", pillar_array)
+        _set(self, "values", value_array)
+        _set(self, "instruments", labels)
+        _set(self, "interpolation", interpolation)
+        _set(self, "extrapolation", sys.intern(extrapolation))
+        _set(self, "metadata", MappingProxyType(dict(metadata or {})))
+        _set(self, "_hash", None)
+        _set(self, "_fitted", None)
+
+    @classmethod
+    def from_curve(cls, curve: Curve) -> "FrozenCurve":
+        """Snapshot ``curve``; its ``market_data`` mapping is not retained."""
+
+        if hasattr(curve, "base_curve"):
+            raise TypeError("Spread curves reference a base curve; freeze the base separately")
+        return cls(
+            pillars=curve.pillars,
+            values=curve.values,
+            instruments=curve.instruments,
+            interpolation=curve.interpolation,
+            extrapolation=curve.extrapolation,
+            curve_type=curve.curve_type,
+            kind=type(curve).__name__,
+            metadata=curve.metadata,
+        )
+
+    def to_curve(self) -> Curve:
+        """Rebuild a mutable curve of the original class."""
+
+        cls = _curve_class(self.kind)
+        curve = cls.__new__(cls)
+        Curve.__init__(
+            curve,
+            pillars=list(self.pillars),
+            values=list(self.values),
+            instruments=list(self.instruments),
+            interpolation=self.interpolation,
+            extrapolation=self.extrapolation,
+            curve_type=self.curve_type,
+            market_data={},
+            metadata=dict(self.metadata),
+        )
+        return curve
+
+    @property
+    def content_hash(self) -> str:
+        """Stable hex digest of the nodes, labels and interpolation settings."""
+
+        digest = self._hash
+        if digest is None:
+            interpolation = self.interpolation
+            if not isinstance(interpolation, str):
+                interpolation = type(interpolation).__name__
+            n = len(self.pillars)
+            h = hashlib.blake2b(digest_size=16)
+            header = "\x1f".join((self.kind, self.curve_type, interpolation, self.extrapolation))
+            h.update(header.encode())
+            h.update(struct.pack(f"<{n}d", *self.pillars))
+            h.update(struct.pack(f"<{n}d", *self.values))
+            h.update("\x1f".join(self.instruments).encode())
+            digest = h.hexdigest()
+            object.__setattr__(self, "_hash", digest)
+        return digest
+
+    def __hash__(self) -> int:
+        return int(self.content_hash[:16], 16)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FrozenCurve):
+            return NotImplemented
+        return self.content_hash == other.content_hash
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("FrozenCurve is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("FrozenCurve is immutable")
+
+    def __reduce__(self):
+        return (
+            FrozenCurve,
+            (
+                self.pillars,
+                self.values,
+                self.instruments,
+                self.interpolation,
+                self.extrapolation,
+                self.curve_type,
+                self.kind,
+                dict(self.metadata),
+            ),
+        )
+
+    def _fitted_interpolator(self) -> FittedInterpolator:
+        fitted = self._fitted
+        if fitted is None:
+            interpolator = _make_interpolator(self.interpolation, self.extrapolation)
+            fitted = interpolator.fit(self.pillars, self.values)
+            object.__setattr__(self, "_fitted", fitted)
+        return fitted
+
+    def value(self, t: float) -> float:
+        """Return the curve value at time ``t``."""
+
+        if not self.pillars:
+            raise ValueError("Curve has no pillars defined")
+        if len(self.pillars) == 1:
+            return self.values[0]
+        return float(self._fitted_interpolator()(float(t)))
+
+    def values_at(self, ts: Sequence[float]) -> Any:
+        """Vectorised :meth:`value` over the times ``ts``."""
+
+        if not self.pillars:
+            raise ValueError("Curve has no pillars defined")
+        if len(self.pillars) == 1:
+            return backend.to_output([self.values[0] for _ in ts])
+        return self._fitted_interpolator().evaluate_many(ts)
+
+    def nodes(self) -> List[Tuple[float, float, str]]:
+        return list(zip(self.pillars, self.values, self.instruments))
+
+    def to_dict(self) -> Dict[str, Any]:
+        interpolation = self.interpolation
+        if not isinstance(interpolation, str):
+            interpolation = type(interpolation).__name__
+        return {
+            "curve_type": self.curve_type,
+            "pillars": list(self.pillars),
+            "values": list(self.values),
+            "instruments": list(self.instruments),
+            "interpolation": interpolation,
+            "extrapolation": self.extrapolation,
+            "metadata": dict(self.metadata),
+        }
+
+    def __len__(self) -> int:
+        return len(self.pillars)
+
+    def __repr__(self) -> str:  # pragma: no cover - representation aid
+        return f"FrozenCurve({self.kind}, {len(self.pillars)} nodes, hash={self.content_hash[:8]})"
@@ -0,0 +1,135 @@
+"""Discount-factor tables on shared payment-time grids.
+
+Trades in a book tend to pay on the same IMM or quarterly dates, so pricing
+them one by one evaluates ``exp(-r t)`` for the same times over and over.
+:class:`DiscountTable` assigns each distinct time a slot once and stores the
+discount factor there; pricers resolve a payment time to its slot and then
+read factors by index. Slots added since the last read are priced together
+with one vectorised ``discount_factors`` call, so results agree with the
+scalar :meth:`~qfinlib.market.curve.DiscountCurve.discount_factor` to the
+last place or two (see :mod:`qfinlib.math.backend`).
+Curves with :class:`~qfinlib.math.ad.Dual` nodes store Dual factors.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from qfinlib.math.ad import as_number
+
+
+class DiscountTable:
+    """Lazily filled discount factors for a growing set of times.
+
+    Parameters
+    ----------
+    curve:
+        Any curve exposing ``discount_factors(ts)`` (discount and spread
+        curves, compiled composites).
+    times:
+        Optional initial grid; more times may be added with :meth:`index`
+        or :meth:`extend`.
+
+    The table is a snapshot of ``curve`` at its current
+    :attr:`~qfinlib.market.curve.Curve.version`, and of every curve below it
+    in a spread chain; :attr:`stale` reports when any of them has moved on
+    and :meth:`refresh` reprices every slot. Reads do not check, so that a
+    factor lookup stays a list read; holders check :attr:`stale` once per
+    pricing pass, as :meth:`MarketContainer.discount_table
+    <qfinlib.market.container.MarketContainer.discount_table>` and pricing
+    plans do.
+    """
+
+    __slots__ = ("curve", "times", "_slots", "_factors", "_chain", "_version")
+
+    def __init__(self, curve: Any, times: Iterable[float] = ()):
+        if getattr(curve, "discount_factors", None) is None:
+            raise AttributeError("Curve does not support discount factors")
+        self.curve = curve
+        self.times: List[float] = []
+        self._slots: Dict[float, int] = {}
+        self._factors: List[float] = []
+        self._chain = _chain(curve)
+        self._version: Optional[Tuple[int, ...]] = self._versions()
+        self.extend(times)
+
+    def index(self, t: float) -> int:
+        """Return the slot for time ``t``, adding it to the grid if needed."""
+
+        t = float(t)
+        slot = self._slots.get(t)
+        if slot is None:
+            slot = len(self.times)
+            self._slots[t] = slot
+            self.times.append(t)
+        return slot
+
+    def extend(self, times: Iterable[float]) -> List[int]:
+        """Resolve every time in ``times`` to its slot."""
+
+        return [self.index(t) for t in times]
+
+    def __getitem__(self, slot: int) -> float:
+        factors = self._factors
+        if slot >= len(factors):
+            self._fill()
+        return factors[slot]
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __contains__(self, t: object) -> bool:
+        return t in self._slots
+
+    def discount_factor(self, t: float) -> float:
+        """Discount factor at ``t``; equivalent to ``self[self.index(t)]``."""
+
+        return self[self.index(t)]
+
+    def factors(self, slots: Iterable[int]) -> List[float]:
+        """Discount factors for a sequence of slots."""
+
+        if len(self._factors) < len(self.times):
+            self._fill()
+        factors = self._factors
+        return [factors[slot] for slot in slots]
+
+    @property
+    def stale(self) -> bool:
+        """``True`` when the curve has changed since the table was priced."""
+
+        versions = self._version
+        if versions is None:
+            return False
+        for curve, version in zip(self._chain, versions):
+            if curve.version != version:
+                return True
+        return False
+
+    def refresh(self) -> None:
+        """Drop every cached factor and snapshot the curve's current version."""
+
+        self._factors.clear()
+        self._version = self._versions()
+
+    def _versions(self) -> Optional[Tuple[int, ...]]:
+        return tuple(curve.version for curve in self._chain) or None
+
+    def _fill(self) -> None:
+        start = len(self._factors)
+        pending = self.times[start:]
+        if pending:
+            self._factors.extend(as_number(df) for df in self.curve.discount_factors(pending))
+
+    def __repr__(self) -> str:  # pragma: no cover - representation aid
+        return f"DiscountTable({len(self.times)} times, {len(self._factors)} priced)"
+
+
+def _chain(curve: Any) -> Tuple[Any, ...]:
+    """``curve`` and the base curves it is a spread over, where versioned."""
+
+    chain = []
+    while curve is not None:
+        if getattr(curve, "version", None) is not None:
+            chain.append(curve)
+        curve = getattr(curve, "base_curve", None)
+    return tuple(chain)
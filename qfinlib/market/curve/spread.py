@@ -2,10 +2,16 @@
 from __future__ import annotations
 
 import math
-from typing import Mapping, Optional, Sequence
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, Optional, Sequence
+
+from qfinlib.math import ad, backend
 
 from .base import Curve, InterpolatorLike
 
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from .composite import CompositeCurve
+    from .grid import DiscountTable
+
 
 class SpreadCurve(Curve):
     """Curve representing a spread on top of a base curve."""
@@ -39,6 +45,11 @@ class SpreadCurve(Curve):
         spread = super().value(t)
         return base + spread
 
+    def zero_rate(self, t: float) -> float:
+        """Return the base curve's zero rate plus the spread at ``t``."""
+
+        return self.base_curve.zero_rate(t) + super().value(t)
+
     def discount_factor(self, t: float) -> float:
         getter = getattr(self.base_curve, "discount_factor", None)
         if getter is None:
@@ -47,4 +58,65 @@ class SpreadCurve(Curve):
         if base_rate is None:
             return getter(t)
         total_rate = base_rate(t) + super().value(t)
-        return math.exp(-total_rate * float(t))
+        return ad.exp(-total_rate * float(t))
+
+    def values_at(self, ts: Sequence[float]) -> Any:
+        if self._has_duals():
+            return [self.value(t) for t in ts]
+        times = backend.as_floats(ts)
+        base = self.base_curve.values_at(times)
+        spread = super().values_at(times)
+        if backend.np is not None:
+            return base + spread
+        return [b + s for b, s in zip(base, spread)]
+
+    def zero_rates(self, ts: Sequence[float]) -> Any:
+        """Vectorised :meth:`zero_rate` over the times ``ts``."""
+
+        if self._has_duals():
+            return [self.zero_rate(t) for t in ts]
+        times = backend.as_floats(ts)
+        base = self.base_curve.zero_rates(times)
+        spread = super().values_at(times)
+        if backend.np is not None:
+            return base + spread
+        return [b + s for b, s in zip(base, spread)]
+
+    def _has_duals(self) -> bool:
+        """``True`` when this curve or any curve below it carries AD node values."""
+
+        if super()._has_duals():
+            return True
+        base_duals = getattr(self.base_curve, "_has_duals", None)
+        return base_duals is not None and base_duals()
+
+    def compile(self) -> "CompositeCurve":
+        """Resolve the chain of spread curves into a single compiled evaluator."""
+
+        from .composite import CompositeCurve
+
+        return CompositeCurve(self)
+
+    def discount_factors(self, ts: Sequence[float]) -> Any:
+        """Vectorised :meth:`discount_factor` over the times ``ts``."""
+
+        getter = getattr(self.base_curve, "discount_factors", None)
+        if getter is None:
+            raise AttributeError("Base curve does not support discount factors")
+        if self._has_duals():
+            return [self.discount_factor(t) for t in ts]
+        times = backend.as_floats(ts)
+        base_rates = getattr(self.base_curve, "zero_rates", None)
+        if base_rates is None:
+            return getter(times)
+        spread = super().values_at(times)
+        if backend.np is not None:
+            return backend.exp(-(base_rates(times) + spread) * times)
+        return [math.exp(-(rate + s) * t) for rate, s, t in zip(base_rates(times), spread, times)]
+
+    def on_grid(self, times: Iterable[float] = ()) -> "DiscountTable":
+        """Return a lazily priced :class:`DiscountTable` over ``times``."""
+
+        from .grid import DiscountTable
+
+        return DiscountTable(self, times)
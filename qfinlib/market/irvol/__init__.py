@@ -1 +1,6 @@
 """Interest rate volatility module."""
+
+from .cube import SwaptionVolCube
+from .sabr import SABRSmile
+
+__all__ = ["SABRSmile", "SwaptionVolCube"]
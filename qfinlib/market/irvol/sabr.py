@@ -1 +1,58 @@
 """SABR volatility model."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence
+
+from qfinlib.pricing.models.vol.sabr import sabr_vol, sabr_vols
+
+
+@dataclass(frozen=True)
+class SABRSmile:
+    """SABR smile of one swaption expiry and tenor.
+
+    Parameters
+    ----------
+    expiry, tenor:
+        Option expiry and underlying swap tenor, in years.
+    forward:
+        Forward swap rate the smile was calibrated at.
+    alpha, beta, rho, nu:
+        SABR parameters.
+    error:
+        Root-mean-square volatility error of the calibration, if fitted.
+    converged:
+        Whether the calibration converged, if fitted.
+
+    Calling the smile as ``smile(expiry, strike, forward)`` returns the
+    Black volatility, which makes it usable as a swaption vol surface. The
+    smile follows the given forward (sticky-delta); ``expiry`` is ignored in
+    favour of :attr:`expiry`.
+    """
+
+    expiry: float
+    tenor: float
+    forward: float
+    alpha: float
+    beta: float
+    rho: float
+    nu: float
+    error: Optional[float] = None
+    converged: Optional[bool] = None
+
+    def vol(self, strike: float, forward: Optional[float] = None) -> float:
+        forward = self.forward if forward is None else forward
+        return sabr_vol(forward, strike, self.expiry, self.alpha, self.beta, self.rho, self.nu)
+
+    def vols(self, strikes: Sequence[float], forward: Optional[float] = None) -> Any:
+        """Vectorised :meth:`vol` over ``strikes``."""
+
+        forward = self.forward if forward is None else forward
+        return sabr_vols(forward, strikes, self.expiry, self.alpha, self.beta, self.rho, self.nu)
+
+    def __call__(self, expiry: float, strike: float, forward: Optional[float] = None) -> float:
+        return self.vol(strike, forward)
+
+    @property
+    def sabr_parameters(self) -> Dict[str, float]:
+        return {"alpha": self.alpha, "beta": self.beta, "rho": self.rho, "nu": self.nu}
@@ -1 +1,19 @@
 """Auto-differentiation module."""
+
+from .dual import ADScalar, Dual, as_number, erf, exp, is_dual, log, sqrt, tangent_of, value_of
+from .tape import Adjoint, Tape
+
+__all__ = [
+    "ADScalar",
+    "Dual",
+    "Tape",
+    "Adjoint",
+    "exp",
+    "log",
+    "sqrt",
+    "erf",
+    "as_number",
+    "value_of",
+    "tangent_of",
+    "is_dual",
+]
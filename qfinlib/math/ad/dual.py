@@ -1 +1,230 @@
-"""Dual numbers for forward-mode AD."""
+"""Dual numbers for forward-mode AD.
+
+A :class:`Dual` carries a value together with its partial derivatives with
+respect to any number of named inputs. The tangent is stored sparsely as a
+``{key: derivative}`` mapping, so propagating many tangents at once only
+costs as much as the inputs a quantity actually depends on; a curve node
+affects the handful of segments around it, and a swap only the nodes up to
+its maturity.
+
+Arithmetic operators accept floats and duals interchangeably. Elementary
+functions are provided as module-level :func:`exp`, :func:`log`,
+:func:`sqrt` and :func:`erf` which fall back to :mod:`math` for plain
+numbers, so code written against them returns bit-identical floats when no
+dual enters the computation.
+"""
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Hashable, Iterable, Mapping, Optional
+
+Tangent = Dict[Hashable, float]
+
+
+def _scaled(tangent: Mapping[Hashable, float], factor: float) -> Tangent:
+    return {key: factor * value for key, value in tangent.items()}
+
+
+def _combine(
+    a: Mapping[Hashable, float], fa: float, b: Mapping[Hashable, float], fb: float
+) -> Tangent:
+    """Return ``fa * a + fb * b`` for sparse tangents."""
+
+    if len(a) < len(b):
+        a, fa, b, fb = b, fb, a, fa
+    out = {key: fa * value for key, value in a.items()} if fa != 1.0 else dict(a)
+    for key, value in b.items():
+        out[key] = out.get(key, 0.0) + fb * value
+    return out
+
+
+def _new(value: float, tangent: Tangent) -> "Dual":
+    dual = object.__new__(Dual)
+    dual.value = value
+    dual.tangent = tangent
+    return dual
+
+
+class ADScalar:
+    """Base of the differentiable scalar types.
+
+    Subclasses hold the real part in ``value`` and implement arithmetic and
+    the elementary methods ``exp``, ``log``, ``sqrt`` and ``erf``.
+    Comparisons only look at :attr:`value`, which lets branching code (such
+    as interpolation segment searches) run unchanged on them.
+    """
+
+    __slots__ = ()
+    __hash__ = None  # type: ignore[assignment]
+
+    value: float
+
+    def __eq__(self, other: Any) -> bool:
+        return self.value == (other.value if isinstance(other, ADScalar) else other)
+
+    def __ne__(self, other: Any) -> bool:
+        return not self == other
+
+    def __lt__(self, other: Any) -> bool:
+        return self.value < (other.value if isinstance(other, ADScalar) else other)
+
+    def __le__(self, other: Any) -> bool:
+        return self.value <= (other.value if isinstance(other, ADScalar) else other)
+
+    def __gt__(self, other: Any) -> bool:
+        return self.value > (other.value if isinstance(other, ADScalar) else other)
+
+    def __ge__(self, other: Any) -> bool:
+        return self.value >= (other.value if isinstance(other, ADScalar) else other)
+
+
+class Dual(ADScalar):
+    """Value with sparse first-order derivatives.
+
+    Parameters
+    ----------
+    value:
+        Real part.
+    tangent:
+        Mapping of input keys to partial derivatives; missing keys are zero.
+    """
+
+    __slots__ = ("value", "tangent")
+
+    def __init__(self, value: float, tangent: Optional[Mapping[Hashable, float]] = None):
+        self.value = float(value)
+        self.tangent: Tangent = dict(tangent) if tangent else {}
+
+    @classmethod
+    def variable(cls, value: float, key: Hashable) -> "Dual":
+        """An input with unit derivative with respect to ``key``."""
+
+        return cls(value, {key: 1.0})
+
+    def derivative(self, key: Hashable) -> float:
+        return self.tangent.get(key, 0.0)
+
+    # Arithmetic ------------------------------------------------------------------
+    # Tangent dicts are never mutated once built, so results may share them.
+    def __add__(self, other: Any) -> "Dual":
+        if isinstance(other, Dual):
+            return _new(self.value + other.value, _combine(self.tangent, 1.0, other.tangent, 1.0))
+        return _new(self.value + other, self.tangent)
+
+    __radd__ = __add__
+
+    def __sub__(self, other: Any) -> "Dual":
+        if isinstance(other, Dual):
+            tangent = _combine(self.tangent, 1.0, other.tangent, -1.0)
+            return _new(self.value - other.value, tangent)
+        return _new(self.value - other, self.tangent)
+
+    def __rsub__(self, other: Any) -> "Dual":
+        return _new(other - self.value, _scaled(self.tangent, -1.0))
+
+    def __mul__(self, other: Any) -> "Dual":
+        if isinstance(other, Dual):
+            tangent = _combine(self.tangent, other.value, other.tangent, self.value)
+            return _new(self.value * other.value, tangent)
+        return _new(self.value * other, _scaled(self.tangent, other))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other: Any) -> "Dual":
+        if isinstance(other, Dual):
+            inv = 1.0 / other.value
+            value = self.value * inv
+            return _new(value, _combine(self.tangent, inv, other.tangent, -value * inv))
+        return _new(self.value / other, _scaled(self.tangent, 1.0 / other))
+
+    def __rtruediv__(self, other: Any) -> "Dual":
+        value = other / self.value
+        return _new(value, _scaled(self.tangent, -value / self.value))
+
+    def __pow__(self, power: Any) -> "Dual":
+        if isinstance(power, Dual):
+            return exp(power * log(self))
+        value = self.value**power
+        if power == 0:
+            return _new(value, {})
+        return _new(value, _scaled(self.tangent, power * self.value ** (power - 1)))
+
+    def __rpow__(self, base: Any) -> "Dual":
+        value = base**self.value
+        return _new(value, _scaled(self.tangent, value * math.log(base)))
+
+    def __neg__(self) -> "Dual":
+        return _new(-self.value, _scaled(self.tangent, -1.0))
+
+    def __pos__(self) -> "Dual":
+        return self
+
+    def __abs__(self) -> "Dual":
+        return -self if self.value < 0 else self
+
+    # Elementary functions --------------------------------------------------------
+    def exp(self) -> "Dual":
+        value = math.exp(self.value)
+        return _new(value, _scaled(self.tangent, value))
+
+    def log(self) -> "Dual":
+        return _new(math.log(self.value), _scaled(self.tangent, 1.0 / self.value))
+
+    def sqrt(self) -> "Dual":
+        value = math.sqrt(self.value)
+        return _new(value, _scaled(self.tangent, 0.5 / value))
+
+    def erf(self) -> "Dual":
+        slope = 2.0 / math.sqrt(math.pi) * math.exp(-self.value * self.value)
+        return _new(math.erf(self.value), _scaled(self.tangent, slope))
+
+    def __repr__(self) -> str:  # pragma: no cover - representation aid
+        return f"Dual({self.value!r}, {self.tangent!r})"
+
+
+def exp(x: Any) -> Any:
+    """:func:`math.exp` that propagates derivatives of :class:`ADScalar` values."""
+
+    return x.exp() if isinstance(x, ADScalar) else math.exp(x)
+
+
+def log(x: Any) -> Any:
+    """:func:`math.log` that propagates derivatives of :class:`ADScalar` values."""
+
+    return x.log() if isinstance(x, ADScalar) else math.log(x)
+
+
+def sqrt(x: Any) -> Any:
+    """:func:`math.sqrt` that propagates derivatives of :class:`ADScalar` values."""
+
+    return x.sqrt() if isinstance(x, ADScalar) else math.sqrt(x)
+
+
+def erf(x: Any) -> Any:
+    """:func:`math.erf` that propagates derivatives of :class:`ADScalar` values."""
+
+    return x.erf() if isinstance(x, ADScalar) else math.erf(x)
+
+
+def as_number(x: Any) -> Any:
+    """``float(x)``, except that an :class:`ADScalar` is returned unchanged."""
+
+    return x if isinstance(x, ADScalar) else float(x)
+
+
+def value_of(x: Any) -> float:
+    """Real part of ``x`` (``x`` itself for plain numbers)."""
+
+    return x.value if isinstance(x, ADScalar) else x
+
+
+def tangent_of(x: Any) -> Tangent:
+    """Sparse derivatives of ``x``; empty for plain numbers."""
+
+    return x.tangent if isinstance(x, Dual) else {}
+
+
+def is_dual(values: Iterable[Any]) -> bool:
+    """``True`` when any element of ``values`` is differentiable (an :class:`ADScalar`)."""
+
+    return any(isinstance(v, ADScalar) for v in values)
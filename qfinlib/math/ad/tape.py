@@ -1 +1,229 @@
-"""Reverse-mode AD tape."""
+"""Reverse-mode AD tape.
+
+A :class:`Tape` records every elementary operation on its :class:`Adjoint`
+values as a node holding the local partial derivatives with respect to its
+operands. One backward sweep from an output then yields the derivatives with
+respect to every input, whatever their number. Forward-mode
+:class:`~qfinlib.math.ad.Dual` numbers instead carry one tangent entry per
+input through every operation.
+
+Adjoints are :class:`~qfinlib.math.ad.ADScalar` values, so the AD-aware
+:func:`~qfinlib.math.ad.exp`, :func:`~qfinlib.math.ad.log`,
+:func:`~qfinlib.math.ad.sqrt` and :func:`~qfinlib.math.ad.erf`, and every
+curve and pricer written against them, record onto the tape unchanged.
+
+Memory is bounded with checkpoints. Record the shared inputs, take a
+:meth:`Tape.mark`, and then for each trade record the pricing,
+:meth:`Tape.pullback` its PV onto the shared prefix and :meth:`Tape.rewind`
+to the mark. A final :meth:`Tape.collect` sweeps the prefix once. Values
+created after a mark must not be used once the tape is rewound past them.
+"""
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from .dual import ADScalar
+
+Partials = Tuple[Tuple[int, float], ...]
+
+
+class Tape:
+    """Append-only record of operations on :class:`Adjoint` values."""
+
+    __slots__ = ("_partials", "_keys")
+
+    def __init__(self) -> None:
+        self._partials: List[Partials] = []
+        self._keys: Dict[int, Hashable] = {}
+
+    def variable(self, value: float, key: Optional[Hashable] = None) -> "Adjoint":
+        """A new input; keyed inputs are reported by :meth:`gradient`."""
+
+        index = len(self._partials)
+        self._partials.append(())
+        if key is not None:
+            self._keys[index] = key
+        return Adjoint(float(value), self, index)
+
+    def record(self, value: float, partials: Partials) -> "Adjoint":
+        """Append a node of ``value`` with ``(operand index, partial)`` pairs."""
+
+        index = len(self._partials)
+        self._partials.append(partials)
+        return Adjoint(value, self, index)
+
+    def __len__(self) -> int:
+        return len(self._partials)
+
+    def mark(self) -> int:
+        """Checkpoint to :meth:`rewind` to."""
+
+        return len(self._partials)
+
+    def rewind(self, mark: int) -> None:
+        """Discard every node recorded after ``mark``."""
+
+        del self._partials[mark:]
+        for index in [i for i in self._keys if i >= mark]:
+            del self._keys[index]
+
+    def _sweep(self, adjoint: List[float], top: int, bottom: int) -> None:
+        partials = self._partials
+        for i in range(top, bottom - 1, -1):
+            a = adjoint[i]
+            if a:
+                for j, w in partials[i]:
+                    adjoint[j] += a * w
+
+    def adjoints(self, output: Any, seed: float = 1.0) -> List[float]:
+        """``d output / d node`` for every node up to ``output``, by one backward sweep."""
+
+        if not isinstance(output, Adjoint) or output.tape is not self:
+            return []
+        adjoint = [0.0] * (output.index + 1)
+        adjoint[output.index] = seed
+        self._sweep(adjoint, output.index, 0)
+        return adjoint
+
+    def pullback(self, output: Any, adjoint: List[float], seed: float = 1.0) -> None:
+        """Add ``seed * d output / d node`` into ``adjoint`` for the nodes it covers.
+
+        ``adjoint`` holds one entry per node before a :meth:`mark`. Only the
+        nodes recorded after the mark are swept here. Contributions from
+        several outputs accumulate, and :meth:`collect` then sweeps the
+        shared prefix once.
+        """
+
+        if not isinstance(output, Adjoint) or output.tape is not self:
+            return
+        mark = len(adjoint)
+        if output.index < mark:
+            adjoint[output.index] += seed
+            return
+        work = [0.0] * (output.index + 1)
+        work[output.index] = seed
+        self._sweep(work, output.index, mark)
+        for i, a in enumerate(work[:mark]):
+            if a:
+                adjoint[i] += a
+
+    def collect(self, adjoint: List[float]) -> Dict[Hashable, float]:
+        """Sweep the prefix adjoints from :meth:`pullback` and key them by input."""
+
+        adjoint = list(adjoint)
+        self._sweep(adjoint, len(adjoint) - 1, 0)
+        gradient: Dict[Hashable, float] = {}
+        for index, key in self._keys.items():
+            if index < len(adjoint) and adjoint[index]:
+                gradient[key] = gradient.get(key, 0.0) + adjoint[index]
+        return gradient
+
+    def gradient(self, output: Any, seed: float = 1.0) -> Dict[Hashable, float]:
+        """Derivatives of ``output`` with respect to the keyed inputs it depends on."""
+
+        if not isinstance(output, Adjoint) or output.tape is not self:
+            return {}
+        adjoint = [0.0] * (output.index + 1)
+        adjoint[output.index] = seed
+        return self.collect(adjoint)
+
+    def __repr__(self) -> str:  # pragma: no cover - representation aid
+        return f"Tape({len(self._partials)} nodes, {len(self._keys)} inputs)"
+
+
+class Adjoint(ADScalar):
+    """Real value recorded on a :class:`Tape`.
+
+    Created with :meth:`Tape.variable`; arithmetic with floats and adjoints
+    of the same tape records new nodes.
+    """
+
+    __slots__ = ("value", "tape", "index")
+
+    def __init__(self, value: float, tape: Tape, index: int):
+        self.value = value
+        self.tape = tape
+        self.index = index
+
+    def _unary(self, value: float, partial: float) -> "Adjoint":
+        return self.tape.record(value, ((self.index, partial),))
+
+    # Arithmetic ------------------------------------------------------------------
+    def __add__(self, other: Any) -> "Adjoint":
+        if isinstance(other, Adjoint):
+            return self.tape.record(
+                self.value + other.value, ((self.index, 1.0), (other.index, 1.0))
+            )
+        return self._unary(self.value + other, 1.0)
+
+    __radd__ = __add__
+
+    def __sub__(self, other: Any) -> "Adjoint":
+        if isinstance(other, Adjoint):
+            return self.tape.record(
+                self.value - other.value, ((self.index, 1.0), (other.index, -1.0))
+            )
+        return self._unary(self.value - other, 1.0)
+
+    def __rsub__(self, other: Any) -> "Adjoint":
+        return self._unary(other - self.value, -1.0)
+
+    def __mul__(self, other: Any) -> "Adjoint":
+        if isinstance(other, Adjoint):
+            return self.tape.record(
+                self.value * other.value, ((self.index, other.value), (other.index, self.value))
+            )
+        return self._unary(self.value * other, other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other: Any) -> "Adjoint":
+        if isinstance(other, Adjoint):
+            inv = 1.0 / other.value
+            value = self.value * inv
+            return self.tape.record(value, ((self.index, inv), (other.index, -value * inv)))
+        return self._unary(self.value / other, 1.0 / other)
+
+    def __rtruediv__(self, other: Any) -> "Adjoint":
+        value = other / self.value
+        return self._unary(value, -value / self.value)
+
+    def __pow__(self, power: Any) -> "Adjoint":
+        if isinstance(power, Adjoint):
+            return (power * self.log()).exp()
+        value = self.value**power
+        slope = power * self.value ** (power - 1) if power != 0 else 0.0
+        return self._unary(value, slope)
+
+    def __rpow__(self, base: Any) -> "Adjoint":
+        value = base**self.value
+        return self._unary(value, value * math.log(base))
+
+    def __neg__(self) -> "Adjoint":
+        return self._unary(-self.value, -1.0)
+
+    def __pos__(self) -> "Adjoint":
+        return self
+
+    def __abs__(self) -> "Adjoint":
+        return -self if self.value < 0 else self
+
+    # Elementary functions --------------------------------------------------------
+    def exp(self) -> "Adjoint":
+        value = math.exp(self.value)
+        return self._unary(value, value)
+
+    def log(self) -> "Adjoint":
+        return self._unary(math.log(self.value), 1.0 / self.value)
+
+    def sqrt(self) -> "Adjoint":
+        value = math.sqrt(self.value)
+        return self._unary(value, 0.5 / value)
+
+    def erf(self) -> "Adjoint":
+        slope = 2.0 / math.sqrt(math.pi) * math.exp(-self.value * self.value)
+        return self._unary(math.erf(self.value), slope)
+
+    def __repr__(self) -> str:  # pragma: no cover - representation aid
+        return f"Adjoint({self.value!r}, node={self.index})"
@@ -1 +1,497 @@
-"""Analytical formulas (Black-Scholes, etc.)."""
+"""Analytical formulas (Black-Scholes, etc.).
+
+Black-76 (lognormal vol) and Bachelier (normal vol) option kernels on a
+forward. Each model has two forms:
+
+- a scalar function returning the price, or the price and greeks. It goes
+  through the AD-aware normal functions, so dual numbers and tape values
+  flow through it.
+- a ``*_many`` function over arrays. Every argument may be a scalar or a
+  sequence, and they broadcast against each other, so a whole strike grid
+  is priced in one call. With NumPy the arithmetic is vectorised and the
+  result is an array, equal to the scalar function up to the last place or
+  two; without it the result is a list of the scalar results.
+
+Greeks are ``(price, delta, gamma, vega, theta)``. Delta and gamma are with
+respect to the forward, vega per unit of vol and theta per year of expiry,
+all scaled by the discount factor.
+
+:func:`implied_black_vol` and :func:`implied_bachelier_vol` invert the
+prices, and their ``*_many`` forms invert whole quote sets at once. Each
+inversion starts from a closed-form guess and takes a few Halley steps.
+"""
+from __future__ import annotations
+
+import math
+from typing import Any, Callable, List, Tuple
+
+from qfinlib.math import ad, backend
+from qfinlib.math.stats.normal import SQRT_2, SQRT_2PI, norm_cdf, norm_pdf
+
+Greeks = Tuple[Any, Any, Any, Any, Any]
+
+
+def _intrinsic(forward: Any, strike: Any, call: bool, discount: Any) -> Greeks:
+    intrinsic = max(0.0, (forward - strike) if call else (strike - forward))
+    if call and forward > strike:
+        delta = discount
+    elif not call and forward < strike:
+        delta = -discount
+    else:
+        delta = 0.0
+    return intrinsic * discount, delta, 0.0, 0.0, 0.0
+
+
+def black_greeks(
+    forward: Any, strike: Any, vol: Any, expiry: float, call: bool = True, discount: Any = 1.0
+) -> Greeks:
+    """Black-76 price and greeks of a call (or put) on ``forward``.
+
+    Without time value (``vol <= 0`` or ``expiry <= 0``) the discounted
+    intrinsic value is returned with zero gamma, vega and theta.
+    """
+
+    if vol <= 0 or expiry <= 0:
+        return _intrinsic(forward, strike, call, discount)
+    sqrt_t = math.sqrt(expiry)
+    sigma_sqrt_t = vol * sqrt_t
+    d1 = ad.log(forward / strike) / sigma_sqrt_t + 0.5 * sigma_sqrt_t
+    d2 = d1 - sigma_sqrt_t
+    if call:
+        price = discount * (forward * norm_cdf(d1) - strike * norm_cdf(d2))
+        delta = discount * norm_cdf(d1)
+    else:
+        price = discount * (strike * norm_cdf(-d2) - forward * norm_cdf(-d1))
+        delta = discount * (norm_cdf(d1) - 1.0)
+    pdf = norm_pdf(d1)
+    gamma = discount * pdf / (forward * sigma_sqrt_t)
+    vega = discount * forward * pdf * sqrt_t
+    theta = -discount * forward * pdf * vol / (2 * sqrt_t)
+    return price, delta, gamma, vega, theta
+
+
+def black_price(
+    forward: Any, strike: Any, vol: Any, expiry: float, call: bool = True, discount: Any = 1.0
+) -> Any:
+    """Black-76 price; see :func:`black_greeks`."""
+
+    return black_greeks(forward, strike, vol, expiry, call, discount)[0]
+
+
+def bachelier_greeks(
+    forward: Any, strike: Any, vol: Any, expiry: float, call: bool = True, discount: Any = 1.0
+) -> Greeks:
+    """Bachelier (normal vol) price and greeks of a call (or put) on ``forward``."""
+
+    if vol <= 0 or expiry <= 0:
+        return _intrinsic(forward, strike, call, discount)
+    sqrt_t = math.sqrt(expiry)
+    std = vol * sqrt_t
+    d = (forward - strike) / std
+    pdf = norm_pdf(d)
+    if call:
+        price = discount * ((forward - strike) * norm_cdf(d) + std * pdf)
+        delta = discount * norm_cdf(d)
+    else:
+        price = discount * ((strike - forward) * norm_cdf(-d) + std * pdf)
+        delta = discount * (norm_cdf(d) - 1.0)
+    gamma = discount * pdf / std
+    vega = discount * sqrt_t * pdf
+    theta = -discount * vol * pdf / (2 * sqrt_t)
+    return price, delta, gamma, vega, theta
+
+
+def bachelier_price(
+    forward: Any, strike: Any, vol: Any, expiry: float, call: bool = True, discount: Any = 1.0
+) -> Any:
+    """Bachelier price; see :func:`bachelier_greeks`."""
+
+    return bachelier_greeks(forward, strike, vol, expiry, call, discount)[0]
+
+
+# Batch kernels -------------------------------------------------------------------
+def _expand(args: Tuple[Any, ...]) -> List[List[Any]]:
+    """Broadcast scalars and equal-length sequences to lists of one length."""
+
+    sizes = {len(a) for a in args if not isinstance(a, (int, float, bool))}
+    if len(sizes) > 1:
+        raise ValueError("Batch arguments must be scalars or sequences of one length")
+    n = sizes.pop() if sizes else 1
+    return [[a] * n if isinstance(a, (int, float, bool)) else list(a) for a in args]
+
+
+def _many(scalar: Callable[..., Greeks], vectorised: Callable[..., Greeks], args: Tuple) -> Greeks:
+    np = backend.np
+    if np is None:
+        rows = [scalar(f, k, v, t, bool(c), d) for f, k, v, t, c, d in zip(*_expand(args))]
+        return tuple(list(column) for column in zip(*rows)) if rows else ([],) * 5
+    forward, strike, vol, expiry, discount = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in args[:4] + args[5:])
+    )
+    call = np.broadcast_to(np.asarray(args[4], dtype=bool), forward.shape)
+    live = (vol > 0) & (expiry > 0)
+    safe_vol = np.where(live, vol, 1.0)
+    sqrt_t = np.sqrt(np.where(live, expiry, 1.0))
+    # Entries without time value are evaluated on placeholders and then discarded.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        greeks = vectorised(forward, strike, safe_vol, sqrt_t, call, discount, live)
+
+    gap = np.where(call, forward - strike, strike - forward)
+    intrinsic = np.where(gap > 0.0, gap, 0.0) * discount
+    dead_delta = np.where(
+        call & (forward > strike), discount, np.where(~call & (forward < strike), -discount, 0.0)
+    )
+    dead = (intrinsic, dead_delta, 0.0, 0.0, 0.0)
+    return tuple(np.where(live, g, x).reshape(-1) for g, x in zip(greeks, dead))
+
+
+def _cdf(x: Any) -> Any:
+    return 0.5 * (1.0 + backend.erf(x / SQRT_2))
+
+
+def _pdf(x: Any) -> Any:
+    return backend.exp(-0.5 * x * x) / SQRT_2PI
+
+
+def _black_arrays(forward, strike, vol, sqrt_t, call, discount, live) -> Greeks:
+    ratio = backend.np.where(live, forward / strike, 1.0)
+    sigma_sqrt_t = vol * sqrt_t
+    d1 = backend.log(ratio) / sigma_sqrt_t + 0.5 * sigma_sqrt_t
+    d2 = d1 - sigma_sqrt_t
+    cdf_d1 = _cdf(d1)
+    price = backend.np.where(
+        call,
+        discount * (forward * cdf_d1 - strike * _cdf(d2)),
+        discount * (strike * _cdf(-d2) - forward * _cdf(-d1)),
+    )
+    delta = backend.np.where(call, discount * cdf_d1, discount * (cdf_d1 - 1.0))
+    pdf = _pdf(d1)
+    gamma = discount * pdf / (forward * sigma_sqrt_t)
+    vega = discount * forward * pdf * sqrt_t
+    theta = -discount * forward * pdf * vol / (2 * sqrt_t)
+    return price, delta, gamma, vega, theta
+
+
+def _bachelier_arrays(forward, strike, vol, sqrt_t, call, discount, live) -> Greeks:
+    std = vol * sqrt_t
+    d = (forward - strike) / std
+    pdf = _pdf(d)
+    cdf_d = _cdf(d)
+    price = backend.np.where(
+        call,
+        discount * ((forward - strike) * cdf_d + std * pdf),
+        discount * ((strike - forward) * _cdf(-d) + std * pdf),
+    )
+    delta = backend.np.where(call, discount * cdf_d, discount * (cdf_d - 1.0))
+    gamma = discount * pdf / std
+    vega = discount * sqrt_t * pdf
+    theta = -discount * vol * pdf / (2 * sqrt_t)
+    return price, delta, gamma, vega, theta
+
+
+def black_greeks_many(
+    forward: Any, strike: Any, vol: Any, expiry: Any, call: Any = True, discount: Any = 1.0
+) -> Greeks:
+    """Vectorised :func:`black_greeks`; returns a tuple of five arrays."""
+
+    return _many(black_greeks, _black_arrays, (forward, strike, vol, expiry, call, discount))
+
+
+def black_price_many(
+    forward: Any, strike: Any, vol: Any, expiry: Any, call: Any = True, discount: Any = 1.0
+) -> Any:
+    """Vectorised :func:`black_price`."""
+
+    return black_greeks_many(forward, strike, vol, expiry, call, discount)[0]
+
+
+def bachelier_greeks_many(
+    forward: Any, strike: Any, vol: Any, expiry: Any, call: Any = True, discount: Any = 1.0
+) -> Greeks:
+    """Vectorised :func:`bachelier_greeks`; returns a tuple of five arrays."""
+
+    return _many(
+        bachelier_greeks, _bachelier_arrays, (forward, strike, vol, expiry, call, discount)
+    )
+
+
+def bachelier_price_many(
+    forward: Any, strike: Any, vol: Any, expiry: Any, call: Any = True, discount: Any = 1.0
+) -> Any:
+    """Vectorised :func:`bachelier_price`."""
+
+    return bachelier_greeks_many(forward, strike, vol, expiry, call, discount)[0]
+
+
+# Implied volatility --------------------------------------------------------------
+# Both inversions solve for the total vol ``s = vol * sqrt(expiry)`` that
+# reprices the time value, which equals the undiscounted out-of-the-money
+# price. They take safeguarded Halley (second-order Householder) steps on
+# ``log(price(s)) - log(target)``, starting from a closed-form guess, inside a
+# bracket that falls back to bisection.
+_IV_TOLERANCE = 1e-14
+_IV_MAX_ITERATIONS = 40
+
+
+def _ncdf(x: float) -> float:
+    # erfc keeps full relative precision in the lower tail.
+    return 0.5 * math.erfc(-x / SQRT_2)
+
+
+def _black_otm(forward: float, strike: float, x: float, s: float) -> Tuple[float, float, float]:
+    d1 = x / s + 0.5 * s
+    d2 = d1 - s
+    if strike >= forward:
+        price = forward * _ncdf(d1) - strike * _ncdf(d2)
+    else:
+        price = strike * _ncdf(-d2) - forward * _ncdf(-d1)
+    vega = forward * math.exp(-0.5 * d1 * d1) / SQRT_2PI
+    return price, vega, vega * d1 * d2 / s
+
+
+def _bachelier_otm(forward: float, strike: float, a: float, s: float) -> Tuple[float, float, float]:
+    z = a / s
+    pdf = math.exp(-0.5 * z * z) / SQRT_2PI
+    return s * pdf - a * _ncdf(-z), pdf, pdf * z * z / s
+
+
+def _black_guess(forward: float, strike: float, x: float, tv: float) -> float:
+    # Corrado-Miller; the inflection point sqrt(2|x|) where it breaks down.
+    half_gap = 0.5 * (forward - strike)
+    call = tv + max(forward - strike, 0.0)
+    disc = (call - half_gap) ** 2 - (forward - strike) ** 2 / math.pi
+    if disc >= 0.0:
+        s = SQRT_2PI / (forward + strike) * (call - half_gap + math.sqrt(disc))
+        if s > 0.0:
+            return s
+    return math.sqrt(2.0 * abs(x)) or 1e-4
+
+
+def _bachelier_guess(a: float, tv: float) -> float:
+    s = tv * SQRT_2PI
+    if a == 0.0 or s >= a:
+        return s
+    # Deep out of the money: tv / a ~ n(z) / z^3 with z = a / s.
+    z2 = max(-2.0 * math.log(s / a), 1.0)
+    z2 = max(z2 - 3.0 * math.log(z2), 1.0)
+    return max(s, a / math.sqrt(z2))
+
+
+def _solve_total_vol(
+    model: Callable[..., Tuple[float, float, float]],
+    forward: float,
+    strike: float,
+    x: float,
+    tv: float,
+    s: float,
+) -> float:
+    lo, hi = 0.0, math.inf
+    target = math.log(tv)
+    for _ in range(_IV_MAX_ITERATIONS):
+        f, f1, f2 = model(forward, strike, x, s)
+        if f <= 0.0 or f1 <= 0.0:
+            lo = s
+            s = 2.0 * s if hi == math.inf else 0.5 * (lo + hi)
+            continue
+        g = math.log(f) - target
+        if g < 0.0:
+            lo = s
+        else:
+            hi = s
+        g1 = f1 / f
+        step = -g / g1
+        denom = 1.0 + 0.5 * step * (f2 / f - g1 * g1) / g1
+        if denom > 0.0:
+            step /= denom
+        if abs(step) <= _IV_TOLERANCE * s:
+            return s + step
+        new = s + step
+        if not lo < new < hi:
+            new = 2.0 * s if hi == math.inf else 0.5 * (lo + hi)
+        s = new
+    return s
+
+
+def _time_value(
+    price: float, forward: float, strike: float, expiry: float, call: bool, discount: float
+) -> float:
+    if not expiry > 0.0 or not discount > 0.0:
+        return math.nan
+    return price / discount - max((forward - strike) if call else (strike - forward), 0.0)
+
+
+def implied_black_vol(
+    price: float,
+    forward: float,
+    strike: float,
+    expiry: float,
+    call: bool = True,
+    discount: float = 1.0,
+) -> float:
+    """Black-76 vol reproducing ``price``; the inverse of :func:`black_price`.
+
+    Returns ``0.0`` for a price at intrinsic value and NaN for prices outside
+    the no-arbitrage bounds or non-positive forwards, strikes or expiries.
+    """
+
+    tv = _time_value(price, forward, strike, expiry, call, discount)
+    if not forward > 0.0 or not strike > 0.0 or not tv >= 0.0:
+        return math.nan
+    if tv == 0.0:
+        return 0.0
+    if tv >= min(forward, strike):
+        return math.nan
+    x = math.log(forward / strike)
+    s0 = _black_guess(forward, strike, x, tv)
+    return _solve_total_vol(_black_otm, forward, strike, x, tv, s0) / math.sqrt(expiry)
+
+
+def implied_bachelier_vol(
+    price: float,
+    forward: float,
+    strike: float,
+    expiry: float,
+    call: bool = True,
+    discount: float = 1.0,
+) -> float:
+    """Normal vol reproducing ``price``; the inverse of :func:`bachelier_price`.
+
+    Returns ``0.0`` for a price at intrinsic value and NaN below it or for a
+    non-positive expiry.
+    """
+
+    tv = _time_value(price, forward, strike, expiry, call, discount)
+    if not tv >= 0.0:
+        return math.nan
+    if tv == 0.0:
+        return 0.0
+    a = abs(forward - strike)
+    s0 = _bachelier_guess(a, tv)
+    return _solve_total_vol(_bachelier_otm, forward, strike, a, tv, s0) / math.sqrt(expiry)
+
+
+# Vectorised implied volatility ---------------------------------------------------
+def _ncdf_array(x: Any) -> Any:
+    return 0.5 * backend.erfc(-x / SQRT_2)
+
+
+def _black_guess_arrays(forward: Any, strike: Any, x: Any, tv: Any) -> Any:
+    """:func:`_black_guess` over arrays."""
+
+    np = backend.np
+    gap = forward - strike
+    call = tv + np.maximum(gap, 0.0)
+    disc = (call - 0.5 * gap) ** 2 - gap**2 / math.pi
+    s = SQRT_2PI / (forward + strike) * (call - 0.5 * gap + np.sqrt(np.maximum(disc, 0.0)))
+    fallback = np.sqrt(2.0 * np.abs(x))
+    fallback = np.where(fallback > 0.0, fallback, 1e-4)
+    return np.where((disc >= 0.0) & (s > 0.0), s, fallback)
+
+
+def _bachelier_guess_arrays(a: Any, tv: Any) -> Any:
+    """:func:`_bachelier_guess` over arrays."""
+
+    np = backend.np
+    s = tv * SQRT_2PI
+    deep = (a != 0.0) & (s < a)
+    z2 = np.maximum(-2.0 * backend.log(np.where(deep, s / a, 0.5)), 1.0)
+    z2 = np.maximum(z2 - 3.0 * backend.log(z2), 1.0)
+    return np.where(deep, np.maximum(s, a / np.sqrt(z2)), s)
+
+
+def _black_otm_arrays(forward: Any, strike: Any, x: Any, s: Any) -> Tuple[Any, Any, Any]:
+    np = backend.np
+    d1 = x / s + 0.5 * s
+    d2 = d1 - s
+    price = np.where(
+        strike >= forward,
+        forward * _ncdf_array(d1) - strike * _ncdf_array(d2),
+        strike * _ncdf_array(-d2) - forward * _ncdf_array(-d1),
+    )
+    vega = forward * backend.exp(-0.5 * d1 * d1) / SQRT_2PI
+    return price, vega, vega * d1 * d2 / s
+
+
+def _bachelier_otm_arrays(forward: Any, strike: Any, a: Any, s: Any) -> Tuple[Any, Any, Any]:
+    z = a / s
+    pdf = backend.exp(-0.5 * z * z) / SQRT_2PI
+    return s * pdf - a * _ncdf_array(-z), pdf, pdf * z * z / s
+
+
+def _solve_total_vol_arrays(
+    model: Callable[..., Tuple[Any, Any, Any]], forward: Any, strike: Any, x: Any, tv: Any, s: Any
+) -> Any:
+    np = backend.np
+    active = np.isfinite(s)
+    lo = np.zeros_like(s)
+    hi = np.full_like(s, np.inf)
+    target = backend.log(np.where(active, tv, 1.0))
+    for _ in range(_IV_MAX_ITERATIONS):
+        if not active.any():
+            break
+        f, f1, f2 = model(forward, strike, x, s)
+        usable = (f > 0.0) & (f1 > 0.0)
+        g = backend.log(np.where(usable, f, 1.0)) - target
+        below = ~usable | (g < 0.0)
+        lo = np.where(active & below, s, lo)
+        hi = np.where(active & ~below, s, hi)
+        g1 = f1 / f
+        step = -g / g1
+        denom = 1.0 + 0.5 * step * (f2 / f - g1 * g1) / g1
+        step = np.where(denom > 0.0, step / denom, step)
+        done = usable & (np.abs(step) <= _IV_TOLERANCE * s)
+        new = s + step
+        fallback = np.where(np.isinf(hi), 2.0 * s, 0.5 * (lo + hi))
+        new = np.where(done | (usable & (new > lo) & (new < hi)), new, fallback)
+        s = np.where(active, new, s)
+        active &= ~done
+    return s
+
+
+def _implied_many(model: str, args: Tuple[Any, ...]) -> Any:
+    np = backend.np
+    if np is None:
+        scalar = implied_black_vol if model == "black" else implied_bachelier_vol
+        return [scalar(p, f, k, t, bool(c), d) for p, f, k, t, c, d in zip(*_expand(args))]
+    price, forward, strike, expiry, discount = (
+        a.reshape(-1)
+        for a in np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in args[:4] + args[5:]))
+    )
+    call = np.broadcast_to(np.asarray(args[4], dtype=bool).reshape(-1), price.shape)
+    with np.errstate(all="ignore"):
+        intrinsic = np.maximum(np.where(call, forward - strike, strike - forward), 0.0)
+        tv = np.where((expiry > 0.0) & (discount > 0.0), price / discount - intrinsic, np.nan)
+        valid = tv > 0.0
+        if model == "black":
+            valid &= (forward > 0.0) & (strike > 0.0) & (tv < np.minimum(forward, strike))
+            x = backend.log(np.where(valid, forward / strike, 1.0))
+            guess = _black_guess_arrays(forward, strike, x, tv)
+            otm = _black_otm_arrays
+        else:
+            x = np.abs(forward - strike)
+            guess = _bachelier_guess_arrays(x, tv)
+            otm = _bachelier_otm_arrays
+        start = np.where(valid, guess, np.nan)
+        s = _solve_total_vol_arrays(otm, forward, strike, x, tv, start)
+        vol = np.where(valid, s / np.sqrt(np.where(valid, expiry, 1.0)), np.nan)
+    return np.where(tv == 0.0, 0.0, vol)
+
+
+def implied_black_vol_many(
+    price: Any, forward: Any, strike: Any, expiry: Any, call: Any = True, discount: Any = 1.0
+) -> Any:
+    """Vectorised :func:`implied_black_vol`; arguments broadcast as in :func:`black_price_many`.
+
+    With NumPy all quotes iterate together, and results agree with the
+    scalar inversion to solver precision.
+    """
+
+    return _implied_many("black", (price, forward, strike, expiry, call, discount))
+
+
+def implied_bachelier_vol_many(
+    price: Any, forward: Any, strike: Any, expiry: Any, call: Any = True, discount: Any = 1.0
+) -> Any:
+    """Vectorised :func:`implied_bachelier_vol`; see :func:`implied_black_vol_many`."""
+
+    return _implied_many("bachelier", (price, forward, strike, expiry, call, discount))
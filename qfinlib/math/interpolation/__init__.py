@@ -1,9 +1,9 @@
 """Interpolation utilities."""
-from .base import Interpolator
-from .linear import LinearInterpolator
-from .log_linear import LogLinearInterpolator
-from .monotone import MonotoneInterpolator
-from .cubic import CubicInterpolator
+from .base import FittedInterpolator, Interpolator
+from .linear import FittedLinear, LinearInterpolator
+from .log_linear import FittedLogLinear, LogLinearInterpolator
+from .monotone import FittedMonotoneCubic, MonotoneInterpolator
+from .cubic import CubicInterpolator, FittedCubicSpline, FittedPiecewiseCubic
 
 __all__ = [
     "Interpolator",
@@ -11,4 +11,10 @@ __all__ = [
     "LogLinearInterpolator",
     "MonotoneInterpolator",
     "CubicInterpolator",
+    "FittedInterpolator",
+    "FittedLinear",
+    "FittedLogLinear",
+    "FittedPiecewiseCubic",
+    "FittedCubicSpline",
+    "FittedMonotoneCubic",
 ]
@@ -7,16 +7,42 @@ objects defined in :mod:`qfinlib.market.curve`.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Sequence
+from bisect import bisect_left
+from typing import Any, List, Sequence
+
+from qfinlib.math import backend
+
+
+def extrapolate(x: Sequence[float], y: Sequence[float], x_new: float, mode: str):
+    """Extend the nodes ``x``/``y`` to ``x_new`` using the extrapolation ``mode``."""
+
+    if len(x) < 2:
+        return y[0]
+    if mode == "flat":
+        return y[0] if x_new < x[0] else y[-1]
+    if mode == "nearest":
+        return y[0] if abs(x_new - x[0]) < abs(x_new - x[-1]) else y[-1]
+    if mode == "linear":
+        if x_new < x[0]:
+            slope = (y[1] - y[0]) / (x[1] - x[0])
+            return y[0] + slope * (x_new - x[0])
+        slope = (y[-1] - y[-2]) / (x[-1] - x[-2])
+        return y[-1] + slope * (x_new - x[-1])
+    raise ValueError(f"Unsupported extrapolation mode: {mode}")
 
 
 class Interpolator(ABC):
     """Abstract interpolator.
 
     Concrete implementations must provide :meth:`interpolate` which will be
-    called by :py:meth:`__call__`.
+    called by :py:meth:`__call__`. Implementations that are evaluated many
+    times against the same nodes should also override :meth:`fit` to return
+    a :class:`FittedInterpolator` with precomputed coefficients.
     """
 
+    #: ``True`` when each node only influences its two adjacent segments.
+    local = False
+
     def __init__(self, extrapolation: str = "flat"):
         self.extrapolation = extrapolation
 
@@ -27,24 +53,118 @@ class Interpolator(ABC):
     def interpolate(self, x: Sequence[float], y: Sequence[float], x_new: float) -> float:
         """Interpolate the value for ``x_new`` using known points ``x`` and ``y``."""
 
+    def fit(self, x: Sequence[float], y: Sequence[float]) -> "FittedInterpolator":
+        """Bind the interpolator to the nodes ``x`` and ``y``.
+
+        The default implementation simply defers to :meth:`interpolate` on
+        every evaluation; subclasses return specialised fitted objects.
+        """
+
+        return _DeferredFit(self, x, y)
+
     def _extrapolate(self, x: Sequence[float], y: Sequence[float], x_new: float) -> float:
-        if len(x) < 2:
-            return y[0]
-        if self.extrapolation == "flat":
-            return y[0] if x_new < x[0] else y[-1]
-        if self.extrapolation == "nearest":
-            return y[0] if abs(x_new - x[0]) < abs(x_new - x[-1]) else y[-1]
-        if self.extrapolation == "linear":
-            if x_new < x[0]:
-                slope = (y[1] - y[0]) / (x[1] - x[0])
-                return y[0] + slope * (x_new - x[0])
-            slope = (y[-1] - y[-2]) / (x[-1] - x[-2])
-            return y[-1] + slope * (x_new - x[-1])
-        raise ValueError(f"Unsupported extrapolation mode: {self.extrapolation}")
+        return extrapolate(x, y, x_new, self.extrapolation)
 
     @staticmethod
     def _find_segment(x: Sequence[float], x_new: float) -> int:
-        for i in range(len(x) - 1):
-            if x[i] <= x_new <= x[i + 1]:
-                return i
-        return -1
+        """Return the index ``i`` such that ``x[i] <= x_new <= x[i + 1]``.
+
+        Nodes are searched by bisection; ``-1`` is returned when ``x_new``
+        lies outside ``[x[0], x[-1]]``.
+        """
+
+        n = len(x)
+        if n < 2 or x_new < x[0] or x_new > x[-1]:
+            return -1
+        return min(max(bisect_left(x, x_new) - 1, 0), n - 2)
+
+
+class FittedInterpolator(ABC):
+    """Interpolator bound to a fixed set of nodes.
+
+    Fitted interpolators copy the nodes they are built from so that any
+    precomputed coefficients stay consistent; owners (such as
+    :class:`~qfinlib.market.curve.Curve`) refit whenever their nodes change.
+    """
+
+    def __init__(self, x: Sequence[float], y: Sequence[float], extrapolation: str = "flat"):
+        if not x or not y:
+            raise ValueError("x and y values must be provided for interpolation")
+        if len(x) != len(y):
+            raise ValueError("x and y must have the same length")
+        self.x: List[float] = [float(v) for v in x]
+        self.y: List = list(y)
+        self.extrapolation = extrapolation
+        self._lo = self.x[0]
+        self._hi = self.x[-1]
+        self._last = len(self.x) - 2
+
+    @abstractmethod
+    def __call__(self, x_new: float) -> float:
+        """Evaluate the fitted interpolant at ``x_new``."""
+
+    def update(self, index: int, value: float) -> bool:
+        """Patch the node at ``index`` to ``value`` in place.
+
+        Returns ``False`` when the fit cannot be patched locally and must be
+        rebuilt by the owner instead; the base implementation always does.
+        """
+
+        return False
+
+    def evaluate_many(self, xs: Sequence[float]) -> Any:
+        """Evaluate the interpolant at every point of ``xs``.
+
+        Returns a NumPy array when the optional backend is available and a
+        list otherwise; each entry equals the scalar :meth:`__call__` result.
+        """
+
+        return backend.to_output([self(float(x)) for x in xs])
+
+    def _segment(self, x_new: float) -> int:
+        """Locate the segment containing ``x_new`` (assumed in range) by bisection."""
+
+        idx = bisect_left(self.x, x_new) - 1
+        if idx < 0:
+            return 0
+        if idx > self._last:
+            return self._last
+        return idx
+
+    def _extrapolate(self, x_new: float):
+        return extrapolate(self.x, self.y, x_new, self.extrapolation)
+
+    def _extrapolate_many(self, xs: Any, out: Any) -> Any:
+        """Overwrite the out-of-range entries of the ndarray ``out`` in place."""
+
+        x, y = self.x, self.y
+        below = xs < self._lo
+        above = xs > self._hi
+        if not (below.any() or above.any()):
+            return out
+        if self.extrapolation == "flat":
+            out[below] = y[0]
+            out[above] = y[-1]
+        elif self.extrapolation == "nearest":
+            outside = below | above
+            pts = xs[outside]
+            out[outside] = backend.np.where(abs(pts - x[0]) < abs(pts - x[-1]), y[0], y[-1])
+        elif self.extrapolation == "linear":
+            slope = (y[1] - y[0]) / (x[1] - x[0])
+            out[below] = y[0] + slope * (xs[below] - x[0])
+            slope = (y[-1] - y[-2]) / (x[-1] - x[-2])
+            out[above] = y[-1] + slope * (xs[above] - x[-1])
+        else:
+            raise ValueError(f"Unsupported extrapolation mode: {self.extrapolation}")
+        return out
+
+
+class _DeferredFit(FittedInterpolator):
+    """Fallback fit for interpolators that only implement :meth:`interpolate`."""
+
+    def __init__(self, interpolator: Interpolator, x: Sequence[float], y: Sequence[float]):
+        super().__init__(x, y, interpolator.extrapolation)
+        self.interpolator = interpolator
+
+    def __call__(self, x_new: float) -> float:
+        return self.interpolator.interpolate(self.x, self.y, x_new)
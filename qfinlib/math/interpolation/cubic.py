@@ -1,22 +1,92 @@
-"""Cubic interpolation placeholder.
+"""Natural cubic spline interpolation.
 
-A lightweight cubic interpolator is provided for completeness. For small
-curve construction tasks it falls back to monotone linear behaviour when
-insufficient data is available to build a full spline, keeping the
-library dependency-free.
+The spline's second derivatives are obtained from the usual tridiagonal
+system, solved once per node set with the Thomas algorithm in ``O(n)``.
+Each segment is then stored as polynomial coefficients so evaluation is a
+bisection plus a Horner step.
 """
 from __future__ import annotations
 
-from typing import Sequence
+from typing import Any, List, Sequence
 
-from .linear import LinearInterpolator
+from qfinlib.math import backend
 
+from .base import FittedInterpolator, Interpolator
 
-class CubicInterpolator(LinearInterpolator):
-    """Cubic-like interpolation with linear fallback."""
+
+class CubicInterpolator(Interpolator):
+    """Natural cubic spline (zero curvature at both end nodes)."""
 
     def interpolate(self, x: Sequence[float], y: Sequence[float], x_new: float) -> float:
-        # A full cubic spline would require additional dependencies; for now we
-        # reuse the stable linear interpolation while keeping the entry point
-        # compatible with other interpolators.
-        return super().interpolate(x, y, x_new)
+        return self.fit(x, y)(x_new)
+
+    def fit(self, x: Sequence[float], y: Sequence[float]) -> "FittedCubicSpline":
+        return FittedCubicSpline(x, y, self.extrapolation)
+
+
+class FittedPiecewiseCubic(FittedInterpolator):
+    """Piecewise cubic ``a + b dx + c dx^2 + d dx^3`` on each segment.
+
+    Subclasses compute the coefficient lists ``b``, ``c`` and ``d``; ``a`` is
+    the left node value of each segment.
+    """
+
+    b: List[float]
+    c: List[float]
+    d: List[float]
+
+    def __init__(self, x: Sequence[float], y: Sequence[float], extrapolation: str = "flat"):
+        super().__init__(x, y, extrapolation)
+        xs = self.x
+        if any(xs[i + 1] <= xs[i] for i in range(len(xs) - 1)):
+            raise ValueError("Cubic interpolation requires strictly increasing x values")
+        self.widths = [xs[i + 1] - xs[i] for i in range(len(xs) - 1)]
+        self.secants = [(self.y[i + 1] - self.y[i]) / h for i, h in enumerate(self.widths)]
+
+    def __call__(self, x_new: float) -> float:
+        if x_new < self._lo or x_new > self._hi or self._last < 0:
+            return self._extrapolate(x_new)
+        idx = self._segment(x_new)
+        dx = x_new - self.x[idx]
+        return self.y[idx] + dx * (self.b[idx] + dx * (self.c[idx] + dx * self.d[idx]))
+
+    def evaluate_many(self, xs: Sequence[float]) -> Any:
+        if backend.np is None or self._last < 0:
+            return super().evaluate_many(xs)
+        np = backend.np
+        pts = backend.as_floats(xs)
+        arrays = self.__dict__.get("_arrays")
+        if arrays is None:
+            arrays = self._arrays = tuple(
+                np.asarray(v, dtype=float) for v in (self.x, self.y, self.b, self.c, self.d)
+            )
+        x, y, b, c, d = arrays
+        idx = np.clip(np.searchsorted(x, pts, side="left") - 1, 0, self._last)
+        dx = pts - x[idx]
+        out = y[idx] + dx * (b[idx] + dx * (c[idx] + dx * d[idx]))
+        return self._extrapolate_many(pts, out)
+
+
+class FittedCubicSpline(FittedPiecewiseCubic):
+    """Natural cubic spline with coefficients solved once at construction."""
+
+    def __init__(self, x: Sequence[float], y: Sequence[float], extrapolation: str = "flat"):
+        super().__init__(x, y, extrapolation)
+        h, s = self.widths, self.secants
+        n = len(self.x)
+        curvature = [0.0] * n
+        if n > 2:
+            # Thomas algorithm for the interior second derivatives.
+            diag = [2.0 * (h[i - 1] + h[i]) for i in range(1, n - 1)]
+            rhs = [6.0 * (s[i] - s[i - 1]) for i in range(1, n - 1)]
+            for k in range(1, n - 2):
+                factor = h[k] / diag[k - 1]
+                diag[k] -= factor * h[k]
+                rhs[k] -= factor * rhs[k - 1]
+            curvature[n - 2] = rhs[-1] / diag[-1]
+            for k in range(n - 4, -1, -1):
+                curvature[k + 1] = (rhs[k] - h[k + 1] * curvature[k + 2]) / diag[k]
+        self.curvature = curvature
+        self.b = [s[i] - h[i] * (2.0 * curvature[i] + curvature[i + 1]) / 6.0 for i in range(n - 1)]
+        self.c = [0.5 * curvature[i] for i in range(n - 1)]
+        self.d = [(curvature[i + 1] - curvature[i]) / (6.0 * h[i]) for i in range(n - 1)]
@@ -1,14 +1,18 @@
 """Linear interpolation helper."""
 from __future__ import annotations
 
-from typing import Sequence
+from typing import Any, Sequence
 
-from .base import Interpolator
+from qfinlib.math import backend
+
+from .base import FittedInterpolator, Interpolator
 
 
 class LinearInterpolator(Interpolator):
     """Simple piecewise-linear interpolator."""
 
+    local = True
+
     def interpolate(self, x: Sequence[float], y: Sequence[float], x_new: float) -> float:
         if not x or not y:
             raise ValueError("x and y values must be provided for interpolation")
@@ -29,3 +33,59 @@ class LinearInterpolator(Interpolator):
             return y0
         weight = (x_new - x0) / (x1 - x0)
         return y0 + weight * (y1 - y0)
+
+    def fit(self, x: Sequence[float], y: Sequence[float]) -> "FittedLinear":
+        return FittedLinear(x, y, self.extrapolation)
+
+
+class FittedLinear(FittedInterpolator):
+    """Piecewise-linear interpolant with precomputed segment widths and increments."""
+
+    def __init__(self, x: Sequence[float], y: Sequence[float], extrapolation: str = "flat"):
+        super().__init__(x, y, extrapolation)
+        xs, ys = self.x, self.y
+        self.widths = [xs[i + 1] - xs[i] for i in range(len(xs) - 1)]
+        self.deltas = [ys[i + 1] - ys[i] for i in range(len(ys) - 1)]
+
+    def __call__(self, x_new: float) -> float:
+        if x_new < self._lo or x_new > self._hi or self._last < 0:
+            return self._extrapolate(x_new)
+        idx = self._segment(x_new)
+        width = self.widths[idx]
+        if width == 0:
+            return self.y[idx]
+        return self.y[idx] + (x_new - self.x[idx]) / width * self.deltas[idx]
+
+    def update(self, index: int, value: float) -> bool:
+        y, deltas = self.y, self.deltas
+        y[index] = value
+        if index > 0:
+            deltas[index - 1] = value - y[index - 1]
+        if index < len(deltas):
+            deltas[index] = y[index + 1] - value
+        arrays = self.__dict__.get("_arrays")
+        if arrays is not None:
+            lo = max(index - 1, 0)
+            arrays[1][index] = value
+            arrays[3][lo : index + 1] = deltas[lo : index + 1]
+        return True
+
+    def evaluate_many(self, xs: Sequence[float]) -> Any:
+        if backend.np is None or self._last < 0:
+            return super().evaluate_many(xs)
+        return self._linear_many(backend.as_floats(xs))
+
+    def _linear_many(self, xs: Any) -> Any:
+        np = backend.np
+        arrays = self.__dict__.get("_arrays")
+        if arrays is None:
+            arrays = self._arrays = tuple(
+                np.asarray(v, dtype=float) for v in (self.x, self.y, self.widths, self.deltas)
+            )
+        x, y, widths, deltas = arrays
+        idx = np.clip(np.searchsorted(x, xs, side="left") - 1, 0, self._last)
+        width = widths[idx]
+        flat = width == 0
+        out = y[idx] + (xs - x[idx]) / np.where(flat, 1.0, width) * deltas[idx]
+        out[flat] = y[idx][flat]
+        return self._extrapolate_many(xs, out)
@@ -2,43 +2,47 @@
 from __future__ import annotations
 
 import math
-from typing import Sequence
+from typing import Any, Sequence
+
+from qfinlib.math import ad, backend
 
 from .base import Interpolator
+from .linear import FittedLinear
 
 
 class LogLinearInterpolator(Interpolator):
     """Interpolate on the logarithm of y-values (useful for discount factors)."""
 
+    local = True
+
     def interpolate(self, x: Sequence[float], y: Sequence[float], x_new: float) -> float:
-        if any(value <= 0 for value in y):
-            raise ValueError("Log-linear interpolation requires strictly positive y values")
-        log_y = [math.log(val) for val in y]
-        linear = LinearLike(self.extrapolation)
-        result = linear.interpolate(x, log_y, x_new)
-        return math.exp(result)
+        return self.fit(x, y)(x_new)
 
+    def fit(self, x: Sequence[float], y: Sequence[float]) -> "FittedLogLinear":
+        return FittedLogLinear(x, y, self.extrapolation)
 
-class LinearLike(Interpolator):
-    """Small helper to reuse the linear logic without a circular import."""
 
-    def interpolate(self, x: Sequence[float], y: Sequence[float], x_new: float) -> float:
-        if not x or not y:
-            raise ValueError("x and y values must be provided for interpolation")
-        if len(x) != len(y):
-            raise ValueError("x and y must have the same length")
-        if len(x) == 1:
-            return y[0]
-
-        if x_new < x[0] or x_new > x[-1]:
-            return self._extrapolate(x, y, x_new)
-
-        idx = self._find_segment(x, x_new)
-        if idx == -1:
-            return y[-1]
-        x0, x1 = x[idx], x[idx + 1]
-        y0, y1 = y[idx], y[idx + 1]
-        if x1 == x0:
-            return y0
-        weight = (x_new - x0) / (x1 - x0)
-        return y0 + weight * (y1 - y0)
+class FittedLogLinear(FittedLinear):
+    """Log-linear interpolant; nodes are stored (and extrapolated) in log space."""
+
+    def __init__(self, x: Sequence[float], y: Sequence[float], extrapolation: str = "flat"):
+        if any(value <= 0 for value in y):
+            raise ValueError("Log-linear interpolation requires strictly positive y values")
+        # Dual-valued nodes take the AD-aware functions; plain floats keep math.
+        dual = ad.is_dual(y)
+        self._exp = ad.exp if dual else math.exp
+        self._log = ad.log if dual else math.log
+        super().__init__(x, [self._log(val) for val in y], extrapolation)
+
+    def __call__(self, x_new: float) -> float:
+        return self._exp(super().__call__(x_new))
+
+    def update(self, index: int, value: float) -> bool:
+        if value <= 0 or isinstance(value, ad.ADScalar):
+            return False
+        return super().update(index, self._log(value))
+
+    def evaluate_many(self, xs: Sequence[float]) -> Any:
+        if backend.np is None or self._last < 0:
+            return super().evaluate_many(xs)
+        return backend.exp(self._linear_many(backend.as_floats(xs)))
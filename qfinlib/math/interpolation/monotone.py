@@ -1,17 +1,56 @@
 """Monotone interpolation helper.
 
-For now we keep the implementation lightweight by delegating to linear
-interpolation which preserves monotonicity for monotone data sets.
+Implements the Fritsch–Carlson monotone piecewise cubic Hermite scheme: node
+slopes are limited so the interpolant never overshoots monotone data. The
+Hermite coefficients are computed once per node set in ``O(n)``.
 """
 from __future__ import annotations
 
 from typing import Sequence
 
-from .linear import LinearInterpolator
+from qfinlib.math import ad
 
+from .base import Interpolator
+from .cubic import FittedPiecewiseCubic
 
-class MonotoneInterpolator(LinearInterpolator):
-    """Alias for linear interpolation that emphasises monotonicity."""
+
+class MonotoneInterpolator(Interpolator):
+    """Fritsch–Carlson monotonicity-preserving cubic interpolation."""
 
     def interpolate(self, x: Sequence[float], y: Sequence[float], x_new: float) -> float:
-        return super().interpolate(x, y, x_new)
+        return self.fit(x, y)(x_new)
+
+    def fit(self, x: Sequence[float], y: Sequence[float]) -> "FittedMonotoneCubic":
+        return FittedMonotoneCubic(x, y, self.extrapolation)
+
+
+class FittedMonotoneCubic(FittedPiecewiseCubic):
+    """Fritsch–Carlson Hermite interpolant with precomputed coefficients."""
+
+    def __init__(self, x: Sequence[float], y: Sequence[float], extrapolation: str = "flat"):
+        super().__init__(x, y, extrapolation)
+        h, s = self.widths, self.secants
+        n = len(self.x)
+        if n < 2:
+            self.slopes, self.b, self.c, self.d = [0.0] * n, [], [], []
+            return
+
+        slopes = [s[0]] + [0.0] * (n - 2) + [s[-1]]
+        for k in range(1, n - 1):
+            if s[k - 1] * s[k] > 0:
+                slopes[k] = 0.5 * (s[k - 1] + s[k])
+        for k in range(n - 1):
+            if s[k] == 0:
+                slopes[k] = slopes[k + 1] = 0.0
+                continue
+            alpha = slopes[k] / s[k]
+            beta = slopes[k + 1] / s[k]
+            radius = alpha * alpha + beta * beta
+            if radius > 9.0:
+                tau = 3.0 / ad.sqrt(radius)
+                slopes[k] = tau * alpha * s[k]
+                slopes[k + 1] = tau * beta * s[k]
+        self.slopes = slopes
+        self.b = slopes[:-1]
+        self.c = [(3.0 * s[i] - 2.0 * slopes[i] - slopes[i + 1]) / h[i] for i in range(n - 1)]
+        self.d = [(slopes[i] + slopes[i + 1] - 2.0 * s[i]) / (h[i] * h[i]) for i in range(n - 1)]
@@ -1 +1,17 @@
 """Solver module."""
+
+from .brent import brent
+from .levenberg_marquardt import LevenbergMarquardtResult, levenberg_marquardt
+from .newton import NewtonResult, RootResult, RootsResult, newton, newton_many, newton_system
+
+__all__ = [
+    "NewtonResult",
+    "newton_system",
+    "LevenbergMarquardtResult",
+    "levenberg_marquardt",
+    "RootResult",
+    "RootsResult",
+    "newton",
+    "newton_many",
+    "brent",
+]
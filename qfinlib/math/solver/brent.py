@@ -1 +1,86 @@
-"""Brent's method solver."""
+"""Brent's method solver.
+
+:func:`brent` finds a root inside a sign-changing bracket without
+derivatives. It combines inverse quadratic interpolation and secant steps
+with bisection, so it converges superlinearly on smooth functions and never
+does worse than bisection.
+"""
+from __future__ import annotations
+
+from typing import Callable
+
+from .newton import RootResult
+
+
+def brent(
+    func: Callable[[float], float],
+    low: float,
+    high: float,
+    tolerance: float = 1e-14,
+    max_iterations: int = 100,
+) -> RootResult:
+    """Root of ``func`` in ``[low, high]`` by Brent's method.
+
+    Parameters
+    ----------
+    func:
+        Scalar function with ``func(low)`` and ``func(high)`` of opposite
+        signs.
+    low, high:
+        Bracket.
+    tolerance:
+        Converged once the bracket is narrower than
+        ``2 * tolerance * max(1, |x|)``.
+    max_iterations:
+        Maximum steps.
+
+    Raises
+    ------
+    ValueError
+        If the bracket does not change sign.
+    """
+
+    a, b = float(low), float(high)
+    fa, fb = func(a), func(b)
+    evaluations = 2
+    if fa == 0.0:
+        return RootResult(a, 0, evaluations, True)
+    if fb == 0.0:
+        return RootResult(b, 0, evaluations, True)
+    if (fa > 0.0) == (fb > 0.0):
+        raise ValueError("brent requires a bracket where func changes sign")
+    c, fc = a, fa
+    d = e = b - a
+    for iteration in range(1, max_iterations + 1):
+        if (fb > 0.0) == (fc > 0.0):
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol = 2.2e-16 * abs(b) + tolerance * max(1.0, abs(b))
+        half = 0.5 * (c - b)
+        if abs(half) <= tol or fb == 0.0:
+            return RootResult(b, iteration, evaluations, True)
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                p, q = 2.0 * half * s, 1.0 - s
+            else:
+                q, r = fa / fc, fb / fc
+                p = s * (2.0 * half * q * (q - r) - (b - a) * (r - 1.0))
+                q = (q - 1.0) * (r - 1.0) * (s - 1.0)
+            if p > 0.0:
+                q = -q
+            p = abs(p)
+            if 2.0 * p < min(3.0 * half * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = half
+        else:
+            d = e = half
+        a, fa = b, fb
+        b += d if abs(d) > tol else (tol if half > 0.0 else -tol)
+        fb = func(b)
+        evaluations += 1
+    return RootResult(b, max_iterations, evaluations, False)
@@ -1 +1,145 @@
-"""Levenberg-Marquardt solver."""
+"""Levenberg-Marquardt solver.
+
+:func:`levenberg_marquardt` minimises ``0.5 * sum(r_i(x)^2)`` for small
+parameter vectors, such as fitting a model smile to market quotes. The
+damped normal equations are solved densely; without an analytic Jacobian it
+is approximated by forward differences.
+
+The damping term is floored relative to the largest diagonal entry of the
+normal matrix, so parameters the residuals do not depend on keep a solvable
+system and stay where they are.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Sequence
+
+from qfinlib.math.linalg import SingularMatrixError, sparse_solve
+
+# Floor of the damped diagonal, relative to the largest diagonal entry.
+_DIAGONAL_FLOOR = 1e-12
+
+
+@dataclass
+class LevenbergMarquardtResult:
+    """Outcome of :func:`levenberg_marquardt`.
+
+    Parameters
+    ----------
+    x:
+        Final parameters.
+    residuals:
+        Residuals at ``x``.
+    cost:
+        ``0.5 * sum(residuals^2)``.
+    iterations:
+        Accepted steps.
+    evaluations:
+        Residual function evaluations, including finite-difference ones.
+    converged:
+        Whether a stopping criterion was met; ``False`` when the iteration
+        limit is reached or no damping gives a downhill step.
+    """
+
+    x: List[float]
+    residuals: List[float]
+    cost: float
+    iterations: int
+    evaluations: int
+    converged: bool
+
+
+def _cost(residuals: Sequence[float]) -> float:
+    return 0.5 * sum(r * r for r in residuals)
+
+
+def levenberg_marquardt(
+    func: Callable[[List[float]], Sequence[float]],
+    x0: Sequence[float],
+    jacobian: Optional[Callable[[List[float]], Sequence[Sequence[float]]]] = None,
+    tolerance: float = 1e-12,
+    max_iterations: int = 100,
+    step: float = 1e-7,
+    damping: float = 1e-3,
+) -> LevenbergMarquardtResult:
+    """Least-squares fit of ``func(x) ~ 0`` by Levenberg-Marquardt.
+
+    Parameters
+    ----------
+    func:
+        Maps parameters to residuals (any float sequence, including arrays).
+    x0:
+        Starting parameters.
+    jacobian:
+        Optional ``J[i][j] = d r_i / d x_j``; forward differences otherwise.
+    tolerance:
+        Stops once the cost, the gradient or the relative step is below it.
+    max_iterations:
+        Maximum Jacobian evaluations.
+    step:
+        Relative finite-difference step.
+    damping:
+        Initial Marquardt damping factor.
+    """
+
+    def evaluate(x: List[float]) -> List[float]:
+        return [float(r) for r in func(x)]
+
+    x = [float(v) for v in x0]
+    n = len(x)
+    residuals = evaluate(x)
+    evaluations = 1
+    cost = _cost(residuals)
+    iterations = 0
+    converged = cost <= tolerance * tolerance
+    lam = damping
+    while not converged and iterations < max_iterations:
+        if jacobian is not None:
+            jac: List[Sequence[Any]] = [list(row) for row in jacobian(x)]
+        else:
+            columns = []
+            for j in range(n):
+                h = step * max(1.0, abs(x[j]))
+                shifted = list(x)
+                shifted[j] += h
+                bumped = evaluate(shifted)
+                evaluations += 1
+                columns.append([(b - r) / h for b, r in zip(bumped, residuals)])
+            jac = [list(row) for row in zip(*columns)]
+        gradient = [sum(row[j] * r for row, r in zip(jac, residuals)) for j in range(n)]
+        if max((abs(g) for g in gradient), default=0.0) <= tolerance:
+            converged = True
+            break
+        normal = [[sum(row[i] * row[j] for row in jac) for j in range(n)] for i in range(n)]
+        floor = _DIAGONAL_FLOOR * max(normal[i][i] for i in range(n))
+        diagonal = [max(normal[i][i], floor) for i in range(n)]
+        while True:
+            system = [
+                {j: normal[i][j] + (lam * diagonal[i] if i == j else 0.0) for j in range(n)}
+                for i in range(n)
+            ]
+            try:
+                delta = sparse_solve(system, [-g for g in gradient])
+            except SingularMatrixError:
+                delta = None
+            if delta is not None:
+                trial = [xi + di for xi, di in zip(x, delta)]
+                trial_residuals = evaluate(trial)
+                evaluations += 1
+                trial_cost = _cost(trial_residuals)
+                if trial_cost < cost:
+                    break
+            lam *= 10.0
+            if lam > 1e16:
+                return LevenbergMarquardtResult(x, residuals, cost, iterations, evaluations, False)
+        iterations += 1
+        size = max(abs(d) / max(1.0, abs(xi)) for d, xi in zip(delta, x))
+        improvement = cost - trial_cost
+        x, residuals, cost = trial, trial_residuals, trial_cost
+        lam = max(lam / 10.0, 1e-12)
+        converged = (
+            cost <= tolerance * tolerance
+            or size <= tolerance
+            or improvement <= tolerance * max(cost, tolerance)
+        )
+    return LevenbergMarquardtResult(x, residuals, cost, iterations, evaluations, converged)
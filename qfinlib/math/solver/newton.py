@@ -1 +1,359 @@
-"""Newton-Raphson solver."""
+"""Newton-Raphson solver.
+
+:func:`newton_system` solves square nonlinear systems ``F(x) = 0``. The
+residual function is evaluated on :class:`~qfinlib.math.ad.Dual` inputs, so
+every evaluation returns the residuals together with their exact sparse
+Jacobian rows; there is no finite differencing. Newton steps are computed
+with :class:`~qfinlib.math.linalg.SparseLU` and damped by halving whenever a
+full step would increase the residual norm.
+
+:func:`newton` finds a root of one scalar function from its analytic
+derivatives. It takes Halley steps when a second derivative is supplied, and
+falls back to bisection whenever a step leaves the bracket.
+:func:`newton_many` runs the same iteration over many independent roots at
+once. It keeps a per-element convergence mask, so each sweep only evaluates
+the roots that are still moving.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import math
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from qfinlib.math import backend
+from qfinlib.math.ad import Dual, tangent_of, value_of
+from qfinlib.math.linalg import SparseLU
+
+
+@dataclass
+class NewtonResult:
+    """Outcome of :func:`newton_system`.
+
+    Parameters
+    ----------
+    x:
+        Final iterate.
+    residuals:
+        Residuals at ``x``.
+    iterations:
+        Newton steps taken.
+    evaluations:
+        Residual function evaluations, including line-search trials.
+    converged:
+        Whether every residual is within tolerance.
+    jacobian:
+        Sparse rows of ``dF/dx`` at ``x``.
+    factorization:
+        :class:`SparseLU` of :attr:`jacobian`, reusable for further solves;
+        computed on first use by :meth:`factorize`.
+    """
+
+    x: List[float]
+    residuals: List[float]
+    iterations: int
+    evaluations: int
+    converged: bool
+    jacobian: List[Dict[int, float]]
+    factorization: Optional[SparseLU] = None
+
+    def factorize(self) -> SparseLU:
+        """:attr:`factorization`, computing it if needed.
+
+        Raises :class:`~qfinlib.math.linalg.SingularMatrixError` when the
+        final Jacobian is singular.
+        """
+
+        if self.factorization is None:
+            self.factorization = SparseLU(self.jacobian, len(self.x))
+        return self.factorization
+
+
+def _evaluate(
+    func: Callable[[List[Dual]], Sequence[Any]], x: Sequence[float]
+) -> Tuple[List[float], List[Dict[int, float]]]:
+    outputs = func([Dual.variable(value, i) for i, value in enumerate(x)])
+    if len(outputs) != len(x):
+        raise ValueError("newton_system requires as many residuals as unknowns")
+    return [value_of(f) for f in outputs], [tangent_of(f) for f in outputs]
+
+
+def newton_system(
+    func: Callable[[List[Dual]], Sequence[Any]],
+    x0: Sequence[float],
+    tolerance: float = 1e-12,
+    max_iterations: int = 30,
+    scale: Optional[Sequence[float]] = None,
+    max_halvings: int = 8,
+) -> NewtonResult:
+    """Solve ``func(x) = 0`` by Newton's method with an AD Jacobian.
+
+    Parameters
+    ----------
+    func:
+        Maps a list of duals (``x[i]`` seeded with tangent key ``i``) to the
+        residuals; residuals may be duals or plain floats.
+    x0:
+        Starting point.
+    tolerance:
+        Convergence threshold on ``|F_i| / scale_i`` for every residual.
+    max_iterations:
+        Maximum Newton steps.
+    scale:
+        Optional per-residual scale (defaults to one).
+    max_halvings:
+        Maximum step halvings per iteration when the residual norm grows.
+    """
+
+    scales = list(scale) if scale is not None else [1.0] * len(x0)
+
+    def norm(values: Sequence[float]) -> float:
+        return max((abs(v) / s for v, s in zip(values, scales)), default=0.0)
+
+    x = [float(v) for v in x0]
+    residuals, jacobian = _evaluate(func, x)
+    evaluations = 1
+    iterations = 0
+    current = norm(residuals)
+    while current > tolerance and iterations < max_iterations:
+        lu = SparseLU(jacobian, len(x))
+        step = lu.solve([-r for r in residuals])
+        iterations += 1
+        fraction = 1.0
+        for _ in range(max_halvings + 1):
+            trial = [xi + fraction * di for xi, di in zip(x, step)]
+            trial_residuals, trial_jacobian = _evaluate(func, trial)
+            evaluations += 1
+            trial_norm = norm(trial_residuals)
+            if trial_norm < current:
+                break
+            fraction *= 0.5
+        else:
+            # No damped step reduces the residual; x is as good as it gets.
+            break
+        x, residuals, jacobian, current = trial, trial_residuals, trial_jacobian, trial_norm
+
+    return NewtonResult(
+        x=x,
+        residuals=residuals,
+        iterations=iterations,
+        evaluations=evaluations,
+        converged=current <= tolerance,
+        jacobian=jacobian,
+    )
+
+
+@dataclass
+class RootResult:
+    """Outcome of :func:`newton` and :func:`~qfinlib.math.solver.brent`.
+
+    Parameters
+    ----------
+    root:
+        Final iterate.
+    iterations:
+        Steps taken.
+    evaluations:
+        Function evaluations.
+    converged:
+        Whether the step or the function value fell within tolerance.
+    """
+
+    root: float
+    iterations: int
+    evaluations: int
+    converged: bool
+
+
+@dataclass
+class RootsResult:
+    """Outcome of :func:`newton_many`.
+
+    Parameters
+    ----------
+    roots:
+        Final iterates, as an array with NumPy and a list without.
+    iterations:
+        Steps taken by the slowest root.
+    converged:
+        Per-root convergence flags.
+    """
+
+    roots: Any
+    iterations: int
+    converged: List[bool]
+
+
+def _halley(f: Any, df: Any, d2f: Any) -> Any:
+    step = -f / df
+    if d2f is None:
+        return step
+    denom = 1.0 + 0.5 * step * d2f / df
+    return step / denom if denom > 0.0 else step
+
+
+def newton(
+    func: Callable[[float], Sequence[float]],
+    x0: float,
+    low: Optional[float] = None,
+    high: Optional[float] = None,
+    tolerance: float = 1e-14,
+    max_iterations: int = 50,
+) -> RootResult:
+    """Root of a scalar function by safeguarded Newton or Halley steps.
+
+    Parameters
+    ----------
+    func:
+        Maps ``x`` to ``(f, f')`` for Newton steps or ``(f, f', f'')`` for
+        Halley steps.
+    x0:
+        Starting point.
+    low, high:
+        Optional bracket with ``f(low)`` and ``f(high)`` of opposite signs.
+        Steps that leave it, or vanishing derivatives, fall back to
+        bisection. Without a bracket the iteration is pure Newton or Halley.
+        When ``f`` has the same sign at both ends, the end with the smaller
+        ``|f|`` is returned unconverged.
+    tolerance:
+        Converged once ``|step| <= tolerance * max(1, |x|)``.
+    max_iterations:
+        Maximum steps.
+    """
+
+    lo = -math.inf if low is None else float(low)
+    hi = math.inf if high is None else float(high)
+    bracketed = low is not None and high is not None
+    evaluations = 0
+    sign = 0.0
+    if bracketed:
+        f_lo, f_hi = func(lo)[0], func(hi)[0]
+        evaluations += 2
+        if f_lo == 0.0 or f_hi == 0.0:
+            return RootResult(lo if f_lo == 0.0 else hi, 0, evaluations, True)
+        if (f_lo > 0.0) == (f_hi > 0.0):
+            return RootResult(lo if abs(f_lo) <= abs(f_hi) else hi, 0, evaluations, False)
+        sign = math.copysign(1.0, f_lo)
+    x = min(max(float(x0), lo), hi)
+    for iteration in range(1, max_iterations + 1):
+        values = func(x)
+        evaluations += 1
+        f, df = values[0], values[1]
+        if f == 0.0:
+            return RootResult(x, iteration, evaluations, True)
+        if bracketed:
+            if f * sign > 0.0:
+                lo = x
+            else:
+                hi = x
+        step = _halley(f, df, values[2] if len(values) > 2 else None) if df else math.nan
+        if abs(step) <= tolerance * max(1.0, abs(x)):
+            return RootResult(x + step, iteration, evaluations, True)
+        new = x + step
+        if not lo < new < hi:
+            if not bracketed:
+                return RootResult(x, iteration, evaluations, False)
+            new = 0.5 * (lo + hi)
+        x = new
+    return RootResult(x, max_iterations, evaluations, False)
+
+
+def newton_many(
+    func: Callable[[Any, Any], Sequence[Any]],
+    x0: Any,
+    low: Any = None,
+    high: Any = None,
+    tolerance: float = 1e-14,
+    max_iterations: int = 50,
+) -> RootsResult:
+    """Vectorised :func:`newton` over independent roots.
+
+    Parameters
+    ----------
+    func:
+        ``func(x, index)`` returns ``(f, f')`` or ``(f, f', f'')`` for the
+        roots at positions ``index``, where ``x`` holds their current
+        iterates. With NumPy both are arrays and only the roots still
+        iterating are passed. Without it, ``func`` is called once per root
+        with one-element lists.
+    x0:
+        Starting points, one per root.
+    low, high:
+        Optional brackets as in :func:`newton`; scalars apply to every root.
+        Roots whose bracket does not change sign stop at the end with the
+        smaller ``|f|``, unconverged.
+    tolerance, max_iterations:
+        As in :func:`newton`, applied per root.
+    """
+
+    np = backend.np
+    if np is None:
+
+        def column(values: Any) -> List[Any]:
+            return list(values) if isinstance(values, Sequence) else [values] * len(x0)
+
+        roots, converged, iterations = [], [], 0
+        for i, (start, lo, hi) in enumerate(zip(column(x0), column(low), column(high))):
+            result = newton(
+                lambda x, i=i: [v[0] for v in func([x], [i])],
+                start,
+                lo,
+                hi,
+                tolerance,
+                max_iterations,
+            )
+            roots.append(result.root)
+            converged.append(result.converged)
+            iterations = max(iterations, result.iterations)
+        return RootsResult(roots, iterations, converged)
+
+    bracketed = low is not None and high is not None
+    x = np.array(x0, dtype=float).reshape(-1)
+    lo, hi = (
+        np.array(np.broadcast_to(bound, x.shape), dtype=float)
+        for bound in (-np.inf if low is None else low, np.inf if high is None else high)
+    )
+    sign = np.zeros_like(x)
+    x = np.clip(x, lo, hi)
+    active = np.ones(len(x), dtype=bool)
+    converged = np.zeros(len(x), dtype=bool)
+    if bracketed:
+        everything = np.arange(len(x))
+        f_lo = np.asarray(func(lo, everything)[0], dtype=float)
+        f_hi = np.asarray(func(hi, everything)[0], dtype=float)
+        sign = np.sign(f_lo)
+        at_end = (f_lo == 0.0) | (f_hi == 0.0)
+        unbracketed = ~at_end & ((f_lo > 0.0) == (f_hi > 0.0))
+        nearer_low = (f_lo == 0.0) | ((f_hi != 0.0) & (np.abs(f_lo) <= np.abs(f_hi)))
+        ends = np.where(nearer_low, lo, hi)
+        x = np.where(at_end | unbracketed, ends, x)
+        converged = at_end.copy()
+        active = ~(at_end | unbracketed)
+    iterations = 0
+    with np.errstate(all="ignore"):
+        while iterations < max_iterations:
+            index = np.flatnonzero(active)
+            if not len(index):
+                break
+            iterations += 1
+            values = [np.asarray(v, dtype=float) for v in func(x[index], index)]
+            f, df = values[0], values[1]
+            current, below, above = x[index], lo[index], hi[index]
+            if bracketed:
+                up = f * sign[index] > 0.0
+                below = np.where(up, current, below)
+                above = np.where(up, above, current)
+                lo[index], hi[index] = below, above
+            step = -f / df
+            if len(values) > 2:
+                denom = 1.0 + 0.5 * step * values[2] / df
+                step = np.where(denom > 0.0, step / denom, step)
+            small = np.abs(step) <= tolerance * np.maximum(1.0, np.abs(current))
+            new = current + step
+            outside = ~small & ~((below < new) & (new < above))
+            new = np.where(outside, 0.5 * (below + above), new)
+            done = (f == 0.0) | small
+            stuck = ~np.isfinite(new)
+            x[index] = np.where(stuck | (f == 0.0), current, new)
+            converged[index] = done & ~stuck
+            active[index] = ~(done | stuck)
+    return RootsResult(x, iterations, converged.tolist())
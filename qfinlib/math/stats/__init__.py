@@ -1 +1,19 @@
 """Statistics module."""
+
+from .normal import (
+    norm_cdf,
+    norm_cdf_many,
+    norm_pdf,
+    norm_pdf_many,
+    norm_ppf,
+    norm_ppf_many,
+)
+
+__all__ = [
+    "norm_cdf",
+    "norm_pdf",
+    "norm_ppf",
+    "norm_cdf_many",
+    "norm_pdf_many",
+    "norm_ppf_many",
+]
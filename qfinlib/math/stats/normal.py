@@ -1 +1,171 @@
-"""Normal distribution utilities."""
+"""Normal distribution utilities.
+
+Scalar :func:`norm_cdf` and :func:`norm_pdf` go through the AD-aware
+:mod:`qfinlib.math.ad` functions, so they also accept dual numbers and tape
+values. The ``*_many`` variants evaluate whole arrays and return NumPy arrays
+when NumPy is installed (lists otherwise). With NumPy they are array
+expressions, so they may differ from the scalar functions by a few units in
+the last place.
+"""
+from __future__ import annotations
+
+import math
+from statistics import NormalDist
+from typing import Any, Sequence
+
+from qfinlib.math import ad, backend
+
+SQRT_2 = math.sqrt(2.0)
+SQRT_2PI = math.sqrt(2.0 * math.pi)
+
+_STANDARD = NormalDist()
+
+
+def norm_cdf(x: Any) -> Any:
+    """Standard normal cumulative distribution function."""
+
+    return 0.5 * (1.0 + ad.erf(x / SQRT_2))
+
+
+def norm_pdf(x: Any) -> Any:
+    """Standard normal density."""
+
+    return ad.exp(-0.5 * x * x) / SQRT_2PI
+
+
+def norm_ppf(p: float) -> float:
+    """Inverse of :func:`norm_cdf` (Wichura's AS241, accurate to double precision)."""
+
+    if not 0.0 < p < 1.0:
+        raise ValueError("norm_ppf requires 0 < p < 1")
+    return _STANDARD.inv_cdf(p)
+
+
+def norm_cdf_many(xs: Sequence[float]) -> Any:
+    """Vectorised :func:`norm_cdf`."""
+
+    if backend.np is None:
+        return [norm_cdf(float(x)) for x in xs]
+    return 0.5 * (1.0 + backend.erf(backend.as_floats(xs) / SQRT_2))
+
+
+def norm_pdf_many(xs: Sequence[float]) -> Any:
+    """Vectorised :func:`norm_pdf`."""
+
+    if backend.np is None:
+        return [norm_pdf(float(x)) for x in xs]
+    x = backend.as_floats(xs)
+    return backend.exp(-0.5 * x * x) / SQRT_2PI
+
+
+def norm_ppf_many(ps: Sequence[float]) -> Any:
+    """Vectorised :func:`norm_ppf`, evaluating AS241 on whole arrays with NumPy.
+
+    Arrays shorter than 512 elements go through :func:`norm_ppf` one by one.
+    """
+
+    np = backend.np
+    if np is None:
+        return [norm_ppf(float(p)) for p in ps]
+    p = backend.as_floats(ps)
+    if p.size < _PPF_MIN_SIZE:
+        return backend.to_output([norm_ppf(v) for v in p.tolist()])
+    if not np.all((p > 0.0) & (p < 1.0)):
+        raise ValueError("norm_ppf requires 0 < p < 1")
+    q = p - 0.5
+    out = np.empty_like(p)
+    central = np.abs(q) <= 0.425
+    qc = q[central]
+    r = 0.180625 - qc * qc
+    out[central] = _horner(_PPF_CENTRAL[0], r) * qc / _horner(_PPF_CENTRAL[1], r)
+    tail = ~central
+    r = np.sqrt(-backend.log(np.minimum(p[tail], 1.0 - p[tail])))
+    near = r <= 5.0
+    r = np.where(near, r - 1.6, r - 5.0)
+    numerator = np.where(near, _horner(_PPF_NEAR[0], r), _horner(_PPF_FAR[0], r))
+    denominator = np.where(near, _horner(_PPF_NEAR[1], r), _horner(_PPF_FAR[1], r))
+    x = numerator / denominator
+    out[tail] = np.where(q[tail] < 0.0, -x, x)
+    return out
+
+
+def _horner(coefficients: Sequence[float], r: Any) -> Any:
+    value = coefficients[0] * r + coefficients[1]
+    for c in coefficients[2:]:
+        value *= r
+        value += c
+    return value
+
+
+# Below this many probabilities the scalar inverse is faster per element.
+_PPF_MIN_SIZE = 512
+
+
+# Wichura's AS241 coefficients as in :mod:`statistics`, highest power first:
+# (numerator, denominator) for the central region and the near and far tails.
+_PPF_CENTRAL = (
+    (
+        2.5090809287301226727e3,
+        3.3430575583588128105e4,
+        6.7265770927008700853e4,
+        4.5921953931549871457e4,
+        1.3731693765509461125e4,
+        1.9715909503065514427e3,
+        1.3314166789178437745e2,
+        3.3871328727963666080e0,
+    ),
+    (
+        5.2264952788528545610e3,
+        2.8729085735721942674e4,
+        3.9307895800092710610e4,
+        2.1213794301586595867e4,
+        5.3941960214247511077e3,
+        6.8718700749205790830e2,
+        4.2313330701600911252e1,
+        1.0,
+    ),
+)
+_PPF_NEAR = (
+    (
+        7.7454501427834140764e-4,
+        2.2723844989269184583e-2,
+        2.4178072517745061177e-1,
+        1.2704582524523683826e0,
+        3.6478483247632046050e0,
+        5.7694972214606914055e0,
+        4.6303378461565452959e0,
+        1.4234371107496835773e0,
+    ),
+    (
+        1.0507500716444168432e-9,
+        5.4759380849953449460e-4,
+        1.5198666563616457197e-2,
+        1.4810397642748007459e-1,
+        6.8976733498510000455e-1,
+        1.6763848301838038494e0,
+        2.0531916266377588219e0,
+        1.0,
+    ),
+)
+_PPF_FAR = (
+    (
+        2.0103343992922881327e-7,
+        2.7115555687434875782e-5,
+        1.2426609473880784386e-3,
+        2.6532189526576123093e-2,
+        2.9656057182850489123e-1,
+        1.7848265399172913358e0,
+        5.4637849111641143699e0,
+        6.6579046435011037772e0,
+    ),
+    (
+        2.0442631033899397856e-15,
+        1.4215117583164458887e-7,
+        1.8463183175100546818e-5,
+        7.8686913114561325910e-4,
+        1.4875361290850614853e-2,
+        1.3692988092273580531e-1,
+        5.9983220655588793769e-1,
+        1.0,
+    ),
+)
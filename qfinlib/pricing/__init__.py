@@ -1,10 +1,13 @@
 """Pricing module."""
 
 from qfinlib.pricing.engine import PricingEngine
+from qfinlib.pricing.executor import BatchResults, PricingError
 from qfinlib.pricing import calculator, cashflow, models, priceable, pricers, results
 
 __all__ = [
     "PricingEngine",
+    "BatchResults",
+    "PricingError",
     "calculator",
     "cashflow",
     "models",
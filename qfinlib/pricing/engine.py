@@ -1,24 +1,193 @@
 """Unified pricing engine."""
 
-from typing import Any, Optional, Type
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Iterable, Optional, Sequence, Type
 from datetime import date
 from qfinlib.market.container import MarketContainer
 from qfinlib.instruments.base import Instrument
-from qfinlib.pricing.pricers.base import Pricer
+from qfinlib.pricing.executor import (
+    EXECUTORS,
+    BatchResults,
+    init_worker,
+    price_chunk,
+    price_worker_chunk,
+)
+from qfinlib.pricing.pricers.base import Pricer, PricingPlan
 
 
 class PricingEngine:
-    """Unified pricing engine for all instruments."""
+    """Unified pricing engine for all instruments.
 
-    def __init__(self, market: MarketContainer):
+    Parameters
+    ----------
+    market:
+        Market data the instruments are priced against.
+    executor:
+        How :meth:`price_many` runs: ``"serial"``, ``"threads"`` or
+        ``"processes"``.
+    workers:
+        Pool size; the CPU count by default.
+    chunk_size:
+        Instruments per pool task; by default each worker gets about four
+        chunks.
+    """
+
+    def __init__(
+        self,
+        market: MarketContainer,
+        executor: str = "serial",
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+    ):
         """Initialize with market data."""
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor '{executor}'; expected one of {EXECUTORS}")
         self.market = market
+        self.executor = executor
+        self.workers = workers
+        self.chunk_size = chunk_size
         self._pricers: dict[str, Pricer] = {}
 
-    def price(self, instrument: Instrument, as_of: Optional[date] = None) -> Any:
-        """Price an instrument."""
+    def price(
+        self,
+        instrument: Instrument,
+        as_of: Optional[date] = None,
+        measures: Optional[Iterable[str]] = None,
+    ) -> Any:
+        """Price an instrument.
+
+        With ``measures`` (e.g. ``{"DirtyPrice", "Yield"}``) the result is a
+        lazy :class:`~qfinlib.pricing.results.Measures` that computes only
+        those and the intermediates they share; unknown names raise
+        ``ValueError``.
+        """
+        pricer = self._get_pricer(instrument)
+        if measures is None:
+            return pricer.price(instrument, self.market, as_of)
+        return pricer.resolve(self.market).price(instrument, as_of, measures)
+
+    def resolve(self, instrument: Instrument) -> PricingPlan:
+        """Plan for pricing instruments of ``instrument``'s type against the market.
+
+        The plan looks up curves, tables and surfaces once, so keeping it
+        for repeated single-trade requests avoids that work per call. It is
+        a snapshot of the container; resolve again after replacing market
+        objects.
+        """
+        return self._get_pricer(instrument).resolve(self.market)
+
+    def price_many(
+        self, instruments: Iterable[Instrument], as_of: Optional[date] = None
+    ) -> BatchResults:
+        """Price a batch of instruments, returning results in input order.
+
+        The batch is split into chunks run by the configured executor; each
+        chunk goes through :meth:`price_batch`. The returned list records
+        the executor, pool size and chunk size used. A failing instrument
+        raises :class:`~qfinlib.pricing.executor.PricingError` carrying it
+        and its position.
+        """
+        items = list(instruments)
+        if self.executor == "serial" or not items:
+            results = price_chunk(self, 0, items, as_of)
+            return BatchResults(results, "serial", 1, len(items), 1 if items else 0)
+
+        workers = self.workers or os.cpu_count() or 1
+        size = self.chunk_size or max(1, math.ceil(len(items) / (4 * workers)))
+        starts = range(0, len(items), size)
+        for curve in self.market.curves.values():
+            # Fit once here rather than racing to fit in every worker.
+            if getattr(curve, "fit", None) is not None:
+                curve.fit()
+        pool_type = ThreadPoolExecutor if self.executor == "threads" else ProcessPoolExecutor
+        setup = (self.market, self._pricers)
+        with pool_type(workers, initializer=init_worker, initargs=setup) as pool:
+            futures = [
+                pool.submit(price_worker_chunk, start, items[start : start + size], as_of)
+                for start in starts
+            ]
+            results = [result for future in futures for result in future.result()]
+        return BatchResults(results, self.executor, workers, size, len(futures))
+
+    def price_batch(self, instruments: Sequence[Instrument], as_of: Optional[date] = None) -> list:
+        """Price a batch in this thread, returning results in input order.
+
+        Instruments are grouped by pricer and each group goes through
+        :meth:`Pricer.price_many` in one call, so pricers with array kernels
+        value a whole group in a few vectorised passes.
+        """
+        groups: dict[int, tuple[Pricer, list[int]]] = {}
+        for position, instrument in enumerate(instruments):
+            pricer = self._get_pricer(instrument)
+            groups.setdefault(id(pricer), (pricer, []))[1].append(position)
+        results: list = [None] * len(instruments)
+        for pricer, positions in groups.values():
+            priced = pricer.price_many([instruments[i] for i in positions], self.market, as_of)
+            for position, result in zip(positions, priced):
+                results[position] = result
+        return results
+
+    def price_with_gradient(
+        self,
+        instrument: Instrument,
+        as_of: Optional[date] = None,
+        curves: Optional[Iterable[str]] = None,
+    ) -> Any:
+        """Price an instrument together with its PV gradient in one pass."""
         pricer = self._get_pricer(instrument)
-        return pricer.price(instrument, self.market, as_of)
+        return pricer.price_with_gradient(instrument, self.market, as_of, curves)
+
+    def adjoint_sensitivities(
+        self,
+        instruments: Iterable[Instrument],
+        quantities: Optional[Iterable[float]] = None,
+        as_of: Optional[date] = None,
+        curves: Optional[Iterable[str]] = None,
+    ) -> dict[str, Any]:
+        """Total PV of a book and its gradient by reverse-mode AD.
+
+        Every market input the pricers read is recorded on one
+        :class:`~qfinlib.math.ad.Tape`. Each trade is then priced, pulled
+        back onto the inputs and rewound, so the tape never holds more than
+        one trade. A final sweep over the shared inputs gives every
+        sensitivity at once.
+
+        Returns ``{"pv": total, "gradient": {input: d total / d input}}``
+        with the input keys of :meth:`Pricer.price_with_gradient`.
+        """
+        from qfinlib.math.ad import Tape, value_of
+
+        items = list(instruments)
+        weights = [1.0] * len(items) if quantities is None else list(quantities)
+        pricers = [self._get_pricer(instrument) for instrument in items]
+        data: dict[str, None] = {}
+        surfaces: dict[str, None] = {}
+        for pricer in {id(p): p for p in pricers}.values():
+            data.update(dict.fromkeys(pricer.ad_data))
+            surfaces.update(dict.fromkeys(pricer.ad_surfaces()))
+
+        tape = Tape()
+        market = self.market.differentiable(curves, data, surfaces, variable=tape.variable)
+        for curve in market.curves.values():
+            while curve is not None:
+                if getattr(curve, "fit", None) is not None:
+                    curve.fit()
+                curve = getattr(curve, "base_curve", None)
+        mark = tape.mark()
+        adjoint = [0.0] * mark
+        total = 0.0
+        for instrument, quantity, pricer in zip(items, weights, pricers):
+            # Only the PV is recorded; the other measures are never computed.
+            result = pricer.resolve(market).price(instrument, as_of, (pricer.pv_key,))
+            pv = result[pricer.pv_key]
+            total += quantity * value_of(pv)
+            tape.pullback(pv, adjoint, quantity)
+            tape.rewind(mark)
+            # Cached factors were recorded after the mark.
+            market.reset_discount_tables()
+        return {"pv": total, "gradient": tape.collect(adjoint)}
 
     def _get_pricer(self, instrument: Instrument) -> Pricer:
         """Get the appropriate pricer for an instrument."""
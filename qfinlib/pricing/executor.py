@@ -0,0 +1,115 @@
+"""Parallel execution of batched pricing.
+
+:meth:`PricingEngine.price_many <qfinlib.pricing.engine.PricingEngine.price_many>`
+splits a batch into contiguous chunks and prices them serially, on a thread
+pool or on a process pool. The pool initializer hands each worker the market
+once. Thread workers get their own :meth:`MarketContainer.fork
+<qfinlib.market.container.MarketContainer.fork>` so lazily filled discount
+tables are never shared. Process workers unpickle a single copy at start-up.
+Only instrument chunks travel with each task.
+"""
+from __future__ import annotations
+
+import threading
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+EXECUTORS = ("serial", "threads", "processes")
+
+_local = threading.local()
+
+
+class PricingError(RuntimeError):
+    """Raised when an instrument in a batch fails to price.
+
+    Parameters
+    ----------
+    message:
+        Description including the original error.
+    index:
+        Position of the failing instrument in the batch.
+    instrument:
+        The failing instrument, or ``None`` when only the batch as a whole
+        failed.
+    """
+
+    def __init__(self, message: str, index: int, instrument: Any = None):
+        super().__init__(message)
+        self.index = index
+        self.instrument = instrument
+
+    def __reduce__(self):
+        # Survives the trip back from a process worker with its attributes.
+        return type(self), (self.args[0], self.index, self.instrument)
+
+
+class BatchResults(list):
+    """Pricing results in input order, with how the batch was executed.
+
+    Parameters
+    ----------
+    results:
+        One result per instrument.
+    executor:
+        ``"serial"``, ``"threads"`` or ``"processes"``.
+    workers:
+        Pool size used.
+    chunk_size:
+        Instruments per task.
+    chunks:
+        Number of tasks.
+    """
+
+    def __init__(
+        self,
+        results: Iterable[Any] = (),
+        executor: str = "serial",
+        workers: int = 1,
+        chunk_size: int = 0,
+        chunks: int = 0,
+    ):
+        super().__init__(results)
+        self.executor = executor
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.chunks = chunks
+
+
+def price_chunk(
+    engine: Any, start: int, instruments: Sequence[Any], as_of: Optional[date]
+) -> List[Any]:
+    """Price one chunk, pinning any failure on the instrument that caused it."""
+
+    try:
+        return engine.price_batch(instruments, as_of)
+    except Exception as error:  # noqa: BLE001 - re-raised with context below
+        failure = error
+    for offset, instrument in enumerate(instruments):
+        try:
+            engine.price(instrument, as_of)
+        except Exception as error:  # noqa: BLE001
+            raise PricingError(
+                f"Failed to price instrument {start + offset} "
+                f"({type(instrument).__name__}): {error!r}",
+                start + offset,
+                instrument,
+            ) from error
+    raise PricingError(
+        f"Failed to price the chunk starting at {start}: {failure!r}", start
+    ) from failure
+
+
+def init_worker(market: Any, pricers: Dict[str, Any]) -> None:
+    """Pool initializer: bind this worker to its own engine over ``market``."""
+
+    from qfinlib.pricing.engine import PricingEngine
+
+    engine = PricingEngine(market.fork())
+    engine._pricers.update(pricers)
+    _local.engine = engine
+
+
+def price_worker_chunk(start: int, instruments: Sequence[Any], as_of: Optional[date]) -> List[Any]:
+    """Task run on a pool worker set up by :func:`init_worker`."""
+
+    return price_chunk(_local.engine, start, instruments, as_of)
@@ -0,0 +1,5 @@
+"""Volatility models."""
+
+from .sabr import sabr_vol, sabr_vols
+
+__all__ = ["sabr_vol", "sabr_vols"]
@@ -1,8 +1,19 @@
 """Pricers module."""
 
-from qfinlib.pricing.pricers.base import Pricer
-from qfinlib.pricing.pricers.bond.bond import BondPricer
-from qfinlib.pricing.pricers.rates.swap import SwapPricer
-from qfinlib.pricing.pricers.rates.swaption import SwaptionPricer
+from qfinlib.pricing.pricers.base import Pricer, PricingPlan
+from qfinlib.pricing.pricers.bond.bond import BondPlan, BondPricer
+from qfinlib.pricing.pricers.bond.universe import BondUniverse
+from qfinlib.pricing.pricers.rates.swap import SwapPlan, SwapPricer
+from qfinlib.pricing.pricers.rates.swaption import SwaptionPlan, SwaptionPricer
 
-__all__ = ["Pricer", "BondPricer", "SwapPricer", "SwaptionPricer"]
+__all__ = [
+    "Pricer",
+    "PricingPlan",
+    "BondPricer",
+    "BondPlan",
+    "BondUniverse",
+    "SwapPricer",
+    "SwapPlan",
+    "SwaptionPricer",
+    "SwaptionPlan",
+]
@@ -1,18 +1,163 @@
 """Base pricer class."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
 from datetime import date
 from qfinlib.instruments.base import Instrument
 from qfinlib.market.container import MarketContainer
+from qfinlib.math.ad import ADScalar, Dual
+from qfinlib.pricing.results.measures import Measures
+
+
+def _real(result: Any) -> Any:
+    """Replace AD entries of a (nested) pricing result by their values."""
+
+    if isinstance(result, ADScalar):
+        return result.value
+    if isinstance(result, dict):
+        return {key: _real(value) for key, value in result.items()}
+    return result
+
+
+class PricingPlan:
+    """A pricer bound to one market by :meth:`Pricer.resolve`.
+
+    Plans look up the curves, discount tables, surfaces and market data a
+    pricer reads once, and keep their bound evaluation methods, so pricing
+    through a plan does no container lookups or attribute probing per
+    cashflow. A plan is a snapshot: resolve again once curves, surfaces or
+    data are replaced in the container. Curves updated in place are still
+    picked up, since discount tables reprice on a new curve version.
+
+    Discount tables held by a plan are listed in :attr:`tables` and are
+    checked against their curves once per :meth:`price` or
+    :meth:`price_many` call, not on every factor read.
+
+    Plans of pricers with measure tables evaluate lazily: :meth:`price`
+    with ``measures`` computes only those, sharing intermediate work. This
+    base plan prices everything through :meth:`Pricer.price`.
+    """
+
+    #: Discount tables the plan reads, refreshed by :meth:`refresh_tables`.
+    tables: Tuple[Any, ...] = ()
+
+    def __init__(self, pricer: "Pricer", market: MarketContainer):
+        self.pricer = pricer
+        self.market = market
+
+    def refresh_tables(self) -> None:
+        """Reprice held discount tables whose curves have changed in place."""
+        for table in self.tables:
+            if table.stale:
+                table.refresh()
+
+    def evaluate(self, instrument: Instrument, as_of: Optional[date] = None) -> Measures:
+        """Result for ``instrument`` whose measures are computed on first access.
+
+        This base plan prices in full up front; a result that is not a dict
+        is exposed under :attr:`Pricer.pv_key`.
+        """
+        result = self.pricer.price(instrument, self.market, as_of)
+        return Measures.of(result if isinstance(result, dict) else {self.pricer.pv_key: result})
+
+    def price(
+        self,
+        instrument: Instrument,
+        as_of: Optional[date] = None,
+        measures: Optional[Iterable[str]] = None,
+    ) -> Any:
+        """Price one instrument against the bound market.
+
+        Returns the full result dict, or with ``measures`` a lazy
+        :class:`~qfinlib.pricing.results.Measures` exposing just those.
+        """
+        self.refresh_tables()
+        result = self.evaluate(instrument, as_of)
+        if measures is None:
+            return dict(result)
+        return result.select(measures)
+
+    def price_many(
+        self, instruments: Sequence[Instrument], as_of: Optional[date] = None
+    ) -> List[Any]:
+        """Price a batch against the bound market, returning results in input order."""
+        return [self.price(instrument, as_of) for instrument in instruments]
 
 
 class Pricer(ABC):
     """Base class for all pricers."""
 
+    #: Result entry holding the present value.
+    pv_key = "pv"
+    #: Market data entries seeded by :meth:`price_with_gradient`.
+    ad_data: tuple = ()
+
     @abstractmethod
     def price(
-        self, instrument: Instrument, market: MarketContainer, as_of: Optional[date] = None
+        self,
+        instrument: Instrument,
+        market: MarketContainer,
+        as_of: Optional[date] = None,
+        measures: Optional[Iterable[str]] = None,
     ) -> Any:
-        """Price an instrument."""
+        """Price an instrument.
+
+        Returns every measure as a dict, or with ``measures`` a lazy
+        :class:`~qfinlib.pricing.results.Measures` computing only those.
+        """
         pass
+
+    def price_many(
+        self,
+        instruments: Sequence[Instrument],
+        market: MarketContainer,
+        as_of: Optional[date] = None,
+    ) -> List[Any]:
+        """Price a batch of instruments, returning results in input order.
+
+        The batch goes through one :meth:`resolve` plan. By default that
+        prices one instrument at a time; pricers with array kernels give
+        their plans a vectorised ``price_many``.
+        """
+        return self.resolve(market).price_many(instruments, as_of)
+
+    def resolve(self, market: MarketContainer) -> PricingPlan:
+        """Bind this pricer to ``market``; see :class:`PricingPlan`."""
+        return PricingPlan(self, market)
+
+    def ad_surfaces(self) -> Iterable[str]:
+        """Vol surfaces seeded by :meth:`price_with_gradient`."""
+        return ()
+
+    def differentiable_market(
+        self, market: MarketContainer, curves: Optional[Iterable[str]] = None
+    ) -> MarketContainer:
+        """Copy of ``market`` with every input this pricer reads seeded as a Dual."""
+        return market.differentiable(curves, data=self.ad_data, surfaces=self.ad_surfaces())
+
+    def price_with_gradient(
+        self,
+        instrument: Instrument,
+        market: MarketContainer,
+        as_of: Optional[date] = None,
+        curves: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Any]:
+        """Price once and differentiate the PV with respect to the market inputs.
+
+        Returns the usual result with an extra ``"gradient"`` entry mapping
+        each input the PV depends on to ``d PV / d input``: curve nodes under
+        ``(curve name, node name)``, seeded market data under its key and
+        vol surfaces under their name (a parallel vol shift).
+        """
+
+        result = self.price(instrument, self.differentiable_market(market, curves), as_of)
+        return self.split_gradient(result)
+
+    def split_gradient(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn a result priced on a differentiable market into floats plus ``"gradient"``."""
+
+        pv = result.get(self.pv_key)
+        gradient: Dict[Hashable, float] = dict(pv.tangent) if isinstance(pv, Dual) else {}
+        out = _real(result)
+        out["gradient"] = gradient
+        return out
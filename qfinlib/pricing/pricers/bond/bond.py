@@ -4,16 +4,22 @@ from __future__ import annotations
 
 import math
 from datetime import date
-from typing import Dict, Iterable, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from qfinlib.instruments.bond.bond import Bond
 from qfinlib.market.container import MarketContainer
-from qfinlib.pricing.pricers.base import Pricer
+from qfinlib.math import ad, backend, solver
+from qfinlib.pricing.pricers.base import Pricer, PricingPlan
+from qfinlib.pricing.pricers.bond.universe import BondUniverse
+from qfinlib.pricing.results.measures import Measures, MeasureTable
 
 
 class BondPricer(Pricer):
     """Simple fixed-coupon bond pricer supporting duration and carry metrics."""
 
+    pv_key = "DirtyPrice"
+    ad_data = ("yield",)
+
     def __init__(self, discount_curve: str = "discount_curve", fallback_yield: float = 0.02):
         self.discount_curve = discount_curve
         self.fallback_yield = fallback_yield
@@ -24,23 +30,6 @@ class BondPricer(Pricer):
     def _period(self, instrument: Bond) -> float:
         return 1.0 / max(1, instrument.coupon_frequency)
 
-    def _yield(self, instrument: Bond, market: MarketContainer) -> float:
-        if instrument.yield_rate is not None:
-            return float(instrument.yield_rate)
-
-        bond_blob = market.data.get("bond")
-        if isinstance(bond_blob, dict) and "yield" in bond_blob:
-            return float(bond_blob["yield"])
-
-        return float(market.data.get("yield", self.fallback_yield))
-
-    def _discount_factor(self, market: MarketContainer, t: float, yield_rate: float) -> float:
-        curve = market.get_curve(self.discount_curve)
-        if curve is not None and hasattr(curve, "discount_factor"):
-            return float(curve.discount_factor(t))
-        # Fallback to flat continuously-compounded yield
-        return math.exp(-yield_rate * t)
-
     def _cashflows(
         self, instrument: Bond, settlement: date
     ) -> Tuple[Iterable[Tuple[float, float]], float, float, float]:
@@ -70,95 +59,391 @@ class BondPricer(Pricer):
         freq = max(1, freq)
         return sum(cf * (1.0 + ytm / freq) ** (-freq * t) for t, cf in cashflows)
 
-    def _price_from_curve(
-        self, cashflows: Iterable[Tuple[float, float]], market: MarketContainer, ytm: float
-    ) -> float:
-        return sum(cf * self._discount_factor(market, t, ytm) for t, cf in cashflows)
-
     def _solve_yield(
         self, cashflows: Iterable[Tuple[float, float]], target_price: float, freq: int, guess: float
     ) -> float:
-        low, high = -0.05, 1.0
-        for _ in range(64):
-            mid = 0.5 * (low + high)
-            price = self._price_from_yield(cashflows, mid, freq)
-            if price > target_price:
-                low = mid
-            else:
-                high = mid
-        return 0.5 * (low + high)
-
-    def price(self, instrument: Bond, market: MarketContainer, as_of: Optional[date] = None) -> Dict[str, object]:
-        settlement = self._settlement_date(instrument, market, as_of)
-        cashflows, accrued_fraction, accrued_interest, period = self._cashflows(instrument, settlement)
-
-        if not cashflows:
-            return {
-                "AccruedFraction": 0.0,
-                "AccruedInterest": 0.0,
-                "DirtyPrice": 0.0,
-                "CleanPrice": 0.0,
-                "Yield": 0.0,
-                "BondDV01": 0.0,
-                "MacaulayDuration": 0.0,
-                "ModifiedDuration": 0.0,
-                "Convexity": 0.0,
-                "ParAmount": instrument.face_value,
-                "SettlementDate": settlement,
-                "MaturityDate": instrument.maturity_date,
-                "QuoteConvention": instrument.quote_convention,
-            }
-
-        market_yield = self._yield(instrument, market)
-        freq = max(1, instrument.coupon_frequency)
-
-        curve_price = self._price_from_curve(cashflows, market, market_yield)
-        yield_price = self._price_from_yield(cashflows, market_yield, freq)
-
-        dirty_price = curve_price if market.get_curve(self.discount_curve) else yield_price
-        if instrument.clean_price is not None:
-            dirty_price = instrument.clean_price + accrued_interest
-            if instrument.yield_rate is None:
-                market_yield = self._solve_yield(cashflows, dirty_price, freq, market_yield)
-
-        clean_price = dirty_price - accrued_interest
-
-        # DV01 and risk measures using yield-based discounting for stability
-        bump = 0.0001
-        price_up = self._price_from_yield(cashflows, market_yield + bump, freq)
-        price_down = self._price_from_yield(cashflows, max(-0.99, market_yield - bump), freq)
-        dv01 = (price_down - price_up) / 2.0
-
-        discounted_cashflows = [
-            (t, cf, self._price_from_yield([(t, cf)], market_yield, freq)) for t, cf in cashflows
-        ]
-        macaulay_numerator = sum(t * pv for t, _, pv in discounted_cashflows)
-        convexity_numerator = sum(t * (t + period) * pv for t, _, pv in discounted_cashflows)
-        macaulay_duration = macaulay_numerator / dirty_price if dirty_price else 0.0
-        modified_duration = macaulay_duration / (1.0 + market_yield / freq) if dirty_price else 0.0
-        convexity = convexity_numerator / dirty_price if dirty_price else 0.0
-
-        metrics: Dict[str, object] = {
-            "AccruedFraction": accrued_fraction,
-            "AccruedInterest": accrued_interest,
-            "BondCurvePrice": curve_price,
+        freq = max(1, freq)
+        flows = [(freq * t, cf) for t, cf in cashflows]
+
+        def residual(ytm: float) -> Tuple[float, float, float]:
+            # Price and its first two yield derivatives in one pass over the flows.
+            growth = 1.0 + ytm / freq
+            price = slope = curvature = 0.0
+            for n, cf in flows:
+                pv = cf * growth ** (-n)
+                price += pv
+                slope += n * pv
+                curvature += n * (n + 1.0) * pv
+            return price - target_price, -slope / (freq * growth), curvature / (freq * growth) ** 2
+
+        start = min(max(ad.value_of(guess), -0.05), 1.0)
+        result = solver.newton(residual, start, -0.05, 1.0)
+        return _bracketed_yield(lambda ytm: residual(ytm)[0], result.root, result.converged)
+
+    @staticmethod
+    def _solve_yields(
+        owners: Any, times: Any, amounts: Any, freqs: Any, targets: Any, guesses: Any, bonds: Any
+    ) -> Any:
+        """Batch :meth:`_solve_yield` for the bonds at positions ``bonds``."""
+
+        np = backend.np
+        picked = np.isin(owners, bonds)
+        rank = np.full(len(freqs), -1)
+        rank[bonds] = np.arange(len(bonds))
+        owner = rank[owners[picked]]
+        periods = freqs[owners[picked]] * times[picked]
+        flows = amounts[picked]
+        freq, target = freqs[bonds], targets[bonds]
+
+        def residual(ytm: Any, index: Any) -> Tuple[Any, Any, Any]:
+            # One root per bond; only the roots still iterating are repriced.
+            rows = np.isin(owner, index)
+            slot = np.searchsorted(index, owner[rows])
+            growth = 1.0 + ytm / freq[index]
+            pv = flows[rows] * growth[slot] ** (-periods[rows])
+            n = periods[rows]
+            size = len(index)
+            price = np.bincount(slot, weights=pv, minlength=size)
+            slope = np.bincount(slot, weights=n * pv, minlength=size)
+            curvature = np.bincount(slot, weights=n * (n + 1.0) * pv, minlength=size)
+            scale = freq[index] * growth
+            return price - target[index], -slope / scale, curvature / (scale * scale)
+
+        start = np.clip(guesses[bonds], -0.05, 1.0)
+        result = solver.newton_many(residual, start, -0.05, 1.0)
+        roots = result.roots
+        for j in np.flatnonzero(~np.asarray(result.converged, dtype=bool)).tolist():
+            rows = owner == j
+
+            def price_error(ytm: float, n: Any = periods[rows], cf: Any = flows[rows]) -> float:
+                return float(np.sum(cf * (1.0 + ytm / freq[j]) ** (-n))) - target[j]
+
+            roots[j] = _bracketed_yield(price_error, roots[j], False)
+        return roots
+
+    def resolve(self, market: MarketContainer) -> "BondPlan":
+        return BondPlan(self, market)
+
+    def price_universe(self, universe: BondUniverse, market: MarketContainer) -> Dict[str, Any]:
+        """Price a whole universe against ``market``; see :meth:`BondPlan.price_universe`."""
+        return self.resolve(market).price_universe(universe)
+
+    def price(
+        self,
+        instrument: Bond,
+        market: MarketContainer,
+        as_of: Optional[date] = None,
+        measures: Optional[Iterable[str]] = None,
+    ) -> Dict[str, object]:
+        return self.resolve(market).price(instrument, as_of, measures)
+
+
+class BondPlan(PricingPlan):
+    """:class:`BondPricer` bound to a market.
+
+    Holds the shared discount table or the curve's bound
+    ``discount_factor``, and the market yield used for bonds without their
+    own yield.
+    """
+
+    def __init__(self, pricer: BondPricer, market: MarketContainer):
+        super().__init__(pricer, market)
+        curve = market.get_curve(pricer.discount_curve)
+        self.has_curve = bool(curve)
+        self.table = market.discount_table(pricer.discount_curve)
+        self.tables = (self.table,) if self.table is not None else ()
+        self.discount_factor: Optional[Callable[[float], Any]] = None
+        if curve is not None and hasattr(curve, "discount_factor"):
+            self.discount_factor = curve.discount_factor
+        bond_blob = market.data.get("bond")
+        if isinstance(bond_blob, dict) and "yield" in bond_blob:
+            self.market_yield = float(bond_blob["yield"])
+        else:
+            self.market_yield = ad.as_number(market.data.get("yield", pricer.fallback_yield))
+
+    def yield_of(self, instrument: Bond) -> float:
+        if instrument.yield_rate is not None:
+            return float(instrument.yield_rate)
+        return self.market_yield
+
+    def price_from_curve(self, cashflows: Iterable[Tuple[float, float]], ytm: float) -> float:
+        table = self.table
+        if table is not None:
+            factors = table.factors(table.extend(t for t, _ in cashflows))
+            return sum(cf * df for (_, cf), df in zip(cashflows, factors))
+        discount_factor = self.discount_factor
+        if discount_factor is not None:
+            return sum(cf * ad.as_number(discount_factor(t)) for t, cf in cashflows)
+        # Fallback to flat continuously-compounded yield
+        return sum(cf * ad.exp(-ytm * t) for t, cf in cashflows)
+
+    def evaluate(self, instrument: Bond, as_of: Optional[date] = None) -> Measures:
+        settlement = self.pricer._settlement_date(instrument, self.market, as_of)
+        schedule = self.pricer._cashflows(instrument, settlement)
+        if schedule[0]:
+            result = Measures(BOND_MEASURES, self, instrument, as_of)
+        else:
+            result = Measures(EXPIRED_BOND_MEASURES, self, instrument, as_of, _EXPIRED_NAMES)
+        result.set("_settlement", settlement)
+        result.set("_schedule", schedule)
+        return result
+
+    def price_many(
+        self, instruments: Sequence[Bond], as_of: Optional[date] = None
+    ) -> List[Dict[str, object]]:
+        """Price a batch of bonds through :meth:`price_universe`.
+
+        Results agree with :meth:`price` to rounding. Without NumPy, or on
+        a differentiable market, bonds are priced one by one.
+        """
+
+        if backend.np is None or getattr(self.market, "seeded", False):
+            return super().price_many(instruments, as_of)
+
+        universe = BondUniverse(instruments, as_of or self.market.as_of)
+        columns = self.price_universe(universe)
+        names = list(columns)
+        rows = zip(*(columns[name].tolist() for name in names))
+        results: List[Dict[str, object]] = []
+        for bond, settlement, count, row in zip(
+            instruments, universe.settlements, universe.counts.tolist(), rows
+        ):
+            if not count:
+                results.append(dict(self.evaluate(bond, as_of)))
+                continue
+            # Kernel columns are preset; the table computes every other measure.
+            result = Measures(BOND_MEASURES, self, bond, as_of, _BOND_NAMES)
+            result.set("_settlement", settlement)
+            for name, value in zip(names, row):
+                result.set(name, value)
+            results.append({name: result[name] for name in _BOND_NAMES})
+        return results
+
+    def price_universe(self, universe: BondUniverse) -> Dict[str, Any]:
+        """Price every bond of ``universe``, returning one column per measure.
+
+        The columns are ``AccruedFraction``, ``AccruedInterest``,
+        ``BondCurvePrice``, ``BondDV01``, ``CleanPrice``, ``Convexity``,
+        ``DirtyPrice``, ``MacaulayDuration``, ``ModifiedDuration`` and
+        ``Yield``, all zero for matured bonds.
+
+        Bonds quoted by clean price without a yield solve their yields
+        together with :func:`~qfinlib.math.solver.newton_many`. Every
+        cashflow is then discounted at its bond's yield once, and the yield
+        price, analytic DV01 and the duration and convexity numerators are
+        weighted sums of those present values, reduced per bond with
+        ``bincount``. Curve prices read the shared discount table once per
+        distinct cashflow time. Without NumPy, or on a
+        differentiable market, bonds are priced one by one and the columns
+        are lists.
+        """
+
+        np = backend.np
+        if np is None or getattr(self.market, "seeded", False):
+            return self._price_universe_by_bond(universe)
+
+        self.refresh_tables()
+        size = len(universe)
+        owners, times, amounts = universe.owners, universe.times, universe.amounts
+        freqs, accrued = universe.frequencies, universe.accrued
+        live = universe.counts > 0
+        quoted_yields = ~np.isnan(universe.yields)
+        yields = np.where(quoted_yields, universe.yields, self.market_yield)
+
+        def total(values: Any) -> Any:
+            return np.bincount(owners, weights=values, minlength=size)
+
+        table, grid = self.table, universe.grid.tolist()
+        if table is not None:
+            dfs = np.asarray(table.factors(table.extend(grid)), dtype=float)
+            curve_prices = total(amounts * dfs[universe.grid_index])
+        elif self.discount_factor is not None:
+            dfs = np.asarray([ad.as_number(self.discount_factor(t)) for t in grid], dtype=float)
+            curve_prices = total(amounts * dfs[universe.grid_index])
+        else:
+            curve_prices = total(amounts * np.exp(-yields[owners] * times))
+
+        quoted = live & ~np.isnan(universe.clean_prices)
+        targets = universe.clean_prices + accrued
+        unsolved = np.flatnonzero(quoted & ~quoted_yields)
+        if len(unsolved):
+            yields[unsolved] = self.pricer._solve_yields(
+                owners, times, amounts, freqs, targets, yields, unsolved
+            )
+        yields[~live] = 0.0
+
+        # The single discounting pass every yield measure is read from.
+        flow_freqs = freqs[owners]
+        growth = 1.0 + yields[owners] / flow_freqs
+        pvs = amounts * growth ** (-flow_freqs * times)
+        weighted = times * pvs
+
+        dirty = curve_prices if self.has_curve else total(pvs)
+        dirty = np.where(quoted, targets, dirty)
+        dv01 = total(weighted / growth) * 1e-4
+        safe = np.where(dirty != 0.0, dirty, 1.0)
+        macaulay = np.where(dirty != 0.0, total(weighted) / safe, 0.0)
+        modified = np.where(dirty != 0.0, macaulay / (1.0 + yields / freqs), 0.0)
+        spacing = times * (times + universe.periods[owners])
+        convexity = np.where(dirty != 0.0, total(spacing * pvs) / safe, 0.0)
+
+        return {
+            "AccruedFraction": universe.accrued_fractions,
+            "AccruedInterest": accrued,
+            "BondCurvePrice": curve_prices,
             "BondDV01": dv01,
-            "CleanPrice": clean_price,
+            "CleanPrice": dirty - accrued,
             "Convexity": convexity,
-            "DirtyPrice": dirty_price,
-            "DPdZ": dv01,
-            "MacaulayDuration": macaulay_duration,
-            "ModifiedDuration": modified_duration,
-            "ParAmount": instrument.face_value,
-            "MaturityDate": instrument.maturity_date,
-            "SettlementDate": settlement,
-            "Yield": market_yield,
-            "GCRepoCarry_bps_TN_3M_TN_2W_1M_2M_3M_6M_12M": 0.0,
-            "CMTRollReturn_bps_1W_2W_1M_2M_3M_6M_12M": 0.0,
-            "GCRepoSpread_TN_SN_1W_2W_1M_2M_3M_6M_12M": 0.0,
-            "GCRepoReturn_TN_SN_1W_2W_1M_2M_3M_6M_12M": 0.0,
-            "ConvexityReturn_bps_3M_6M_12M": 0.0,
-            "QuoteConvention": instrument.quote_convention,
+            "DirtyPrice": dirty,
+            "MacaulayDuration": macaulay,
+            "ModifiedDuration": modified,
+            "Yield": yields,
         }
 
-        return metrics
+    def _price_universe_by_bond(self, universe: BondUniverse) -> Dict[str, Any]:
+        results = [
+            self.evaluate(bond, settlement)
+            for bond, settlement in zip(universe.bonds, universe.settlements)
+        ]
+        names = (
+            "AccruedFraction",
+            "AccruedInterest",
+            "BondCurvePrice",
+            "BondDV01",
+            "CleanPrice",
+            "Convexity",
+            "DirtyPrice",
+            "MacaulayDuration",
+            "ModifiedDuration",
+            "Yield",
+        )
+        return {name: [result[name] for result in results] for name in names}
+
+
+def _bracketed_yield(price_error: Callable[[float], float], root: float, converged: bool) -> float:
+    """Yield from a Newton solve over the ``[-5%, 100%]`` bracket.
+
+    Unconverged solves are finished with :func:`~qfinlib.math.solver.brent`.
+    Quotes the bracket cannot reach keep the end Newton stopped at, the one
+    whose price is nearer the quote.
+    """
+
+    if converged:
+        return root
+    try:
+        return solver.brent(price_error, -0.05, 1.0).root
+    except ValueError:
+        return root
+
+
+def _dirty_price(r: Measures) -> Any:
+    instrument = r.instrument
+    if instrument.clean_price is not None:
+        return instrument.clean_price + r["AccruedInterest"]
+    return r["BondCurvePrice"] if r.plan.has_curve else r["_yield_price"]
+
+
+def _yield(r: Measures) -> Any:
+    instrument = r.instrument
+    market_yield = r["_market_yield"]
+    if instrument.clean_price is not None and instrument.yield_rate is None:
+        cashflows = r["_schedule"][0]
+        return r.plan.pricer._solve_yield(cashflows, r["DirtyPrice"], r["_freq"], market_yield)
+    return market_yield
+
+
+def _dv01(r: Measures) -> Any:
+    # DV01 from the yield derivative of the yield-based price, in one pass.
+    seeded_yield = ad.Dual.variable(ad.value_of(r["Yield"]), "yield")
+    price = r.plan.pricer._price_from_yield(r["_schedule"][0], seeded_yield, r["_freq"])
+    return -price.derivative("yield") * 1e-4
+
+
+def _discounted(r: Measures) -> List[Tuple[float, float, Any]]:
+    price_from_yield = r.plan.pricer._price_from_yield
+    ytm, freq = r["Yield"], r["_freq"]
+    return [(t, cf, price_from_yield([(t, cf)], ytm, freq)) for t, cf in r["_schedule"][0]]
+
+
+def _macaulay_duration(r: Measures) -> Any:
+    dirty_price = r["DirtyPrice"]
+    if not dirty_price:
+        return 0.0
+    return sum(t * pv for t, _, pv in r["_discounted"]) / dirty_price
+
+
+def _modified_duration(r: Measures) -> Any:
+    if not r["DirtyPrice"]:
+        return 0.0
+    return r["MacaulayDuration"] / (1.0 + r["Yield"] / r["_freq"])
+
+
+def _convexity(r: Measures) -> Any:
+    dirty_price = r["DirtyPrice"]
+    if not dirty_price:
+        return 0.0
+    period = r["_schedule"][3]
+    return sum(t * (t + period) * pv for t, _, pv in r["_discounted"]) / dirty_price
+
+
+#: Measures of :meth:`BondPlan.evaluate`, in result order. The plan presets
+#: ``_settlement`` and ``_schedule`` when it already has them.
+BOND_MEASURES: MeasureTable = {
+    "_settlement": lambda r: r.plan.pricer._settlement_date(r.instrument, r.plan.market, r.as_of),
+    "_schedule": lambda r: r.plan.pricer._cashflows(r.instrument, r["_settlement"]),
+    "_market_yield": lambda r: r.plan.yield_of(r.instrument),
+    "_freq": lambda r: max(1, r.instrument.coupon_frequency),
+    "_yield_price": lambda r: r.plan.pricer._price_from_yield(
+        r["_schedule"][0], r["_market_yield"], r["_freq"]
+    ),
+    "_discounted": _discounted,
+    "AccruedFraction": lambda r: r["_schedule"][1],
+    "AccruedInterest": lambda r: r["_schedule"][2],
+    "BondCurvePrice": lambda r: r.plan.price_from_curve(r["_schedule"][0], r["_market_yield"]),
+    "BondDV01": _dv01,
+    "CleanPrice": lambda r: r["DirtyPrice"] - r["AccruedInterest"],
+    "Convexity": _convexity,
+    "DirtyPrice": _dirty_price,
+    "DPdZ": lambda r: r["BondDV01"],
+    "MacaulayDuration": _macaulay_duration,
+    "ModifiedDuration": _modified_duration,
+    "ParAmount": lambda r: r.instrument.face_value,
+    "MaturityDate": lambda r: r.instrument.maturity_date,
+    "SettlementDate": lambda r: r["_settlement"],
+    "Yield": _yield,
+    "GCRepoCarry_bps_TN_3M_TN_2W_1M_2M_3M_6M_12M": lambda r: 0.0,
+    "CMTRollReturn_bps_1W_2W_1M_2M_3M_6M_12M": lambda r: 0.0,
+    "GCRepoSpread_TN_SN_1W_2W_1M_2M_3M_6M_12M": lambda r: 0.0,
+    "GCRepoReturn_TN_SN_1W_2W_1M_2M_3M_6M_12M": lambda r: 0.0,
+    "ConvexityReturn_bps_3M_6M_12M": lambda r: 0.0,
+    "QuoteConvention": lambda r: r.instrument.quote_convention,
+}
+
+_BOND_NAMES = tuple(name for name in BOND_MEASURES if name[0] != "_")
+
+#: Measures of bonds with no cashflows left after settlement: zero, apart
+#: from the bond's static data. Only the entries below are listed in full
+#: results, but every bond measure can be selected.
+EXPIRED_BOND_MEASURES: MeasureTable = {
+    **{name: lambda r: 0.0 for name in BOND_MEASURES if name[0] != "_"},
+    "_settlement": BOND_MEASURES["_settlement"],
+    "ParAmount": BOND_MEASURES["ParAmount"],
+    "MaturityDate": BOND_MEASURES["MaturityDate"],
+    "SettlementDate": BOND_MEASURES["SettlementDate"],
+    "QuoteConvention": BOND_MEASURES["QuoteConvention"],
+}
+_EXPIRED_NAMES = (
+    "AccruedFraction",
+    "AccruedInterest",
+    "DirtyPrice",
+    "CleanPrice",
+    "Yield",
+    "BondDV01",
+    "MacaulayDuration",
+    "ModifiedDuration",
+    "Convexity",
+    "ParAmount",
+    "SettlementDate",
+    "MaturityDate",
+    "QuoteConvention",
+)
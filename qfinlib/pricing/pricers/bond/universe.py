@@ -0,0 +1,129 @@
+"""Columnar storage of a bond universe for whole-universe pricing."""
+
+from __future__ import annotations
+
+import math
+from datetime import date
+from typing import Any, Optional, Sequence, Tuple
+
+from qfinlib.instruments.bond.bond import Bond
+from qfinlib.math import backend
+
+
+class BondUniverse:
+    """Bonds stored as columns, with every cashflow laid end to end.
+
+    Schedules follow :meth:`BondPricer._cashflows
+    <qfinlib.pricing.pricers.bond.bond.BondPricer._cashflows>` for the
+    settlement date of each bond, so a universe is built once per date and
+    can be priced against any number of markets with
+    :meth:`BondPlan.price_universe
+    <qfinlib.pricing.pricers.bond.bond.BondPlan.price_universe>`.
+
+    Columns are :class:`numpy.ndarray` objects when NumPy is available and
+    lists otherwise. Quote columns hold ``nan`` for bonds without a clean
+    price or yield, and may be overwritten between pricings.
+
+    Parameters
+    ----------
+    bonds:
+        The bonds, in column order.
+    as_of:
+        Settlement date of bonds without their own ``settlement_date``;
+        today by default.
+
+    Attributes
+    ----------
+    settlements:
+        Settlement date of each bond.
+    faces, coupons, frequencies:
+        Face value, coupon amount per period and coupons per year (at
+        least one).
+    maturities:
+        Years from settlement to maturity.
+    periods:
+        Years between coupons.
+    accrued_fractions, accrued:
+        Fraction of the current period accrued, and the accrued interest.
+    clean_prices, yields:
+        Quoted clean price and yield.
+    counts:
+        Cashflows left per bond; zero once a bond has matured.
+    owners, times, amounts:
+        For every cashflow: the position of its bond, its time from
+        settlement in years and its amount.
+    grid, grid_index:
+        The distinct cashflow times, sorted, and the position of each
+        cashflow's time in ``grid``; curves are read on the grid only.
+    """
+
+    def __init__(self, bonds: Sequence[Bond], as_of: Optional[date] = None):
+        self.bonds = list(bonds)
+        self.as_of = as_of
+        self.settlements = [bond.settlement_date or as_of or date.today() for bond in self.bonds]
+        rows = [_schedule(bond, s) for bond, s in zip(self.bonds, self.settlements)]
+        columns = list(zip(*rows)) or [()] * 7
+        frequency, period, maturity, counts, first, coupon, fraction = columns
+        faces = [float(bond.face_value) for bond in self.bonds]
+
+        self.faces = backend.as_floats(faces)
+        self.coupons = backend.as_floats(coupon)
+        self.frequencies = backend.as_floats(frequency)
+        self.maturities = backend.as_floats(maturity)
+        self.periods = backend.as_floats(period)
+        self.accrued_fractions = backend.as_floats(fraction)
+        self.accrued = backend.as_floats([c * a for c, a in zip(coupon, fraction)])
+        self.clean_prices = backend.as_floats([_quote(b.clean_price) for b in self.bonds])
+        self.yields = backend.as_floats([_quote(b.yield_rate) for b in self.bonds])
+
+        np = backend.np
+        if np is None:
+            self.counts: Any = counts
+            self.owners: Any = [i for i, n in enumerate(counts) for _ in range(n)]
+            self.times: Any = [
+                first[i] + k * period[i] for i, n in enumerate(counts) for k in range(n)
+            ]
+            self.amounts: Any = [
+                coupon[i] + (faces[i] if k == n - 1 else 0.0)
+                for i, n in enumerate(counts)
+                for k in range(n)
+            ]
+            self.grid: Any = sorted(set(self.times))
+            slots = {t: slot for slot, t in enumerate(self.grid)}
+            self.grid_index: Any = [slots[t] for t in self.times]
+            return
+
+        self.counts = np.asarray(counts, dtype=int)
+        self.owners = np.repeat(np.arange(len(self.bonds)), self.counts)
+        starts = np.cumsum(self.counts) - self.counts
+        index = np.arange(len(self.owners)) - starts[self.owners]
+        self.times = np.asarray(first, dtype=float)[self.owners] + index * self.periods[self.owners]
+        self.amounts = self.coupons[self.owners].copy()
+        last = index == self.counts[self.owners] - 1
+        self.amounts[last] += self.faces[self.owners[last]]
+        self.grid, self.grid_index = np.unique(self.times, return_inverse=True)
+
+    def __len__(self) -> int:
+        return len(self.bonds)
+
+
+def _quote(value: Optional[float]) -> float:
+    return math.nan if value is None else float(value)
+
+
+def _schedule(bond: Bond, settlement: date) -> Tuple[Any, ...]:
+    """Schedule scalars of ``bond`` as ``BondPricer._cashflows`` computes them.
+
+    Returns the frequency, period, maturity, cashflow count, first payment
+    time, coupon amount and accrued fraction.
+    """
+
+    frequency = max(1, bond.coupon_frequency)
+    period = 1.0 / frequency
+    maturity = bond.maturity_time(settlement)
+    if maturity <= 0:
+        return frequency, period, maturity, 0, 0.0, 0.0, 0.0
+    count = max(1, math.ceil(maturity / period))
+    first = max(0.0, maturity - (count - 1) * period)
+    fraction = max(0.0, min(1.0, (period - first) / period))
+    return frequency, period, maturity, count, first, bond.coupon_amount(), fraction
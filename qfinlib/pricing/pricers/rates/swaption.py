@@ -1,27 +1,31 @@
-"""Swaption pricer using Black's model."""
+"""Swaption pricer using Black's or Bachelier's model."""
 
 from __future__ import annotations
 
-import math
 from datetime import date
-from typing import Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
 
 from qfinlib.instruments.rates.option.swaption import Swaption
 from qfinlib.market.container import MarketContainer
-from qfinlib.pricing.pricers.base import Pricer
+from qfinlib.math import ad, backend
+from qfinlib.math.analytics import (
+    bachelier_greeks,
+    bachelier_greeks_many,
+    black_greeks,
+    black_greeks_many,
+)
+from qfinlib.pricing.pricers.base import Pricer, PricingPlan
 from qfinlib.pricing.pricers.rates.swap import SwapPricer
+from qfinlib.pricing.results.measures import Measures, MeasureTable
 
 
-def _norm_cdf(x: float) -> float:
-    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
-
-
-def _norm_pdf(x: float) -> float:
-    return math.exp(-0.5 * x * x) / math.sqrt(2.0 * math.pi)
+class SwaptionPricer(Pricer):
+    """European swaption priced with the Black or Bachelier closed form.
 
+    ``model="bachelier"`` reads the vol surface as normal (absolute) vols.
+    """
 
-class SwaptionPricer(Pricer):
-    """European swaption priced with the Black closed form."""
+    ad_data = ("discount_rate", "forward_rate", "volatility")
 
     def __init__(
         self,
@@ -29,28 +33,25 @@ class SwaptionPricer(Pricer):
         discount_curve: str = "discount_curve",
         vol_surface: str = "swaption_vol",
         fallback_vol: float = 0.01,
+        model: str = "black",
     ) -> None:
+        if model not in ("black", "bachelier"):
+            raise ValueError(f"Unsupported swaption model: {model}")
         self.swap_pricer = swap_pricer or SwapPricer(discount_curve)
         self.discount_curve = discount_curve
         self.vol_surface = vol_surface
         self.fallback_vol = fallback_vol
+        self.model = model
 
-    def _discount_factor(self, market: MarketContainer, t: float) -> float:
-        curve = market.get_curve(self.discount_curve)
-        if curve is not None and hasattr(curve, "discount_factor"):
-            return curve.discount_factor(t)
-        rate = market.data.get("discount_rate", 0.0)
-        return math.exp(-rate * t)
+    @staticmethod
+    def _tenor(instrument: Swaption, expiry: float) -> float:
+        end = max(
+            (t for leg in instrument.swap.legs for t in leg.payment_times_list), default=expiry
+        )
+        return max(end - expiry, 0.0)
 
-    def _volatility(self, market: MarketContainer, expiry: float, strike: float, forward: float) -> float:
-        surface = market.get_surface(self.vol_surface)
-        if surface is not None:
-            getter = getattr(surface, "__call__", None) or getattr(surface, "vol", None)
-            if callable(getter):
-                return float(getter(expiry, strike, forward))
-            if getter is not None:
-                return float(getter)
-        return float(market.data.get("volatility", self.fallback_vol))
+    def ad_surfaces(self) -> Iterable[str]:
+        return (self.vol_surface,)
 
     def _expiry_in_years(self, expiry, as_of=None, market=None) -> float:
         if isinstance(expiry, (int, float)):
@@ -63,74 +64,177 @@ class SwaptionPricer(Pricer):
             return delta_days / 365.0
         raise ValueError("Expiry must be provided as a year fraction or date for pricing")
 
-    def _black_price(self, forward: float, strike: float, vol: float, expiry: float, call: bool, discount: float):
-        if vol <= 0 or expiry <= 0:
-            intrinsic = max(0.0, (forward - strike) if call else (strike - forward))
-            delta = discount if (call and forward > strike) else -discount if (not call and forward < strike) else 0.0
-            return intrinsic * discount, delta, 0.0, 0.0, 0.0
-
-        sigma_sqrt_t = vol * math.sqrt(expiry)
-        d1 = math.log(forward / strike) / sigma_sqrt_t + 0.5 * sigma_sqrt_t
-        d2 = d1 - sigma_sqrt_t
-        if call:
-            price = discount * (forward * _norm_cdf(d1) - strike * _norm_cdf(d2))
-            delta = discount * _norm_cdf(d1)
+    def _option_greeks(
+        self, forward: float, strike: float, vol: float, expiry: float, call: bool, discount: float
+    ):
+        kernel = bachelier_greeks if self.model == "bachelier" else black_greeks
+        return kernel(forward, strike, vol, expiry, call, discount)
+
+    def resolve(self, market: MarketContainer) -> "SwaptionPlan":
+        return SwaptionPlan(self, market)
+
+    def price(self, instrument: Swaption, market: MarketContainer, as_of=None, measures=None):
+        return self.resolve(market).price(instrument, as_of, measures)
+
+
+class SwaptionPlan(PricingPlan):
+    """:class:`SwaptionPricer` bound to a market.
+
+    Holds the underlying :class:`~qfinlib.pricing.pricers.rates.swap.SwapPlan`,
+    the expiry discounting, and the vol surface's bound lookup: the cube's
+    ``swaption_vol``, a smile callable, or a flat vol.
+    """
+
+    def __init__(self, pricer: SwaptionPricer, market: MarketContainer):
+        super().__init__(pricer, market)
+        self.swaps = pricer.swap_pricer.resolve(market)
+        table = market.discount_table(pricer.discount_curve)
+        curve = market.get_curve(pricer.discount_curve)
+        self.table = table
+        self.tables = ((table,) if table is not None else ()) + self.swaps.tables
+        if table is not None:
+            self.discount_factor: Callable[[float], Any] = table.discount_factor
+        elif curve is not None and hasattr(curve, "discount_factor"):
+            self.discount_factor = curve.discount_factor
         else:
-            price = discount * (strike * _norm_cdf(-d2) - forward * _norm_cdf(-d1))
-            delta = discount * (_norm_cdf(d1) - 1.0)
-        gamma = discount * _norm_pdf(d1) / (forward * sigma_sqrt_t)
-        vega = discount * forward * _norm_pdf(d1) * math.sqrt(expiry)
-        theta = -discount * forward * _norm_pdf(d1) * vol / (2 * math.sqrt(expiry))
-        return price, delta, gamma, vega, theta
-
-    def price(self, instrument: Swaption, market: MarketContainer, as_of=None):
-        expiry = self._expiry_in_years(instrument.expiry, as_of=as_of, market=market)
-        swap_data = self.swap_pricer.price(instrument.swap, market, as_of)
-
-        annuity = swap_data.get("annuity", 0.0) or 1.0
-        forward = swap_data.get("par_rate", 0.0)
-        strike = instrument.resolved_strike
-        vol = self._volatility(market, expiry, strike, forward)
-        discount = self._discount_factor(market, expiry)
-
-        payer = instrument.is_payer
-        price, delta, gamma, vega, theta = self._black_price(
-            forward=forward,
-            strike=strike,
-            vol=vol,
-            expiry=expiry,
-            call=payer,
-            discount=discount,
-        )
+            rate = market.data.get("discount_rate", 0.0)
+            self.discount_factor = lambda t: ad.exp(-rate * t)
 
-        # Scale results by the swap annuity
-        price *= annuity
-        delta *= annuity
-        gamma *= annuity
-        vega *= annuity
-        theta *= annuity
-
-        # Additional diagnostics
-        atm_vol = self._volatility(market, expiry, forward, forward)
-        sabr_parameters = {
-            "alpha": market.data.get("sabr_alpha"),
-            "beta": market.data.get("sabr_beta"),
-            "rho": market.data.get("sabr_rho"),
-            "nu": market.data.get("sabr_nu"),
-        }
-
-        return {
-            "pv": price,
-            "delta": delta,
-            "gamma": gamma,
-            "vega": vega,
-            "theta": theta,
-            "forward": forward,
-            "strike": strike,
-            "volatility": vol,
-            "annuity": annuity,
-            "implied_vol_at_strike": vol,
-            "implied_vol_atm": atm_vol,
-            "sabr_parameters": sabr_parameters,
-            "swap_metrics": swap_data,
-        }
+        surface = market.get_surface(pricer.vol_surface)
+        flat_vol = market.data.get("volatility", pricer.fallback_vol)
+        self.cube: Optional[Callable[..., Any]] = None
+        self.smile: Optional[Callable[..., Any]] = None
+        if surface is not None:
+            # Cubes are indexed by the underlying swap tenor as well.
+            self.cube = getattr(surface, "swaption_vol", None)
+            getter = getattr(surface, "__call__", None) or getattr(surface, "vol", None)
+            if callable(getter):
+                self.smile = getter
+            elif getter is not None:
+                flat_vol = getter
+        self.flat_vol = ad.as_number(flat_vol)
+
+        # SABR smiles report their own parameters; otherwise echo market data.
+        sabr_parameters = getattr(surface, "sabr_parameters", None)
+        if sabr_parameters is None:
+            sabr_parameters = {
+                "alpha": market.data.get("sabr_alpha"),
+                "beta": market.data.get("sabr_beta"),
+                "rho": market.data.get("sabr_rho"),
+                "nu": market.data.get("sabr_nu"),
+            }
+        self.sabr_parameters = sabr_parameters
+
+    def volatility(
+        self, expiry: float, strike: float, forward: float, tenor: Optional[float] = None
+    ) -> float:
+        if self.cube is not None and tenor is not None:
+            return ad.as_number(self.cube(expiry, tenor, strike, forward))
+        if self.smile is not None:
+            return ad.as_number(self.smile(expiry, strike, forward))
+        return self.flat_vol
+
+    def evaluate(self, instrument: Swaption, as_of=None) -> Measures:
+        return Measures(SWAPTION_MEASURES, self, instrument, as_of)
+
+    def price_many(self, instruments: Sequence[Swaption], as_of=None) -> List[Dict[str, Any]]:
+        """Price a batch of swaptions with one vectorised kernel call.
+
+        The underlying swaps go through :meth:`SwapPlan.price_many
+        <qfinlib.pricing.pricers.rates.swap.SwapPlan.price_many>` and the
+        expiry discount factors through the shared discount table. The
+        Black or Bachelier greeks of the whole batch then come from one
+        ``*_greeks_many`` call. Vol lookups stay per trade, since surfaces
+        are arbitrary callables. Without NumPy, or on a differentiable
+        market, swaptions are priced one by one.
+        """
+
+        np = backend.np
+        if np is None or getattr(self.market, "seeded", False):
+            return super().price_many(instruments, as_of)
+
+        self.refresh_tables()
+        pricer = self.pricer
+        swaps = self.swaps.price_many([s.swap for s in instruments], as_of)
+        expiries = [
+            pricer._expiry_in_years(s.expiry, as_of=as_of, market=self.market) for s in instruments
+        ]
+        forwards = [data.get("par_rate", 0.0) for data in swaps]
+        annuities = [data.get("annuity", 0.0) or 1.0 for data in swaps]
+        strikes = [s.resolved_strike for s in instruments]
+        tenors = [pricer._tenor(s, e) for s, e in zip(instruments, expiries)]
+        quotes = list(zip(expiries, strikes, forwards, tenors))
+        vols = [self.volatility(e, k, f, t) for e, k, f, t in quotes]
+        atm_vols = [self.volatility(e, f, f, t) for e, _, f, t in quotes]
+        table = self.table
+        if table is not None:
+            discounts = table.factors(table.extend(expiries))
+        else:
+            discounts = [self.discount_factor(e) for e in expiries]
+
+        kernel = bachelier_greeks_many if pricer.model == "bachelier" else black_greeks_many
+        calls = [s.is_payer for s in instruments]
+        greeks = kernel(forwards, strikes, vols, expiries, calls, discounts)
+        scale = np.asarray(annuities, dtype=float)
+        price, delta, gamma, vega, theta = ((np.asarray(g) * scale).tolist() for g in greeks)
+
+        return [
+            {
+                "pv": price[i],
+                "delta": delta[i],
+                "gamma": gamma[i],
+                "vega": vega[i],
+                "theta": theta[i],
+                "forward": forwards[i],
+                "strike": strikes[i],
+                "volatility": vols[i],
+                "annuity": annuities[i],
+                "implied_vol_at_strike": vols[i],
+                "implied_vol_atm": atm_vols[i],
+                "sabr_parameters": self.sabr_parameters,
+                "swap_metrics": swaps[i],
+            }
+            for i in range(len(swaps))
+        ]
+
+
+def _greeks(r: Measures) -> Any:
+    plan, instrument = r.plan, r.instrument
+    expiry = r["_expiry"]
+    greeks = plan.pricer._option_greeks(
+        forward=r["forward"],
+        strike=r["strike"],
+        vol=r["volatility"],
+        expiry=expiry,
+        call=instrument.is_payer,
+        discount=plan.discount_factor(expiry),
+    )
+    # Scale results by the swap annuity
+    annuity = r["annuity"]
+    return tuple(greek * annuity for greek in greeks)
+
+
+#: Measures of :meth:`SwaptionPlan.evaluate`, in result order.
+SWAPTION_MEASURES: MeasureTable = {
+    "_expiry": lambda r: r.plan.pricer._expiry_in_years(
+        r.instrument.expiry, as_of=r.as_of, market=r.plan.market
+    ),
+    "_swap": lambda r: r.plan.swaps.evaluate(r.instrument.swap, r.as_of),
+    "_tenor": lambda r: r.plan.pricer._tenor(r.instrument, r["_expiry"]),
+    "_greeks": _greeks,
+    "pv": lambda r: r["_greeks"][0],
+    "delta": lambda r: r["_greeks"][1],
+    "gamma": lambda r: r["_greeks"][2],
+    "vega": lambda r: r["_greeks"][3],
+    "theta": lambda r: r["_greeks"][4],
+    "forward": lambda r: r["_swap"].get("par_rate", 0.0),
+    "strike": lambda r: r.instrument.resolved_strike,
+    "volatility": lambda r: r.plan.volatility(r["_expiry"], r["strike"], r["forward"], r["_tenor"]),
+    "annuity": lambda r: r["_swap"].get("annuity", 0.0) or 1.0,
+    "implied_vol_at_strike": lambda r: r["volatility"],
+    "implied_vol_atm": lambda r: r.plan.volatility(
+        r["_expiry"], r["forward"], r["forward"], r["_tenor"]
+    ),
+    "sabr_parameters": lambda r: r.plan.sabr_parameters,
+    "swap_metrics": lambda r: dict(r["_swap"]),
+}
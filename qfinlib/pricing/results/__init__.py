@@ -1 +1,5 @@
 """Valuation results module."""
+
+from qfinlib.pricing.results.measures import Measures
+
+__all__ = ["Measures"]
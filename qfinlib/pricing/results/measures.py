@@ -0,0 +1,115 @@
+"""Lazily computed pricing measures.
+
+A :class:`Measures` result maps measure names to values like the plain dict
+pricers return, but computes each value on first access. Pricing plans
+describe their measures as a table of functions of the result itself, so a
+measure reads the intermediates it shares with others (cashflow schedules,
+discount factors, greeks) through the result, and every entry is computed
+at most once. Entries whose names start with ``_`` are such intermediates
+and are hidden from iteration.
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+MeasureTable = Dict[str, Callable[["Measures"], Any]]
+
+
+class Measures(Mapping):
+    """Pricing result computing each measure on first access.
+
+    Parameters
+    ----------
+    table:
+        Measure and intermediate names mapped to functions of this result.
+    plan:
+        The pricing plan evaluating the instrument.
+    instrument:
+        The instrument being priced.
+    as_of:
+        Valuation date passed to the plan.
+    names:
+        Measures exposed by iteration; every public entry of ``table`` by
+        default. Any entry of ``table`` can still be read by name.
+    """
+
+    __slots__ = ("table", "plan", "instrument", "as_of", "names", "_values")
+
+    def __init__(
+        self,
+        table: MeasureTable,
+        plan: Any = None,
+        instrument: Any = None,
+        as_of: Any = None,
+        names: Optional[Tuple[str, ...]] = None,
+    ):
+        self.table = table
+        self.plan = plan
+        self.instrument = instrument
+        self.as_of = as_of
+        self.names = tuple(n for n in table if n[0] != "_") if names is None else names
+        self._values: Dict[str, Any] = {}
+
+    @classmethod
+    def of(cls, values: Dict[str, Any]) -> "Measures":
+        """Already computed ``values`` as a result."""
+
+        result = cls({name: _missing for name in values})
+        result._values.update(values)
+        return result
+
+    def __getitem__(self, name: str) -> Any:
+        values = self._values
+        if name in values:
+            return values[name]
+        value = values[name] = self.table[name](self)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.names
+
+    def set(self, name: str, value: Any) -> None:
+        """Record an intermediate the plan already has at hand."""
+
+        self._values[name] = value
+
+    def select(self, measures: Iterable[str]) -> "Measures":
+        """View exposing only ``measures``, sharing every value computed so far.
+
+        Raises
+        ------
+        ValueError
+            For names that are not measures of this result.
+        """
+
+        names = tuple(measures)
+        unknown = [name for name in names if name not in self.table or name[0] == "_"]
+        if unknown:
+            raise ValueError(f"Unknown measures: {', '.join(map(str, unknown))}")
+        view = Measures(self.table, self.plan, self.instrument, self.as_of, names)
+        view._values = self._values
+        return view
+
+    @property
+    def computed(self) -> Tuple[str, ...]:
+        """Names of the measures and intermediates evaluated so far."""
+
+        return tuple(self._values)
+
+    def __repr__(self) -> str:  # pragma: no cover - representation aid
+        shown = ", ".join(
+            f"{name}={self._values[name]!r}" if name in self._values else f"{name}=..."
+            for name in self.names
+        )
+        return f"Measures({shown})"
+
+
+def _missing(result: Measures) -> Any:  # pragma: no cover - values are always preset
+    raise KeyError("measure was not computed")
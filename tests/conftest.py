@@ -1 +1,64 @@
 """Pytest configuration and fixtures."""
+
+from datetime import date
+
+import pytest
+
+from qfinlib.instruments.bond.bond import Bond
+from qfinlib.instruments.rates.swap.irs import Swap
+
+
+@pytest.fixture
+def make_bond():
+    """Factory of USD bonds with face 100 maturing on March 15 of ``2024 + years``.
+
+    Keyword arguments go to :class:`Bond`; ``frequency`` sets the coupon
+    frequency (semi-annual by default).
+    """
+
+    def make(years, coupon, frequency=2, **kwargs):
+        return Bond(
+            face_value=100.0,
+            currency_code="USD",
+            coupon_rate=coupon,
+            coupon_frequency=frequency,
+            maturity_date=date(2024 + years, 3, 15),
+            **kwargs,
+        )
+
+    return make
+
+
+@pytest.fixture
+def make_swap():
+    """Factory of vanilla USD swaps.
+
+    ``years`` gives annual fixed and semi-annual floating payments; explicit
+    payment times override either leg. Other keyword arguments go to
+    :meth:`Swap.from_generator`.
+    """
+
+    def make(
+        years=None,
+        fixed_rate=0.025,
+        payment_times_fixed=None,
+        payment_times_float=None,
+        notional=1_000_000,
+        **kwargs,
+    ):
+        if payment_times_fixed is None:
+            payment_times_fixed = [float(k) for k in range(1, years + 1)]
+        if payment_times_float is None:
+            payment_times_float = [k / 2 for k in range(1, 2 * years + 1)]
+        return Swap.from_generator(
+            "vanilla",
+            notional=notional,
+            currency="USD",
+            fixed_rate=fixed_rate,
+            float_forward_curve=None,
+            payment_times_fixed=payment_times_fixed,
+            payment_times_float=payment_times_float,
+            **kwargs,
+        )
+
+    return make
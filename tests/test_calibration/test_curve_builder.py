@@ -0,0 +1,167 @@
+"""Tests for curve bootstrapping through CurveBuilder."""
+
+import math
+
+import pytest
+
+from qfinlib.calibration.curve.builder import CurveBuilder, CurveSpec
+from qfinlib.calibration.curve.engine import CalibrationContext
+from qfinlib.market.container import MarketContainer
+from qfinlib.market.curve import DiscountCurve, FrozenCurve, SpreadCurve
+
+
+@pytest.mark.parametrize("interpolation", ["log_linear", "monotone"])
+def test_discount_curve_reprices_par_swaps(interpolation):
+    quotes = [
+        {"type": "deposit", "pillar": 0.25, "quote": 0.020, "name": "3M"},
+        {"type": "fra", "start": 0.25, "pillar": 0.5, "quote": 0.021, "name": "3x6"},
+        {"pillar": 1.5, "quote": 0.023, "frequency": 2, "name": "18M"},
+        {"pillar": 2.0, "quote": 0.024, "frequency": 2, "name": "2Y"},
+        {"pillar": 5.0, "quote": 0.027, "frequency": 2, "name": "5Y"},
+        {"pillar": 10.0, "quote": 0.030, "frequency": 2, "name": "10Y"},
+    ]
+    builder = CurveBuilder(MarketContainer())
+    curve = builder.build_discount_curve("USD", quotes, interpolation=interpolation)
+
+    report = curve.metadata["calibration"]
+    assert report.converged
+    assert report.pillars == [0.25, 0.5, 1.5, 2.0, 5.0, 10.0]
+    assert all(count > 0 for count in report.iterations)
+    assert report.build_time >= 0.0
+    context = CalibrationContext(curve)
+    for instrument in builder._calibration_instruments(quotes, "discount"):
+        assert math.isclose(instrument.implied_quote(context), instrument.quote, abs_tol=1e-12)
+
+
+def test_forward_curve_is_bootstrapped_against_discount_curve():
+    market = MarketContainer()
+    builder = CurveBuilder(market)
+    discount = builder.build_discount_curve("USD", [(1.0, 0.02), (5.0, 0.025), (10.0, 0.03)])
+    market.add_curve("discount_curve", discount)
+    quotes = [
+        {"type": "deposit", "pillar": 0.25, "quote": 0.025},
+        {"type": "future", "start": 0.25, "pillar": 0.5, "quote": 97.3},
+        {"pillar": 3.0, "quote": 0.028, "float_frequency": 4},
+        {"pillar": 7.0, "quote": 0.032, "float_frequency": 4},
+    ]
+
+    forward = builder.build_forward_curve("USD", "libor3m", quotes)
+
+    assert forward.pillars == [0.0, 0.25, 2.75, 6.75]
+    assert forward.forward_rate(0.25) == pytest.approx(0.027)
+    context = CalibrationContext(discount, projection=forward)
+    for instrument in builder._calibration_instruments(quotes, "libor3m"):
+        assert instrument.implied_quote(context) == pytest.approx(instrument.quote, abs=1e-10)
+
+
+def test_coupled_curves_are_solved_jointly():
+    # The discount curve's long end is pinned by basis swaps against the
+    # projection curve it discounts, so neither can be bootstrapped first.
+    ois = [
+        {"pillar": 1.0, "quote": 0.020, "name": "1Y"},
+        {"pillar": 2.0, "quote": 0.022, "name": "2Y"},
+        {"type": "basis", "pillar": 5.0, "quote": 0.002, "other": "libor3m", "name": "5Y"},
+        {"type": "basis", "pillar": 10.0, "quote": 0.0025, "other": "libor3m", "name": "10Y"},
+    ]
+    libor = [
+        {"type": "deposit", "pillar": 0.25, "quote": 0.024},
+        {"pillar": 2.0, "quote": 0.025, "float_frequency": 4},
+        {"pillar": 5.0, "quote": 0.027, "float_frequency": 4},
+        {"pillar": 10.0, "quote": 0.029, "float_frequency": 4},
+    ]
+    specs = [
+        CurveSpec("ois", ois),
+        CurveSpec("libor3m", libor, kind="forward", discount_curve="ois"),
+    ]
+    builder = CurveBuilder(MarketContainer())
+
+    with pytest.raises(ValueError, match="cyclic"):
+        builder.build_curves(specs, method="bootstrap")
+    curves = builder.build_curves(specs)
+
+    for name, curve in curves.items():
+        report = curve.metadata["calibration"]
+        assert report.method == "newton"
+        assert report.converged
+        assert report.passes <= 6
+    contexts = {
+        "ois": CalibrationContext(curves["ois"], curves=curves),
+        "libor3m": CalibrationContext(curves["ois"], projection=curves["libor3m"], curves=curves),
+    }
+    for spec in specs:
+        for instrument in builder._calibration_instruments(spec.instruments, spec.name):
+            implied = instrument.implied_quote(contexts[spec.name])
+            assert implied == pytest.approx(instrument.quote, abs=1e-11)
+
+
+def test_recalibration_is_warm_started_from_previous_solve():
+    quotes = [
+        {"type": "deposit", "pillar": 0.5, "quote": 0.020, "name": "6M"},
+        {"pillar": 2.0, "quote": 0.024, "frequency": 2, "name": "2Y"},
+        {"pillar": 5.0, "quote": 0.027, "frequency": 2, "name": "5Y"},
+        {"pillar": 10.0, "quote": 0.030, "frequency": 2, "name": "10Y"},
+    ]
+    builder = CurveBuilder(MarketContainer())
+    curve = builder.build_discount_curve("USD", quotes)
+
+    builder.recalibrate(curve, {"5Y": 0.0271})
+    report = curve.metadata["calibration"]
+    assert report.method == "warm_start"
+    assert report.converged
+    assert curve.market_data["5Y"] == 0.0271
+
+    moved = [dict(q, quote=0.0271) if q["name"] == "5Y" else q for q in quotes]
+    fresh = builder.build_discount_curve("USD", moved)
+    assert curve.values == pytest.approx(fresh.values, abs=1e-12)
+
+    builder.recalibrate(curve, {"5Y": 0.06, "10Y": 0.01})
+    assert curve.metadata["calibration"].converged
+    context = CalibrationContext(curve)
+    for instrument in builder._calibration_instruments(quotes, "discount"):
+        implied = instrument.implied_quote(context)
+        assert implied == pytest.approx(curve.market_data[instrument.name], abs=1e-12)
+
+
+@pytest.mark.parametrize("executor", ["serial", "thread", "process"])
+def test_build_many_orders_builds_by_dependency(executor):
+    specs = []
+    for ccy, level in (("USD", 0.03), ("EUR", 0.01)):
+        ois = [{"pillar": t, "quote": level + 0.001 * t, "name": f"{t}Y"} for t in (1, 2, 5)]
+        libor = [
+            {"type": "deposit", "pillar": 0.25, "quote": level + 0.002},
+            {"pillar": 2.0, "quote": level + 0.004, "float_frequency": 4},
+            {"pillar": 5.0, "quote": level + 0.007, "float_frequency": 4},
+        ]
+        # Listed before its discount curve on purpose.
+        specs.append(CurveSpec(f"{ccy}_3m", libor, kind="forward", discount_curve=f"{ccy}_ois"))
+        specs.append(CurveSpec(f"{ccy}_ois", ois, currency=ccy))
+    builder = CurveBuilder(MarketContainer())
+
+    curves = builder.build_many(specs, executor=executor, max_workers=2)
+
+    assert list(curves) == [spec.name for spec in specs]
+    expected = builder.build_curves(specs[:2], method="bootstrap")
+    for name, curve in expected.items():
+        frozen = curves[name]
+        assert isinstance(frozen, FrozenCurve)
+        assert list(frozen.values) == pytest.approx(curve.values, abs=1e-14)
+        assert frozen.metadata["calibration"].converged
+        assert frozen.metadata["calibration"].state is None
+
+
+@pytest.mark.parametrize("executor", ["serial", "thread"])
+def test_build_many_accepts_spread_discount_curves_from_the_market(executor):
+    market = MarketContainer()
+    base = DiscountCurve([1.0, 5.0], zero_rates=[0.03, 0.035])
+    market.add_curve("USD_ois", SpreadCurve(base, [1.0, 5.0], [0.001, 0.002]))
+    libor = [
+        {"type": "deposit", "pillar": 0.25, "quote": 0.032},
+        {"pillar": 2.0, "quote": 0.034, "float_frequency": 4},
+    ]
+    spec = CurveSpec("USD_3m", libor, kind="forward", discount_curve="USD_ois")
+    builder = CurveBuilder(market)
+
+    curves = builder.build_many([spec], executor=executor)
+
+    expected = builder.build_curves([spec], method="bootstrap")["USD_3m"]
+    assert list(curves["USD_3m"].values) == pytest.approx(expected.values, abs=1e-14)
@@ -0,0 +1,46 @@
+"""Tests for SABR smile calibration."""
+
+import pytest
+
+from qfinlib.calibration.vol import SABRCalibrator, SABRQuote
+from qfinlib.market.irvol import SABRSmile
+from qfinlib.pricing.models.vol import sabr_vol, sabr_vols
+
+
+def _quote(smile):
+    strikes = [smile.forward + d for d in (-0.01, -0.005, 0.0, 0.005, 0.01, 0.02)]
+    return SABRQuote(smile.expiry, smile.tenor, smile.forward, strikes, list(smile.vols(strikes)))
+
+
+def test_batch_smile_matches_scalar_formula():
+    strikes = [0.01, 0.02, 0.03, 0.03 + 1e-12, 0.05]
+    batch = sabr_vols(0.03, strikes, 5.0, 0.02, 0.5, -0.3, 0.4)
+    assert list(batch) == [sabr_vol(0.03, k, 5.0, 0.02, 0.5, -0.3, 0.4) for k in strikes]
+
+    strikes = [0.005 * i for i in range(1, 21)] + [0.03 + 1e-12]
+    expected = [sabr_vol(0.03, k, 5.0, 0.02, 0.5, -0.3, 0.4) for k in strikes]
+    assert list(sabr_vols(0.03, strikes, 5.0, 0.02, 0.5, -0.3, 0.4)) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("executor", ["serial", "thread"])
+def test_cube_calibration_recovers_parameters(executor):
+    truth = {}
+    for i, expiry in enumerate((0.5, 1.0, 2.0, 5.0)):
+        for j, tenor in enumerate((2.0, 10.0)):
+            forward = 0.025 + 0.002 * j
+            smile = SABRSmile(expiry, tenor, forward, 0.02 + 0.001 * i, 0.5, -0.4 + 0.1 * j, 0.5)
+            truth[(expiry, tenor)] = smile
+    quotes = [_quote(smile) for smile in truth.values()]
+    calibrator = SABRCalibrator(beta=0.5)
+
+    cube = calibrator.calibrate_cube(quotes, executor=executor)
+    warm = calibrator.calibrate_cube(quotes, previous=cube, executor=executor)
+
+    assert set(cube) == set(truth)
+    for key, smile in truth.items():
+        for fitted in (cube[key], warm[key]):
+            assert fitted.alpha == pytest.approx(smile.alpha, rel=1e-6)
+            assert fitted.rho == pytest.approx(smile.rho, abs=1e-6)
+            assert fitted.nu == pytest.approx(smile.nu, rel=1e-6)
+            assert fitted.error < 1e-8
+            assert fitted.converged
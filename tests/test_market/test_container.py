@@ -2,6 +2,8 @@
 
 from datetime import date
 
+import pytest
+
 from qfinlib.market.container import MarketContainer
 
 
@@ -23,3 +25,46 @@ def test_add_and_get_surface_and_repr():
     assert "MarketContainer" in representation
     assert "0 curves" in representation
     assert "1 surfaces" in representation
+
+
+def test_discount_table_is_shared_and_repriced_on_curve_changes():
+    from qfinlib.market.curve import DiscountCurve
+
+    curve = DiscountCurve(
+        pillars=[0.5, 1.0, 2.0, 5.0],
+        zero_rates=[0.01, 0.015, 0.02, 0.025],
+        instruments=["6M", "1Y", "2Y", "5Y"],
+    )
+    container = MarketContainer()
+    container.add_curve("ois", curve)
+    container.add_curve("quotes", {"1Y": 0.02})
+
+    table = container.discount_table("ois")
+    slots = table.extend([0.25, 1.5, 0.25, 3.0])
+    assert slots == [0, 1, 0, 2]
+    assert table.factors(slots) == [curve.discount_factor(t) for t in (0.25, 1.5, 0.25, 3.0)]
+    assert container.discount_table("ois") is table
+    assert container.discount_table("quotes") is None
+
+    curve.update_market_quotes({"2Y": 0.03})
+    assert container.discount_table("ois") is table
+    assert table.discount_factor(1.5) == curve.discount_factor(1.5)
+
+    container.add_curve("ois", curve.on_grid([1.0]).curve)
+    assert container.discount_table("ois") is not table
+
+
+def test_spread_curve_table_is_repriced_when_its_base_curve_changes():
+    from qfinlib.market.curve import DiscountCurve, SpreadCurve
+
+    ois = DiscountCurve([1.0, 5.0], zero_rates=[0.015, 0.02], instruments=["1Y", "5Y"])
+    issuer = SpreadCurve(ois, pillars=[1.0, 5.0], spreads=[0.004, 0.006])
+    container = MarketContainer()
+    container.add_curve("iss", issuer)
+    first = container.discount_table("iss").discount_factor(3.0)
+    assert first == pytest.approx(issuer.discount_factor(3.0), rel=1e-15)
+
+    ois.update_market_quotes({"5Y": 0.05})
+
+    table = container.discount_table("iss")
+    assert table.discount_factor(3.0) == pytest.approx(issuer.discount_factor(3.0), rel=1e-15)
@@ -0,0 +1,149 @@
+"""Unit tests for curve objects."""
+
+from __future__ import annotations
+
+import math
+import pickle
+
+import pytest
+
+from qfinlib.market.curve import Curve, DiscountCurve, ForwardCurve, SpreadCurve
+
+
+def test_curve_refits_after_quote_update_and_node_insertion():
+    curve = Curve(pillars=[1.0, 2.0, 3.0], values=[0.01, 0.02, 0.03], instruments=["a", "b", "c"])
+    assert math.isclose(curve.value(1.5), 0.015)
+
+    curve.update_market_quotes({"b": 0.04})
+    assert math.isclose(curve.value(1.5), 0.025)
+
+    curve.add_node(1.5, 0.0, "d")
+    assert curve.value(1.5) == 0.0
+    assert curve.instruments == ["a", "d", "b", "c"]
+
+
+def test_discount_curve_discount_factor():
+    curve = DiscountCurve(pillars=[1.0, 5.0], zero_rates=[0.02, 0.03])
+
+    assert math.isclose(curve.discount_factor(1.0), math.exp(-0.02))
+    assert math.isclose(curve.discount_factor(3.0), math.exp(-curve.zero_rate(3.0) * 3.0))
+
+
+def test_batch_evaluation_matches_scalar_path():
+    pillars = [0.5, 1.0, 2.0, 5.0, 10.0, 30.0]
+    rates = [0.010, 0.012, 0.015, 0.021, 0.025, 0.027]
+    times = [0.0, 0.25, 0.5, 0.75, 1.9, 4.2, 10.0, 17.3, 30.0, 40.0]
+
+    discount = DiscountCurve(pillars=pillars, zero_rates=rates)
+    forward = ForwardCurve(pillars=pillars, forward_rates=rates, extrapolation="linear")
+    spread = SpreadCurve(discount, spreads=[0.001] * len(pillars))
+
+    assert list(discount.zero_rates(times)) == [discount.zero_rate(t) for t in times]
+    assert list(discount.discount_factors(times)) == [discount.discount_factor(t) for t in times]
+    assert list(forward.forward_rates(times)) == [forward.forward_rate(t) for t in times]
+    assert list(spread.discount_factors(times)) == [spread.discount_factor(t) for t in times]
+
+
+def test_bumped_views_match_rebuilt_curves_without_copying_nodes():
+    pillars = [1.0, 2.0, 5.0, 10.0]
+    rates = [0.01, 0.015, 0.02, 0.025]
+    curve = DiscountCurve(pillars=pillars, zero_rates=rates, instruments=["1Y", "2Y", "5Y", "10Y"])
+
+    parallel = curve.bumped(0.0001)
+    single = curve.bumped(0.0001, pillar="5Y")
+    bucketed = curve.bumped(shifts=[0.0, 0.0002, 0.0, -0.0001])
+
+    assert isinstance(parallel, DiscountCurve)
+    assert parallel.pillars is curve.pillars
+    for view, shifted in (
+        (parallel, [r + 0.0001 for r in rates]),
+        (single, [0.01, 0.015, 0.0201, 0.025]),
+        (bucketed, [0.01, 0.0152, 0.02, 0.0249]),
+    ):
+        rebuilt = DiscountCurve(pillars=pillars, zero_rates=list(view.values))
+        for expected, value in zip(shifted, view.values):
+            assert math.isclose(expected, value, rel_tol=1e-12)
+        for t in (0.5, 3.0, 7.5, 12.0):
+            assert view.discount_factor(t) == rebuilt.discount_factor(t)
+    assert curve.values == rates
+
+    with pytest.raises(TypeError):
+        parallel.update_market_quotes({"1Y": 0.0})
+
+    # A node inserted ahead of the bumped one leaves the bump on "5Y".
+    curve.add_node(0.5, 0.005, "6M")
+    assert list(single.values) == pytest.approx([0.005, 0.01, 0.015, 0.0201, 0.025], rel=1e-12)
+    with pytest.raises(ValueError):
+        list(bucketed.values)
+
+
+def test_frozen_curve_round_trip_and_content_hash():
+    curve = DiscountCurve(
+        pillars=[1.0, 2.0, 5.0],
+        zero_rates=[0.01, 0.015, 0.02],
+        instruments=["1Y", "2Y", "5Y"],
+        metadata={"currency": "USD"},
+    )
+    frozen = curve.freeze()
+    same = DiscountCurve(
+        pillars=[5.0, 1.0, 2.0], zero_rates=[0.02, 0.01, 0.015], instruments=["5Y", "1Y", "2Y"]
+    ).freeze()
+
+    assert frozen == same and hash(frozen) == hash(same)
+    assert frozen != curve.bumped(0.0001).freeze()
+    assert pickle.loads(pickle.dumps(frozen)).content_hash == frozen.content_hash
+    assert frozen.value(3.0) == curve.value(3.0)
+    with pytest.raises(AttributeError):
+        frozen.values = []
+
+    restored = frozen.to_curve()
+    assert isinstance(restored, DiscountCurve)
+    assert restored.discount_factor(3.0) == curve.discount_factor(3.0)
+    assert restored.metadata == {"currency": "USD"}
+
+
+def test_quote_updates_patch_in_place_and_report_changed_segments():
+    curve = Curve(
+        pillars=[1.0, 2.0, 3.0, 4.0, 5.0],
+        values=[0.01, 0.02, 0.03, 0.04, 0.05],
+        instruments=["1Y", "2Y", "3Y", "4Y", "5Y"],
+    )
+    values = curve.values
+    curve.value(2.5)
+    version = curve.version
+
+    curve.update_market_quotes({"3Y": 0.035, "unknown": 1.0})
+
+    assert curve.values is values
+    assert curve.changed_range(version) == (2.0, 4.0)
+    assert curve.changed_range(curve.version) is None
+    assert math.isclose(curve.value(2.5), 0.0275)
+    assert curve.market_data == {"3Y": 0.035, "unknown": 1.0}
+
+    version = curve.version
+    curve.add_node(0.5, 0.005, "6M")
+    assert curve.pillars == [0.5, 1.0, 2.0, 3.0, 4.0, 5.0]
+    assert curve.changed_range(version) == (-math.inf, 1.0)
+
+
+def test_compiled_spread_chain_matches_nested_evaluation():
+    ois = DiscountCurve(
+        pillars=[0.5, 1.0, 2.0, 5.0, 10.0], zero_rates=[0.01, 0.012, 0.015, 0.02, 0.022]
+    )
+    govt = SpreadCurve(
+        ois, pillars=[1.0, 3.0, 7.0], spreads=[0.001, 0.002, 0.0025], instruments=["1Y", "3Y", "7Y"]
+    )
+    issuer = SpreadCurve(govt, pillars=[2.0, 4.0], spreads=[0.005, 0.007], instruments=["2Y", "4Y"])
+
+    compiled = issuer.compile()
+
+    ts = [0.0, 0.25, 0.75, 1.5, 2.0, 3.3, 6.0, 9.9, 12.0]
+    for t in ts:
+        assert compiled.value(t) == issuer.value(t)
+        assert compiled.zero_rate(t) == issuer.zero_rate(t)
+        assert compiled.discount_factor(t) == issuer.discount_factor(t)
+    assert list(compiled.discount_factors(ts)) == [issuer.discount_factor(t) for t in ts]
+    assert list(compiled.values_at(ts)) == [issuer.value(t) for t in ts]
+
+    govt.update_market_quotes({"3Y": 0.004})
+    assert compiled.discount_factor(3.3) == issuer.discount_factor(3.3)
@@ -0,0 +1,51 @@
+"""Tests for the swaption volatility cube."""
+
+import pytest
+
+from qfinlib.instruments.rates.option.swaption import Swaption
+from qfinlib.market.container import MarketContainer
+from qfinlib.market.irvol import SABRSmile, SwaptionVolCube
+from qfinlib.pricing.pricers.rates.swaption import SwaptionPricer
+
+
+def _linear(e, t, k):
+    return 0.2 + 0.01 * e + 0.002 * t + 0.5 * k
+
+
+def _cube(**kwargs):
+    expiries, tenors, strikes = [1.0, 2.0, 5.0], [2.0, 10.0], [-0.01, 0.0, 0.01]
+    vols = [[[_linear(e, t, k) for k in strikes] for t in tenors] for e in expiries]
+    return SwaptionVolCube(expiries, tenors, strikes, vols, **kwargs)
+
+
+def test_lookup_interpolates_and_extrapolates_flat():
+    cube = _cube()
+
+    assert cube.vol(2.0, 10.0, 0.0) == pytest.approx(_linear(2.0, 10.0, 0.0))
+    assert cube.vol(3.5, 6.0, 0.004) == pytest.approx(_linear(3.5, 6.0, 0.004))
+    assert cube.vol(10.0, 30.0, 0.05) == pytest.approx(_linear(5.0, 10.0, 0.01))
+    assert cube.vol(0.5, 1.0, -0.05) == pytest.approx(_linear(1.0, 2.0, -0.01))
+
+    expiries, tenors, strikes = [1.5, 3.5, 1.5], [6.0, 6.0, 2.0], [0.0, 0.004, -0.002]
+    batch = cube.vols(expiries, tenors, strikes)
+    assert list(batch) == [cube.vol(e, t, k) for e, t, k in zip(expiries, tenors, strikes)]
+    assert (1.5, 6.0) in cube._smiles and len(cube._smiles) == 6
+
+
+def test_cube_from_smiles_feeds_swaption_pricer(make_swap):
+    smiles = {
+        (e, t): SABRSmile(e, t, 0.03, 0.02, 0.5, -0.3, 0.4) for e in (1.0, 2.0) for t in (2.0, 5.0)
+    }
+    cube = SwaptionVolCube.from_smiles(smiles, [-0.01, -0.005, 0.0, 0.005, 0.01])
+    assert cube.moneyness
+    assert cube.vol(1.0, 2.0, 0.035, forward=0.03) == pytest.approx(smiles[1.0, 2.0].vol(0.035))
+
+    market = MarketContainer()
+    market.data.update({"forward_rate": 0.03, "discount_rate": 0.02})
+    market.add_surface("swaption_vol", cube)
+    times = [2.0, 3.0, 4.0]
+    swap = make_swap(
+        fixed_rate=0.03, payment_times_fixed=times, payment_times_float=times, notional=1.0
+    )
+    result = SwaptionPricer().price(Swaption(swap=swap, expiry=1.0), market)
+    assert result["volatility"] == cube.vol(1.0, 3.0, 0.03, 0.03)
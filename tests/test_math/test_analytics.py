@@ -0,0 +1,100 @@
+"""Tests for the normal distribution and option pricing kernels."""
+
+import math
+
+import pytest
+
+from qfinlib.math.ad import Dual
+from qfinlib.math.analytics import (
+    bachelier_greeks,
+    bachelier_greeks_many,
+    bachelier_price,
+    black_greeks,
+    black_greeks_many,
+    black_price,
+    black_price_many,
+    bachelier_price_many,
+    implied_bachelier_vol,
+    implied_bachelier_vol_many,
+    implied_black_vol,
+    implied_black_vol_many,
+)
+from qfinlib.math.stats import norm_cdf, norm_cdf_many, norm_ppf, norm_ppf_many
+
+
+def test_normal_batch_and_inverse():
+    xs = [-6.0, -1.5, 0.0, 0.3, 2.5]
+    assert list(norm_cdf_many(xs)) == [norm_cdf(x) for x in xs]
+    for p in (1e-12, 0.025, 0.5, 0.9, 1 - 1e-9):
+        assert norm_cdf(norm_ppf(p)) == pytest.approx(p, rel=1e-9)
+    assert list(norm_ppf_many([0.5, 0.975])) == [0.0, norm_ppf(0.975)]
+    # Long enough for the array kernels when NumPy is installed.
+    grid = [i / 4000.0 for i in range(-24000, 24001)]
+    assert list(norm_cdf_many(grid)) == pytest.approx([norm_cdf(x) for x in grid], rel=1e-14)
+    ps = [i / 2001.0 for i in range(1, 2001)] + [1e-300, 1 - 1e-16]
+    assert list(norm_ppf_many(ps)) == pytest.approx([norm_ppf(p) for p in ps], rel=1e-14)
+    with pytest.raises(ValueError):
+        norm_ppf(1.0)
+
+
+@pytest.mark.parametrize(
+    "scalar, many", [(black_greeks, black_greeks_many), (bachelier_greeks, bachelier_greeks_many)]
+)
+def test_batch_kernels_match_scalar_kernels(scalar, many):
+    strikes = [0.01, 0.02, 0.03, 0.04, 0.06]
+    vols = [0.2, 0.0, 0.3, 0.25, 0.4] if scalar is black_greeks else [0.01, 0.0, 0.008, 0.01, 0.012]
+    calls = [True, False, True, False, True]
+
+    greeks = many(0.03, strikes, vols, 2.0, calls, 0.95)
+
+    for i, (k, v, c) in enumerate(zip(strikes, vols, calls)):
+        expected = scalar(0.03, k, v, 2.0, c, 0.95)
+        assert tuple(float(g[i]) for g in greeks) == pytest.approx(expected, rel=1e-14)
+
+
+def test_put_call_parity_and_vega_by_dual():
+    for price in (black_price, bachelier_price):
+        vol = 0.2 if price is black_price else 0.01
+        parity = price(0.03, 0.025, vol, 3.0, True, 0.9) - price(0.03, 0.025, vol, 3.0, False, 0.9)
+        assert parity == pytest.approx(0.9 * 0.005, rel=1e-12)
+
+    dual = black_price(0.03, 0.025, Dual.variable(0.2, "vol"), 3.0, True, 0.9)
+    assert dual.derivative("vol") == pytest.approx(
+        black_greeks(0.03, 0.025, 0.2, 3.0, True, 0.9)[3]
+    )
+    assert bachelier_greeks(0.03, 0.03, 0.01, 1.0)[0] == pytest.approx(
+        0.01 / (2 * 3.14159265) ** 0.5
+    )
+
+
+@pytest.mark.parametrize(
+    "price_many, implied, implied_many, vols",
+    [
+        (black_price_many, implied_black_vol, implied_black_vol_many, [0.1, 0.3, 0.8]),
+        (bachelier_price_many, implied_bachelier_vol, implied_bachelier_vol_many, [4e-3, 1e-2]),
+    ],
+)
+def test_implied_vol_round_trip(price_many, implied, implied_many, vols):
+    strikes = [0.02, 0.027, 0.03, 0.035, 0.045]
+    quotes = [
+        (k, v, t, c) for k in strikes for v in vols for t in (0.5, 10.0) for c in (True, False)
+    ]
+    k, v, t, c = (list(col) for col in zip(*quotes))
+    prices = list(price_many(0.03, k, v, t, c, 0.95))
+
+    solved = implied_many(prices, 0.03, k, t, c, 0.95)
+
+    for i, quote in enumerate(quotes):
+        assert float(solved[i]) == pytest.approx(v[i], rel=1e-7), quote
+        assert float(solved[i]) == pytest.approx(implied(prices[i], 0.03, k[i], t[i], c[i], 0.95))
+
+
+def test_implied_vol_rejects_arbitrage():
+    assert implied_black_vol(0.0, 0.03, 0.035, 1.0) == 0.0
+    assert math.isnan(implied_black_vol(0.004, 0.03, 0.025, 1.0))
+    assert math.isnan(implied_black_vol(0.03, 0.03, 0.025, 1.0))
+    assert math.isnan(implied_bachelier_vol(0.01, 0.03, 0.03, 0.0))
+    flags = [
+        math.isnan(v) for v in implied_black_vol_many([0.003, 0.01], 0.03, [0.025, -0.01], 1.0)
+    ]
+    assert flags == [True, True]
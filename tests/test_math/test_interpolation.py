@@ -4,7 +4,12 @@ from __future__ import annotations
 
 import math
 
-from qfinlib.math.interpolation.log_linear import LogLinearInterpolator
+from qfinlib.math.interpolation import (
+    CubicInterpolator,
+    LinearInterpolator,
+    LogLinearInterpolator,
+    MonotoneInterpolator,
+)
 
 
 def test_log_linear_interpolator_matches_exponential_scaling():
@@ -16,3 +21,40 @@ def test_log_linear_interpolator_matches_exponential_scaling():
 
     expected = math.exp(-0.05 * 0.5)
     assert math.isclose(result, expected, rel_tol=1e-12)
+
+
+def test_fitted_interpolators_match_unfitted_evaluation():
+    x = [0.5, 1.0, 2.0, 5.0, 10.0]
+    y = [0.99, 0.97, 0.94, 0.85, 0.70]
+    queries = [0.0, 0.5, 0.75, 1.0, 3.3, 10.0, 12.0]
+
+    for interp in (
+        LinearInterpolator(),
+        LinearInterpolator("linear"),
+        LogLinearInterpolator("nearest"),
+        LogLinearInterpolator("linear"),
+    ):
+        fitted = interp.fit(x, y)
+        for t in queries:
+            assert fitted(t) == interp(x, y, t)
+
+
+def test_natural_cubic_spline_interpolates_nodes_and_reproduces_lines():
+    spline = CubicInterpolator().fit([0.0, 1.0, 2.5, 4.0, 7.0], [1.0, 3.0, 2.0, 5.0, 4.0])
+    for xi, yi in zip(spline.x, spline.y):
+        assert math.isclose(spline(xi), yi, abs_tol=1e-12)
+    assert spline.curvature[0] == 0.0 and spline.curvature[-1] == 0.0
+
+    line = CubicInterpolator().fit([0.0, 1.0, 3.0, 6.0], [1.0, 3.0, 7.0, 13.0])
+    assert math.isclose(line(4.5), 10.0, rel_tol=1e-12)
+
+
+def test_monotone_interpolator_does_not_overshoot():
+    x = [0.0, 1.0, 2.0, 3.0, 4.0]
+    y = [0.0, 0.1, 0.5, 0.51, 2.0]
+    fitted = MonotoneInterpolator().fit(x, y)
+
+    grid = [i / 100.0 for i in range(401)]
+    values = [fitted(t) for t in grid]
+    assert all(b >= a for a, b in zip(values, values[1:]))
+    assert list(fitted.evaluate_many(grid)) == values
@@ -0,0 +1,97 @@
+"""Tests for the Newton solvers, Brent and their building blocks."""
+
+import math
+
+import pytest
+
+from qfinlib.math import ad
+from qfinlib.math.ad import Dual
+from qfinlib.math.linalg import SingularMatrixError, SparseLU
+from qfinlib.math.solver import brent, levenberg_marquardt, newton, newton_many, newton_system
+
+
+def test_dual_propagates_sparse_derivatives():
+    x = Dual.variable(0.5, "x")
+    y = Dual.variable(2.0, "y")
+    z = ad.exp(x * y) / y + ad.sqrt(y)
+
+    assert z.value == pytest.approx(math.exp(1.0) / 2.0 + math.sqrt(2.0))
+    assert z.derivative("x") == pytest.approx(math.exp(1.0))
+    expected_dy = 0.5 * math.exp(1.0) / 2.0 - math.exp(1.0) / 4.0 + 0.5 / math.sqrt(2.0)
+    assert z.derivative("y") == pytest.approx(expected_dy)
+    assert z.derivative("w") == 0.0
+    assert ad.exp(1.0) == math.exp(1.0)
+
+
+def test_sparse_lu_solves_both_orientations():
+    rows = [{0: 1e-3, 2: 2.0}, {0: 4.0, 1: 1.0}, {1: 3.0, 2: 5.0}]
+    lu = SparseLU(rows)
+    dense = [[row.get(j, 0.0) for j in range(3)] for row in rows]
+    rhs = [1.0, 2.0, 3.0]
+
+    x = lu.solve(rhs)
+    y = lu.solve_transpose(rhs)
+
+    for i in range(3):
+        assert sum(dense[i][j] * x[j] for j in range(3)) == pytest.approx(rhs[i])
+        assert sum(dense[j][i] * y[j] for j in range(3)) == pytest.approx(rhs[i])
+    with pytest.raises(SingularMatrixError):
+        SparseLU([{0: 1.0}, {0: 2.0}])
+
+
+def test_newton_system_converges_quadratically():
+    def residuals(x):
+        return [x[0] * x[0] + x[1] * x[1] - 4.0, ad.exp(x[0]) - x[1]]
+
+    result = newton_system(residuals, [1.0, 1.0])
+
+    assert result.converged
+    assert result.iterations <= 8
+    assert all(abs(r) < 1e-12 for r in result.residuals)
+    step = result.factorize().solve([1.0, 0.0])
+    assert len(step) == 2
+
+
+def test_scalar_root_finders():
+    assert brent(lambda x: x**3 - 2 * x - 5, 2.0, 3.0).root == pytest.approx(2.0945514815423265)
+    with pytest.raises(ValueError):
+        brent(math.cos, 0.0, 1.0)
+
+    halley = newton(lambda x: (x * x - 2.0, 2.0 * x, 2.0), 1.0)
+    assert halley.converged and halley.root == pytest.approx(math.sqrt(2.0), rel=1e-15)
+    # Plain Newton overshoots on atan from x0 = 10; the bracket rescues it.
+    assert not newton(lambda x: (math.atan(x), 1.0 / (1.0 + x * x)), 10.0).converged
+    safeguarded = newton(lambda x: (math.atan(x), 1.0 / (1.0 + x * x)), 10.0, -20.0, 20.0)
+    assert safeguarded.converged and abs(safeguarded.root) < 1e-12
+    # No sign change over the bracket: stop at the end nearer a root.
+    outside = newton(lambda x: (x * x + 1.0, 2.0 * x), 0.5, 0.0, 3.0)
+    assert not outside.converged and outside.root == 0.0
+
+
+def test_newton_many_solves_independent_roots():
+    targets = [0.5, 2.0, 9.0, 30.0]
+
+    def func(x, index):
+        return [xi**3 - targets[i] for xi, i in zip(x, index)], [3 * xi * xi for xi in x]
+
+    result = newton_many(func, [1.0] * 4, 0.0, 10.0)
+
+    assert all(result.converged)
+    for root, target in zip(result.roots, targets):
+        assert root == pytest.approx(target ** (1 / 3), rel=1e-14)
+
+    unreachable = newton_many(func, [1.0, 1.0], [0.0, 0.0], [0.5, 10.0])
+    assert unreachable.converged == [False, True]
+    assert unreachable.roots[0] == 0.5
+
+
+def test_levenberg_marquardt_leaves_unused_parameters_alone():
+    fit = levenberg_marquardt(lambda x: [x[0] - 2.0, 0.0], [0.0, 5.0])
+
+    assert fit.converged
+    assert fit.x[0] == pytest.approx(2.0, abs=1e-10)
+    assert fit.x[1] == 5.0
+
+    # No finite step lowers the cost: the damping overflows without converging.
+    stuck = levenberg_marquardt(lambda x: [1.0 + 1e-3 * x[0]], [0.0], jacobian=lambda x: [[-1.0]])
+    assert not stuck.converged and stuck.x == [0.0]
@@ -0,0 +1,40 @@
+"""Tests for par-rate risk from stored calibration Jacobians."""
+
+import pytest
+
+from qfinlib.calibration.curve.builder import CurveBuilder
+from qfinlib.market.container import MarketContainer
+from qfinlib.portfolio.portfolio import Portfolio
+from qfinlib.risk.attribution.curve_risk import _portfolio_pv, attribute_curve_risk
+
+QUOTES = [
+    {"type": "deposit", "pillar": 0.5, "quote": 0.020, "name": "6M"},
+    {"pillar": 2.0, "quote": 0.024, "name": "2Y"},
+    {"pillar": 5.0, "quote": 0.027, "name": "5Y"},
+    {"pillar": 10.0, "quote": 0.030, "name": "10Y"},
+]
+
+
+def _market(quotes):
+    market = MarketContainer()
+    market.add_curve("discount_curve", CurveBuilder(market).build_discount_curve("USD", quotes))
+    return market
+
+
+def test_par_risk_matches_rebuilding_with_bumped_quotes(make_swap):
+    swap = make_swap(7, 0.03, payment_times_float=[7.0], pay_fixed=False)
+    portfolio = Portfolio()
+    portfolio.add_position(swap, quantity=2.0)
+    market = _market(QUOTES)
+
+    risk = attribute_curve_risk(portfolio, market)
+
+    assert set(risk["zero"]["discount_curve"]) == {"6M", "2Y", "5Y", "10Y"}
+    par = risk["par"]["discount_curve"]
+    assert attribute_curve_risk(portfolio, market, curves=[]) == {"zero": {}, "par": {}}
+    pv = _portfolio_pv(portfolio, market)
+    for name in par:
+        bumped = [dict(q, quote=q["quote"] + 1e-4) if q["name"] == name else q for q in QUOTES]
+        rebuilt = _portfolio_pv(portfolio, _market(bumped)) - pv
+        assert par[name] == pytest.approx(rebuilt, rel=1e-3)
+    assert abs(par["5Y"]) > abs(par["2Y"])
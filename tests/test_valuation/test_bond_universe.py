@@ -0,0 +1,37 @@
+"""Tests for pricing a columnar bond universe."""
+
+import math
+from datetime import date
+
+import pytest
+
+from qfinlib.market.container import MarketContainer
+from qfinlib.market.curve import DiscountCurve
+from qfinlib.pricing.pricers import BondPricer, BondUniverse
+
+
+@pytest.mark.parametrize("with_curve", [True, False])
+def test_universe_kernel_matches_bond_by_bond_pricing(with_curve, make_bond):
+    market = MarketContainer(as_of=date(2024, 1, 2))
+    if with_curve:
+        curve = DiscountCurve([0.5, 2, 10, 30], zero_rates=[0.02, 0.025, 0.03, 0.031])
+        market.add_curve("discount_curve", curve)
+    bonds = [
+        make_bond(7, 0.04),
+        make_bond(12, 0.0, clean_price=71.5),
+        make_bond(-2, 0.05, clean_price=99.0),
+        make_bond(3, 0.05, frequency=1, yield_rate=0.041),
+        make_bond(25, 0.03, clean_price=92.0, settlement_date=date(2024, 2, 1)),
+    ]
+    universe = BondUniverse(bonds, market.as_of)
+    pricer = BondPricer()
+
+    columns = pricer.price_universe(universe, market)
+
+    assert list(universe.counts) == [15, 25, 0, 4, 51]
+    for i, bond in enumerate(bonds):
+        expected = pricer.price(bond, market)
+        for name, column in columns.items():
+            value = float(column[i])
+            assert value == pytest.approx(expected.get(name, 0.0), rel=1e-10, abs=1e-12), name
+    assert math.isnan(universe.clean_prices[0]) and universe.yields[3] == 0.041
@@ -0,0 +1,146 @@
+"""Tests for single-pass pricing gradients through dual-number market inputs."""
+
+from datetime import date
+
+import pytest
+
+from qfinlib.instruments.rates.option.swaption import Swaption
+from qfinlib.market.container import MarketContainer
+from qfinlib.market.curve import DiscountCurve, SpreadCurve
+from qfinlib.pricing.pricers import BondPricer, SwapPricer, SwaptionPricer
+
+PILLARS = [0.5, 1.0, 2.0, 5.0, 10.0]
+RATES = [0.020, 0.022, 0.025, 0.028, 0.030]
+STEP = 1e-6
+
+
+def _market(interpolation="log_linear", rates=RATES, **data):
+    market = MarketContainer(as_of=date(2024, 1, 2))
+    curve = DiscountCurve(PILLARS, zero_rates=list(rates), interpolation=interpolation)
+    market.add_curve("discount_curve", curve)
+    market.data.update(data)
+    return market
+
+
+def _node_bumps(pricer, instrument, market, key):
+    curve = market.get_curve("discount_curve")
+    base = pricer.price(instrument, market)[key]
+    out = {}
+    for node in curve.instruments:
+        bumped = MarketContainer(market.as_of)
+        bumped.data = market.data
+        bumped.surfaces = market.surfaces
+        bumped.add_curve("discount_curve", curve.bumped(STEP, node))
+        out[("discount_curve", node)] = (pricer.price(instrument, bumped)[key] - base) / STEP
+    return out
+
+
+@pytest.mark.parametrize("interpolation", ["linear", "log_linear", "cubic", "monotone"])
+def test_swap_gradient_matches_bumped_curve_nodes(interpolation, make_swap):
+    pricer, swap = SwapPricer(), make_swap(6, payment_times_float=[1.5, 6.0])
+    market = _market(interpolation, forward_rate=0.027)
+
+    result = pricer.price_with_gradient(swap, market)
+
+    assert result["pv"] == pytest.approx(pricer.price(swap, market)["pv"], abs=1e-9)
+    expected = _node_bumps(pricer, swap, market, "pv")
+    for key, value in expected.items():
+        assert result["gradient"].get(key, 0.0) == pytest.approx(value, rel=1e-4, abs=1e-2)
+    shifted = _market(interpolation, forward_rate=0.027 + STEP)
+    slope = (pricer.price(swap, shifted)["pv"] - result["pv"]) / STEP
+    assert result["gradient"]["forward_rate"] == pytest.approx(slope, rel=1e-6)
+
+
+def test_bond_dv01_and_curve_gradient(make_bond):
+    bond = make_bond(7, 0.04, settlement_date=date(2024, 1, 2))
+    pricer = BondPricer()
+    market = _market()
+    result = pricer.price_with_gradient(bond, market)
+    expected = _node_bumps(pricer, bond, market, "DirtyPrice")
+    for key, value in expected.items():
+        assert result["gradient"].get(key, 0.0) == pytest.approx(value, rel=1e-4, abs=1e-6)
+
+    flat = MarketContainer()
+    flat.data["yield"] = 0.035
+    metrics = pricer.price_with_gradient(bond, flat, as_of=date(2024, 1, 2))
+    up, down = (dict(flat.data, **{"yield": 0.035 + s}) for s in (1e-4, -1e-4))
+    prices = []
+    for data in (up, down):
+        shifted = MarketContainer()
+        shifted.data = data
+        prices.append(pricer.price(bond, shifted, as_of=date(2024, 1, 2))["DirtyPrice"])
+    assert metrics["BondDV01"] == pytest.approx((prices[1] - prices[0]) / 2, rel=1e-6)
+    assert metrics["gradient"]["yield"] == pytest.approx(-metrics["BondDV01"] * 1e4)
+
+
+def test_swaption_gradient_includes_vega_and_nodes(make_swap):
+    swap = make_swap(6, payment_times_float=[1.5, 6.0])
+    swaption = Swaption(swap=swap, expiry=1.0, strike=0.027)
+    pricer = SwaptionPricer()
+    market = _market(forward_rate=0.027)
+    market.add_surface("swaption_vol", lambda expiry, strike, forward: 0.2)
+
+    result = pricer.price_with_gradient(swaption, market)
+
+    assert result["gradient"]["swaption_vol"] == pytest.approx(result["vega"])
+    expected = _node_bumps(pricer, swaption, market, "pv")
+    for key, value in expected.items():
+        assert result["gradient"].get(key, 0.0) == pytest.approx(value, rel=1e-4, abs=1e-2)
+
+
+def test_adjoint_book_gradient_matches_forward_mode(make_bond, make_swap):
+    from qfinlib.pricing.engine import PricingEngine
+
+    market = _market("cubic", forward_rate=0.027, volatility=0.2)
+    swap = make_swap(6, payment_times_float=[1.5, 6.0])
+    book = [
+        swap,
+        Swaption(swap=swap, expiry=1.0, strike=0.026),
+        make_bond(5, 0.04, settlement_date=date(2024, 1, 2)),
+    ]
+    quantities = [2.0, -1.0, 1000.0]
+    engine = PricingEngine(market)
+
+    result = engine.adjoint_sensitivities(book, quantities)
+
+    expected = {}
+    pv = 0.0
+    for instrument, quantity in zip(book, quantities):
+        forward = engine.price_with_gradient(instrument)
+        pv += quantity * forward[engine._get_pricer(instrument).pv_key]
+        for key, value in forward["gradient"].items():
+            expected[key] = expected.get(key, 0.0) + quantity * value
+    assert result["pv"] == pytest.approx(pv, rel=1e-12)
+    assert set(result["gradient"]) == set(expected)
+    for key, value in expected.items():
+        assert result["gradient"][key] == pytest.approx(value, rel=1e-9, abs=1e-9)
+
+
+def test_spread_curve_gradient_reaches_its_base_curve(make_swap):
+    from qfinlib.pricing.engine import PricingEngine
+
+    def market(ois):
+        out = MarketContainer(as_of=date(2024, 1, 2))
+        out.data["forward_rate"] = 0.027
+        out.add_curve("ois", ois)
+        spread = SpreadCurve(ois, [1.0, 10.0], [0.004, 0.006], instruments=["S1", "S10"])
+        out.add_curve("discount_curve", spread)
+        return out
+
+    ois = DiscountCurve(PILLARS, zero_rates=RATES, instruments=["6M", "1Y", "2Y", "5Y", "10Y"])
+    pricer, swap = SwapPricer(), make_swap(6, payment_times_float=[1.5, 6.0])
+    base = market(ois)
+
+    result = pricer.price_with_gradient(swap, base)
+
+    assert {key[0] for key in result["gradient"] if isinstance(key, tuple)} == {
+        "ois",
+        "discount_curve",
+    }
+    for node in ois.instruments:
+        bumped = pricer.price(swap, market(ois.bumped(STEP, node)))["pv"]
+        slope = (bumped - result["pv"]) / STEP
+        assert result["gradient"][("ois", node)] == pytest.approx(slope, rel=1e-4, abs=1e-2)
+    adjoint = PricingEngine(base).adjoint_sensitivities([swap])
+    for key, value in result["gradient"].items():
+        assert adjoint["gradient"].get(key, 0.0) == pytest.approx(value, rel=1e-9, abs=1e-9)
@@ -0,0 +1,48 @@
+"""Tests for pricing only the requested measures."""
+
+from datetime import date
+
+import pytest
+
+from qfinlib.instruments.rates.option.swaption import Swaption
+from qfinlib.market.container import MarketContainer
+from qfinlib.market.curve import DiscountCurve
+from qfinlib.pricing.engine import PricingEngine
+
+
+def _market():
+    market = MarketContainer(as_of=date(2024, 1, 2))
+    market.add_curve("discount_curve", DiscountCurve([1, 5, 10], zero_rates=[0.02, 0.025, 0.03]))
+    market.add_surface("swaption_vol", lambda expiry, strike, forward: 0.2)
+    market.data["forward_rate"] = 0.027
+    return market
+
+
+def test_requested_bond_measures_skip_unrelated_work(make_bond):
+    bond = make_bond(7, 0.04, settlement_date=date(2024, 1, 2), clean_price=101.5)
+    engine = PricingEngine(_market())
+    full = engine.price(bond)
+
+    result = engine.price(bond, measures={"DirtyPrice", "Yield"})
+
+    assert dict(result) == {"DirtyPrice": full["DirtyPrice"], "Yield": full["Yield"]}
+    assert not {"BondDV01", "MacaulayDuration", "Convexity", "BondCurvePrice"} & set(
+        result.computed
+    )
+    assert result["BondDV01"] == full["BondDV01"]
+
+
+def test_requested_swaption_measures_share_the_underlying_swap(make_swap):
+    swap = make_swap(
+        payment_times_fixed=[2.0, 3.0, 4.0], payment_times_float=[1.5, 2.0, 2.5, 3.0, 3.5, 4.0]
+    )
+    swaption = Swaption(swap=swap, expiry=1.0, strike=0.025)
+    engine = PricingEngine(_market())
+    full = engine.price(swaption)
+
+    result = engine.price(swaption, measures=["pv", "forward"])
+
+    assert list(result.items()) == [("pv", full["pv"]), ("forward", full["forward"])]
+    assert "implied_vol_atm" not in result.computed
+    with pytest.raises(ValueError, match="Unknown measures: PV"):
+        engine.price(swaption, measures=["PV"])
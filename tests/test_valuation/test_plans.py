@@ -0,0 +1,87 @@
+"""Tests for pricers resolved against a market into pricing plans."""
+
+from datetime import date
+
+import pytest
+
+from qfinlib.instruments.rates.option.swaption import Swaption
+from qfinlib.market.container import MarketContainer
+from qfinlib.market.curve import DiscountCurve
+from qfinlib.pricing.engine import PricingEngine
+from qfinlib.pricing.pricers import BondUniverse
+
+
+class _CountingMarket(MarketContainer):
+    lookups = 0
+
+    def get_curve(self, name):
+        self.lookups += 1
+        return super().get_curve(name)
+
+    def get_surface(self, name):
+        self.lookups += 1
+        return super().get_surface(name)
+
+    def discount_table(self, name):
+        self.lookups += 1
+        return super().discount_table(name)
+
+
+@pytest.fixture
+def make_swaption(make_swap):
+    def make(n, strike):
+        fixed = [float(k) for k in range(2, n + 2)]
+        floating = [k / 4 for k in range(5, 4 * n + 5)]
+        swap = make_swap(fixed_rate=strike, payment_times_fixed=fixed, payment_times_float=floating)
+        return Swaption(swap=swap, expiry=1.0, strike=strike)
+
+    return make
+
+
+def test_plan_hoists_market_lookups_out_of_pricing(make_swaption):
+    market = _CountingMarket(as_of=date(2024, 1, 2))
+    market.add_curve("discount_curve", DiscountCurve([1, 5, 10], zero_rates=[0.02, 0.025, 0.03]))
+    market.add_surface("swaption_vol", lambda expiry, strike, forward: 0.2)
+    market.data["forward_rate"] = 0.027
+    book = [make_swaption(n, 0.02 + 0.001 * n) for n in range(1, 9)]
+    engine = PricingEngine(market)
+    expected = [engine.price(swaption) for swaption in book]
+
+    plan = engine.resolve(book[0])
+    resolved = market.lookups
+    results = [plan.price(swaption) for swaption in book]
+
+    assert market.lookups == resolved
+    assert results == expected
+
+
+def test_held_plan_sees_in_place_curve_updates(make_bond, make_swaption):
+    market = MarketContainer(as_of=date(2024, 1, 2))
+    curve = DiscountCurve(
+        [1, 5, 10], zero_rates=[0.02, 0.025, 0.03], instruments=["1Y", "5Y", "10Y"]
+    )
+    market.add_curve("discount_curve", curve)
+    market.data["forward_rate"] = 0.027
+    swaption = make_swaption(5, 0.025)
+    bond = make_bond(6, 0.04)
+    universe = BondUniverse([bond], market.as_of)
+    engine = PricingEngine(market)
+    swaps, swaptions, bonds = (engine.resolve(i) for i in (swaption.swap, swaption, bond))
+
+    def values():
+        return (
+            swaps.price(swaption.swap)["pv"],
+            swaptions.price(swaption)["pv"],
+            bonds.price(bond)["BondCurvePrice"],
+            float(bonds.price_universe(universe)["BondCurvePrice"][0]),
+        )
+
+    before = values()
+    curve.update_market_quotes({"5Y": 0.06})
+    after = values()
+
+    assert all(a != b for a, b in zip(after, before))
+    fresh = PricingEngine(market)
+    assert after[:2] == (fresh.price(swaption.swap)["pv"], fresh.price(swaption)["pv"])
+    assert after[2] == fresh.price(bond)["BondCurvePrice"]
+    assert after[3] == pytest.approx(after[2], rel=1e-14)
@@ -0,0 +1,82 @@
+"""Tests for batched pricing through PricingEngine.price_many."""
+
+from datetime import date
+
+import pytest
+
+from qfinlib.instruments.rates.option.swaption import Swaption
+from qfinlib.market.container import MarketContainer
+from qfinlib.market.curve import DiscountCurve
+from qfinlib.pricing.engine import PricingEngine
+
+
+def _assert_close(actual, expected):
+    if isinstance(expected, dict):
+        assert set(actual) == set(expected)
+        for key, value in expected.items():
+            _assert_close(actual[key], value)
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected, rel=1e-12, abs=1e-12)
+    else:
+        assert actual == expected
+
+
+def test_price_many_matches_single_trade_pricing_in_order(make_bond, make_swap):
+    market = MarketContainer(as_of=date(2024, 1, 2))
+    rates = [0.02, 0.022, 0.025, 0.028, 0.03, 0.031]
+    market.add_curve("discount_curve", DiscountCurve([0.5, 1, 2, 5, 10, 30], zero_rates=rates))
+    market.data["forward_rate"] = 0.027
+    market.add_surface("swaption_vol", lambda expiry, strike, fwd: 0.2 + 0.5 * (strike - fwd))
+    book = [
+        make_bond(7, 0.04),
+        make_swap(5, 0.025),
+        Swaption(swap=make_swap(10, 0.03, pay_fixed=False), expiry=2.0, strike=0.028),
+        make_bond(12, 0.0, clean_price=71.5),
+        make_swap(30, 0.031, pay_fixed=False),
+        Swaption(swap=make_swap(3, 0.02), expiry=0.5, strike=0.022),
+        make_bond(3, 0.05, clean_price=103.25),
+    ]
+    engine = PricingEngine(market)
+
+    expected = [engine.price(instrument) for instrument in book]
+    market.reset_discount_tables()
+    results = engine.price_many(book)
+
+    assert len(results) == len(book)
+    assert [list(result) for result in results] == [list(single) for single in expected]
+    for actual, single in zip(results, expected):
+        _assert_close(actual, single)
+
+
+@pytest.mark.parametrize("executor", ["threads", "processes"])
+def test_pooled_price_many_keeps_order_and_reports_failures(executor, make_bond, make_swap):
+    from qfinlib.pricing import PricingError
+
+    market = MarketContainer(as_of=date(2024, 1, 2))
+    market.add_curve("discount_curve", DiscountCurve([1, 5, 10], zero_rates=[0.02, 0.025, 0.03]))
+    market.data.update(forward_rate=0.027, volatility=0.2)
+    book = [make_swap(n, 0.025) if n % 2 else make_bond(n, 0.03) for n in range(1, 12)]
+    engine = PricingEngine(market, executor=executor, workers=2, chunk_size=3)
+
+    results = engine.price_many(book)
+
+    assert results.executor == executor
+    assert (results.workers, results.chunk_size, results.chunks) == (2, 3, 4)
+    serial = PricingEngine(market).price_many(book)
+    for actual, expected in zip(results, serial):
+        _assert_close(actual, expected)
+    with pytest.raises(PricingError) as failure:
+        engine.price_many(book[:7] + ["not an instrument"] + book[7:])
+    assert (failure.value.index, failure.value.instrument) == (7, "not an instrument")
+
+
+def test_quotes_outside_the_yield_bracket_keep_the_nearer_end(make_bond):
+    market = MarketContainer(as_of=date(2024, 1, 2))
+    book = [make_bond(2, 0.05, clean_price=300.0), make_bond(5, 0.04, clean_price=98.0)]
+    engine = PricingEngine(market)
+
+    single = [engine.price(bond)["Yield"] for bond in book]
+    batch = [result["Yield"] for result in engine.price_many(book)]
+
+    assert single[0] == batch[0] == -0.05
+    assert batch[1] == pytest.approx(single[1], rel=1e-12)